@@ -13,6 +13,7 @@ sys.path.insert(0, str(project_root))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.backend.routes import document_routes
+from src.backend.job_queue import get_job_queue
 
 # Create FastAPI app
 app = FastAPI(
@@ -40,6 +41,12 @@ app.include_router(
 )
 
 
+@app.on_event("shutdown")
+async def shutdown_job_queue():
+    """Stop the background processing workers"""
+    get_job_queue().shutdown()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -37,23 +37,23 @@ if ffmpeg_bin not in os.environ['PATH']:
 os.environ['FFMPEG_BINARY'] = os.path.join(ffmpeg_bin, 'ffmpeg.exe')
 os.environ['FFPROBE_BINARY'] = os.path.join(ffmpeg_bin, 'ffprobe.exe')
 
-# NOW import pydub and other modules
-from pydub import AudioSegment
-from pydub.utils import which
-
 # Import configuration
 from src.utils.config_loader import get_config_loader
 from src.utils.media_utils import get_video_info, format_timestamp
-from src.utils.openai_config import get_openai_client, get_chat_model_name, OPENAI_AVAILABLE
+from src.utils.openai_config import OPENAI_AVAILABLE
 from src.utils.audit_logger import Logger
 from src.utils.cost_logger import UsageCostLogger
 from src.utils.usage_cost_extractor import extract_token_usage_from_app_log
 from src.utils.logger_config import setup_logger, setup_usage_logger
+from src.utils.lazy_imports import lazy_import
 
-# Import processing components
-from src.processors.video.video_processor import VideoProcessor
-from src.processors.video.screenshot_extractor import ScreenshotExtractor
-from src.document.document_generator import DocumentGenerator
+# Import processing components (loaded on first use, so importing main stays cheap
+# for the API server and the Streamlit app)
+video_processor = lazy_import("src.processors.video.video_processor")
+screenshot_extractor = lazy_import("src.processors.video.screenshot_extractor")
+screenshot_dedup = lazy_import("src.processors.video.screenshot_dedup")
+document_generator = lazy_import("src.document.document_generator")
+transcript_summarizer = lazy_import("src.document.transcript_summarizer")
 
 # Setup logging
 setup_logger()
@@ -128,6 +128,28 @@ def get_video_duration_ffprobe(video_path: str) -> float:
     )
     return round(float(result.stdout) / 60, 2)
 
+def extract_meeting_metadata(speech_segments: List[Tuple[float, str]], client: Any = None, model: str = None) -> Tuple[List[str], List[str]]:
+    """
+    Extract attendee names and key discussion points from speech segments using AI
+    
+    Long transcripts are summarized window by window (concurrently) before a single
+    request extracts both lists, so no part of the meeting is cut off.
+    
+    Args:
+        speech_segments: List of (timestamp, speech_text) tuples
+        client: OpenAI client (optional)
+        model: Model name to use (optional)
+    
+    Returns:
+        Tuple of (attendees, highlights)
+    """
+    if client is None and model is None:
+        summarizer = transcript_summarizer.get_transcript_summarizer()
+    else:
+        summarizer = transcript_summarizer.TranscriptSummarizer(client=client, model=model)
+    return summarizer.extract_meeting_metadata(speech_segments)
+
+
 def extract_meeting_attendees(speech_segments: List[Tuple[float, str]], client: Any = None, model: str = None) -> List[str]:
     """
     Extract unique speaker names/identities from speech segments using AI
@@ -140,63 +162,7 @@ def extract_meeting_attendees(speech_segments: List[Tuple[float, str]], client:
     Returns:
         List of unique attendee names identified from the meeting
     """
-    if not speech_segments or not OPENAI_AVAILABLE:
-        return []
-    
-    try:
-        # Combine all speech text
-        full_transcript = "\n".join([text for _, text in speech_segments])
-        
-        # Limit transcript to avoid token limits
-        if len(full_transcript) > 10000:
-            full_transcript = full_transcript[:10000] + "..."
-        
-        # Create prompt to extract attendees
-        prompt = f"""
-        Analyze this meeting transcript and identify all unique speakers/attendees.
-        
-        TRANSCRIPT:
-        {full_transcript}
-        
-        Your task:
-        1. Identify each unique person speaking in the meeting
-        2. Extract their names if mentioned (e.g., "Hi, I'm John" or "Thanks, Sarah")
-        3. If names aren't explicitly mentioned, create generic identifiers (Speaker 1, Speaker 2, etc.)
-        4. Return ONLY a JSON array of unique attendee names
-        
-        Response format:
-        ["Name 1", "Name 2", "Name 3"]
-        
-        Do NOT include any other text, just the JSON array.
-        """
-        
-        if client is None:
-            client = get_openai_client()
-        if model is None:
-            model = get_chat_model_name()
-        
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are an expert at identifying speakers in meetings. Extract attendee names from transcripts."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
-        
-        response_text = response.choices[0].message.content.strip()
-        
-        # Parse JSON response
-        import json
-        attendees = json.loads(response_text)
-        
-        logging.info(f"Extracted {len(attendees)} attendees from meeting: {attendees}")
-        return attendees if isinstance(attendees, list) else []
-        
-    except Exception as e:
-        logging.error(f"Error extracting attendees: {str(e)}")
-        return []
+    return extract_meeting_metadata(speech_segments, client, model)[0]
 
 
 def extract_meeting_highlights(speech_segments: List[Tuple[float, str]], client: Any = None, model: str = None) -> List[str]:
@@ -211,65 +177,7 @@ def extract_meeting_highlights(speech_segments: List[Tuple[float, str]], client:
     Returns:
         List of key discussion points identified from the meeting
     """
-    if not speech_segments or not OPENAI_AVAILABLE:
-        return []
-    
-    try:
-        # Combine all speech text
-        full_transcript = "\n".join([text for _, text in speech_segments])
-        
-        # Limit transcript to avoid token limits
-        if len(full_transcript) > 10000:
-            full_transcript = full_transcript[:10000] + "..."
-        
-        # Create prompt to extract highlights
-        prompt = f"""
-        Analyze this meeting transcript and identify the key discussion points, decisions, and highlights.
-        
-        TRANSCRIPT:
-        {full_transcript}
-        
-        Your task:
-        1. Identify the most important discussion points
-        2. Extract decisions made during the meeting
-        3. Note timestamps where significant points were discussed
-        4. Note action items and commitments
-        5. Find key agreements and conclusions
-        6. Return ONLY a JSON array of 5-8 key highlights
-        
-        Response format:
-        ["Highlight 1: Description", "Highlight 2: Description"]
-        
-        Do NOT include any other text, just the JSON array.
-        """
-        
-        if client is None:
-            client = get_openai_client()
-        if model is None:
-            model = get_chat_model_name()
-        
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are an expert at identifying key points in meetings. Extract the most important discussion points from transcripts."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
-        
-        response_text = response.choices[0].message.content.strip()
-        
-        # Parse JSON response
-        import json
-        highlights = json.loads(response_text)
-        
-        logging.info(f"Extracted {len(highlights)} highlights from meeting")
-        return highlights if isinstance(highlights, list) else []
-        
-    except Exception as e:
-        logging.error(f"Error extracting highlights: {str(e)}")
-        return []
+    return extract_meeting_metadata(speech_segments, client, model)[1]
 
 def process_video(
     video_path: str,
@@ -301,6 +209,8 @@ def process_video(
     Returns:
         Dictionary containing:
         - screenshots: List of (image, timestamp, reason) tuples
+        - merged_screenshots: Near-duplicate screenshots that were merged, as
+          {"timestamp", "reason", "merged_timestamps"} dicts
         - speech_timestamps: List of (timestamp, text) tuples
         - keyword_results: List of keyword detection results
         - processing_time: Time taken in seconds
@@ -316,7 +226,7 @@ def process_video(
     
     try:
         # Initialize video processor
-        processor = VideoProcessor(video_path)
+        processor = video_processor.VideoProcessor(video_path)
         
         # Configure screenshot extractor
         threshold = 25
@@ -324,8 +234,9 @@ def process_video(
         text_change_threshold = 10
         cooldown = 3
         ssim_threshold = 0.85
+        screenshot_config = app_config.get('processing', {}).get('screenshot', {})
         
-        extractor = ScreenshotExtractor(
+        extractor = screenshot_extractor.ScreenshotExtractor(
             threshold=threshold,
             min_area=min_area,
             text_change_threshold=text_change_threshold,
@@ -334,7 +245,9 @@ def process_video(
             keyword_trigger=use_speech,
             mouse_tracking=use_mouse_detection,
             use_ai_speech_analysis=bool(use_ai_analysis and OPENAI_AVAILABLE),
-            detection_mode=detection_mode
+            detection_mode=detection_mode,
+            detection_height=screenshot_config.get('detection_height', 360),
+            detection_decoder=screenshot_config.get('detection_decoder', 'opencv')
         )
         
         fps = processor.fps
@@ -385,7 +298,12 @@ def process_video(
                 
                 deduplicated_screenshots.append(group[0])
         
-        screenshots = deduplicated_screenshots
+        # Collapse the same slide captured at different times to its best capture
+        screenshots, merged_screenshots = screenshot_dedup.deduplicate_screenshots(
+            deduplicated_screenshots,
+            max_distance=screenshot_config.get('dedup_hamming_threshold', 6),
+            min_similarity=screenshot_config.get('dedup_ssim_threshold', 0.97)
+        )
         processing_time = time.time() - start_time
         
         # Extract speech timestamps
@@ -403,7 +321,12 @@ def process_video(
         video_filename = os.path.basename(video_path)
         video_size = os.path.getsize(video_path)
         video_size_mb = round(video_size / (1024 * 1024), 2)
-        video_duration = get_video_duration_ffprobe(video_path)
+        # Reuse the audio decoded for speech recognition instead of spawning ffprobe
+        audio_track = getattr(extractor, 'audio_track', None)
+        if audio_track is not None and audio_track.duration > 0:
+            video_duration = round(audio_track.duration / 60, 2)
+        else:
+            video_duration = get_video_duration_ffprobe(video_path)
         
         whisper_cost = float(os.getenv("AZURE_WHISPER_CLIENT_COST", "0"))
         token_usage_cost = extract_token_usage_from_app_log(session_id=session_guid)
@@ -432,8 +355,7 @@ def process_video(
         meeting_highlights = []
         
         if use_speech and speech_timestamps:
-            meeting_attendees = extract_meeting_attendees(speech_timestamps)
-            meeting_highlights = extract_meeting_highlights(speech_timestamps)
+            meeting_attendees, meeting_highlights = extract_meeting_metadata(speech_timestamps)
         
         return {
             "screenshots": screenshots,
@@ -444,7 +366,8 @@ def process_video(
             "session_id": session_id,
             "session_guid": session_guid,
             "meeting_attendees": meeting_attendees,
-            "meeting_highlights": meeting_highlights  
+            "meeting_highlights": meeting_highlights,
+            "merged_screenshots": merged_screenshots
         }
         
     except Exception as e:
@@ -465,7 +388,8 @@ def generate_document(
     include_screenshots: bool = True,
     session_guid: Optional[str] = None,
     meeting_participants: Optional[List[str]] = None,
-    meeting_highlights: Optional[List[str]] = None
+    meeting_highlights: Optional[List[str]] = None,
+    on_document: Optional[Callable[[str, bytes], None]] = None
 ) -> Dict[str, Any]:
     """
     Generate a document from processed video data
@@ -482,11 +406,14 @@ def generate_document(
         enable_process_map: Include process map diagram
         include_screenshots: Include screenshots in document
         session_guid: Optional session GUID for logging
+        on_document: Optional callback receiving (doc_type, document_bytes) for each
+                     document as soon as it is rendered; the bytes are then not kept
+                     in the result
         
     Returns:
         Dictionary containing:
-        - pdf_bytes: PDF document bytes (if PDF or Both)
-        - docx_bytes: DOCX document bytes (if DOCX or Both)
+        - pdf_bytes: PDF document bytes (if PDF or Both, and no on_document callback)
+        - docx_bytes: DOCX document bytes (if DOCX or Both, and no on_document callback)
         - title: Document title
         - format: Document format
     """
@@ -513,7 +440,7 @@ def generate_document(
             speech_segments = []
         
         # Create document generator
-        doc_generator = DocumentGenerator(
+        doc_generator = document_generator.DocumentGenerator(
             video_path,
             screenshots,
             use_ai=True,
@@ -532,12 +459,24 @@ def generate_document(
         # Generate documents based on format selection
         pdf_bytes = None
         docx_bytes = None
+        doc_types = []
         
         if doc_format in ["Both", "PDF"]:
-            pdf_bytes = doc_generator.get_document_bytes("pdf")
+            doc_types.append("pdf")
         
         if doc_format in ["Both", "WORD", "DOCX"]:
-            docx_bytes = doc_generator.get_document_bytes("docx")
+            doc_types.append("docx")
+        
+        # PDF and DOCX are laid out in parallel from one shared document model
+        document_config = app_config.get('processing', {}).get('document', {})
+        for rendered_type, document_bytes in doc_generator.iter_documents(
+                doc_types, parallel=document_config.get('parallel_rendering', True)):
+            if on_document is not None:
+                on_document(rendered_type, document_bytes)
+            elif rendered_type == "pdf":
+                pdf_bytes = document_bytes
+            else:
+                docx_bytes = document_bytes
         
         # Log usage costs
         video_filename = os.path.basename(video_path)
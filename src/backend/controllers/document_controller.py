@@ -4,106 +4,394 @@ Document controller for handling meeting document processing
 
 import os
 import uuid
+import asyncio
+import hashlib
 import logging
 import zipfile
-import io
+import tempfile
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
-from fastapi import UploadFile, HTTPException, Response
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
 
 # Import business logic from main.py
 import sys
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from main import (
-    process_video,
-    generate_document,
-    get_video_duration_ffprobe
-)
-from src.utils.media_utils import get_video_info
+from src.utils.lazy_imports import lazy_import
+from src.utils.media_utils import get_video_info, probe_video_metadata
+from src.backend.job_queue import get_job_queue, JobCancelledError, JobQueueFullError, JobQueueUnavailableError
+from src.backend.session_store import get_session_store
+
+# main.py (and the processing stack behind it) loads on the first request that
+# needs it, so the API starts and answers health checks without it
+core = lazy_import("main")
 
 logger = logging.getLogger(__name__)
 
-# In-memory storage for processed data (screenshots, etc.)
-# In production, consider using Redis or a database
-_session_storage: Dict[str, Dict[str, Any]] = {}
+# Chunk size used when streaming generated archives to the client
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024
 
+# Bytes written per chunk while streaming an upload to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Multipart boundaries, part headers and form fields allowed on top of the file
+# when checking a declared Content-Length against the upload size limit
+MAX_FORM_OVERHEAD_BYTES = 1024 * 1024
+# Largest text form field accepted with an upload
+MAX_FORM_FIELD_BYTES = 64 * 1024
+# Form fields of the upload endpoints and their defaults (None if required)
+UPLOAD_FORM_FIELDS = {
+    "client_name": None,
+    "detection_mode": "basic",
+    "use_speech": True,
+    "use_mouse_detection": True,
+    "use_scene_detection": False,
+    "use_ai_analysis": True,
+}
+# Accepted spellings of boolean form fields
+FORM_BOOLEAN_VALUES = {"true": True, "1": True, "yes": True, "on": True,
+                       "false": False, "0": False, "no": False, "off": False}
+# Upload bytes on disk before ffprobe starts reading the container header
+UPLOAD_PROBE_BYTES = 4 * 1024 * 1024
+# Leading bytes needed to recognize the container format
+VIDEO_SIGNATURE_BYTES = 12
+# ISO base media (MP4/MOV) box types that can start a file
+MP4_BOX_TYPES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot"}
 
-async def save_uploaded_file(upload_file: UploadFile) -> str:
+async def receive_meeting_upload(request: Request) -> Dict[str, Any]:
     """
-    Save uploaded file to temporary directory
+    Stream a multipart meeting upload straight from the request body to disk
+    
+    The body is parsed as it arrives rather than after Starlette has spooled the
+    whole form, so the file is written once and every check applies while the
+    bytes come in: a declared Content-Length over server.max_upload_size_mb is
+    rejected before reading, the file type is checked from the part headers, and
+    the size limit, container signature and ffprobe header probe run on the
+    first bytes of the file part (see _UploadWriter).
     
     Args:
-        upload_file: FastAPI UploadFile object
+        request: Request with a multipart/form-data body holding the "file" part
+                 and the form fields of UPLOAD_FORM_FIELDS
         
     Returns:
-        Path to saved file
+        Dictionary with "upload" (see _UploadWriter.finish) and the parsed form fields
     """
-    # Create temp directory if it doesn't exist
-    temp_dir = Path("data/temp")
-    temp_dir.mkdir(parents=True, exist_ok=True)
+    max_bytes = _max_upload_bytes()
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MAX_FORM_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB")
+    
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data upload")
     
-    # Generate unique filename
-    file_ext = Path(upload_file.filename).suffix
-    temp_filename = f"{uuid.uuid4()}{file_ext}"
-    temp_path = temp_dir / temp_filename
+    # The parser reports parts through callbacks; they are queued and handled
+    # after each chunk so file writes and probes can be awaited
+    events = []
+    callbacks = {
+        "on_part_begin": lambda: events.append(("part_begin", b"")),
+        "on_header_field": lambda data, start, end: events.append(("header_field", data[start:end])),
+        "on_header_value": lambda data, start, end: events.append(("header_value", data[start:end])),
+        "on_header_end": lambda: events.append(("header_end", b"")),
+        "on_headers_finished": lambda: events.append(("headers_finished", b"")),
+        "on_part_data": lambda data, start, end: events.append(("part_data", data[start:end])),
+        "on_part_end": lambda: events.append(("part_end", b"")),
+    }
+    parser = MultipartParser(boundary, callbacks)
+    
+    raw_fields: Dict[str, str] = {}
+    writer = None
+    part_writer = None
+    field_name, field_value = None, bytearray()
+    header_field, header_value, part_headers = b"", b"", {}
     
     try:
-        # Save file
-        with open(temp_path, "wb") as f:
-            content = await upload_file.read()
-            f.write(content)
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for event, data in events:
+                if event == "part_begin":
+                    part_headers, part_writer, field_name, field_value = {}, None, None, bytearray()
+                    header_field, header_value = b"", b""
+                elif event == "header_field":
+                    header_field += data
+                elif event == "header_value":
+                    header_value += data
+                elif event == "header_end":
+                    part_headers[header_field.lower()] = header_value
+                    header_field, header_value = b"", b""
+                elif event == "headers_finished":
+                    _, disposition = parse_options_header(part_headers.get(b"content-disposition", b""))
+                    name = disposition.get(b"name", b"").decode("utf-8", "replace")
+                    if b"filename" in disposition:
+                        if name != "file" or writer is not None:
+                            raise HTTPException(status_code=400, detail="Expected exactly one file, in the \"file\" field")
+                        filename = disposition[b"filename"].decode("utf-8", "replace")
+                        _validate_video_filename(filename)
+                        writer = part_writer = _UploadWriter(filename, max_bytes)
+                    else:
+                        field_name = name
+                elif event == "part_data":
+                    if part_writer is not None:
+                        await part_writer.write(data)
+                    else:
+                        field_value += data
+                        if len(field_value) > MAX_FORM_FIELD_BYTES:
+                            raise HTTPException(status_code=413, detail=f"Form field {field_name} is too large")
+                elif event == "part_end" and field_name is not None:
+                    raw_fields[field_name] = field_value.decode("utf-8", "replace")
+            events.clear()
+        parser.finalize()
         
-        logger.info(f"Saved uploaded file to {temp_path}")
-        return str(temp_path)
+        if writer is None:
+            raise HTTPException(status_code=422, detail="Missing form field: file")
+        form = _parse_upload_fields(raw_fields)
+        form["upload"] = await writer.finish()
+        return form
+    except HTTPException:
+        if writer is not None:
+            writer.discard()
+        raise
+    except MultipartParseError as e:
+        if writer is not None:
+            writer.discard()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart upload: {str(e)}")
     except Exception as e:
+        if writer is not None:
+            writer.discard()
+        if isinstance(e, ClientDisconnect):
+            logger.info("Client disconnected during upload")
+            raise
         logger.error(f"Error saving uploaded file: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
 
-async def process_meeting(
-    file: UploadFile,
-    client_name: str,
-    detection_mode: str = "basic",
-    use_speech: bool = True,
-    use_mouse_detection: bool = True,
-    use_scene_detection: bool = False,
-    use_ai_analysis: bool = True
-) -> Dict[str, Any]:
+class _UploadWriter:
     """
-    Process uploaded meeting video file
+    Streams one uploaded file to the temporary directory, checking it as bytes arrive
     
-    Args:
-        file: Uploaded video file
-        client_name: Name of the client
-        detection_mode: "basic" or "advanced"
-        use_speech: Enable speech-based keyword detection
-        use_mouse_detection: Enable mouse cursor tracking
-        use_scene_detection: Enable scene change detection
-        use_ai_analysis: Enable AI-powered content analysis
+    Data is buffered into UPLOAD_CHUNK_SIZE writes, hashed on the way and checked
+    against the size limit on arrival. Once the first bytes are in, the container
+    signature is checked and ffprobe starts reading the header, so files that are
+    not videos are rejected before the transfer ends.
+    """
+    
+    def __init__(self, filename: str, max_bytes: int):
+        """
+        Args:
+            filename: Client file name (only its extension is kept)
+            max_bytes: Upload size limit
+        """
+        # Create temp directory if it doesn't exist
+        temp_dir = Path("data/temp")
+        temp_dir.mkdir(parents=True, exist_ok=True)
         
+        # Generate unique filename
+        self.path = temp_dir / f"{uuid.uuid4()}{Path(filename).suffix}"
+        self.max_bytes = max_bytes
+        self.hasher = hashlib.sha256()
+        self.size_bytes = 0
+        self.header = b""
+        self.early_probe = None
+        self._buffer = bytearray()
+        self._written_bytes = 0
+        self._file = open(self.path, "wb")
+    
+    async def write(self, data: bytes):
+        """Check and buffer the next bytes of the file"""
+        self.size_bytes += len(data)
+        if self.size_bytes > self.max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {self.max_bytes // (1024 * 1024)} MB"
+            )
+        
+        if len(self.header) < VIDEO_SIGNATURE_BYTES:
+            self.header += data[:VIDEO_SIGNATURE_BYTES - len(self.header)]
+            if len(self.header) == VIDEO_SIGNATURE_BYTES and not _has_video_signature(self.header):
+                raise HTTPException(status_code=400, detail="Uploaded file is not a supported video container")
+        
+        self._buffer += data
+        if len(self._buffer) >= UPLOAD_CHUNK_SIZE:
+            await self._flush()
+    
+    async def _flush(self):
+        """Write and hash the buffered bytes, probing the header once enough is on disk"""
+        if not self._buffer:
+            return
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        await asyncio.to_thread(_write_upload_chunk, self._file, self.hasher, chunk)
+        self._written_bytes += len(chunk)
+        
+        # Probe the container header while the rest of the upload arrives
+        if self.early_probe is None and self._written_bytes >= UPLOAD_PROBE_BYTES:
+            await asyncio.to_thread(self._file.flush)
+            self.early_probe = asyncio.ensure_future(asyncio.to_thread(_probe_upload, str(self.path)))
+        elif self.early_probe is not None and self.early_probe.done():
+            _reject_without_video(self.early_probe.result())
+    
+    async def finish(self) -> Dict[str, Any]:
+        """
+        Complete the upload once the file part has ended
+        
+        Returns:
+            Dictionary with "path", "size_bytes", "sha256" and "video_info" (fps,
+            frame_count, width, height, duration, has_video, has_audio; None if
+            ffprobe is not available)
+        """
+        await self._flush()
+        await asyncio.to_thread(self._file.close)
+        
+        if self.size_bytes == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+        if not _has_video_signature(self.header):
+            raise HTTPException(status_code=400, detail="Uploaded file is not a supported video container")
+        
+        if self.early_probe is not None:
+            _reject_without_video(await self.early_probe)
+        
+        # Probe the complete file for the authoritative metadata
+        video_info = await asyncio.to_thread(_probe_upload, str(self.path))
+        if video_info is False:
+            raise HTTPException(status_code=400, detail="Could not read video metadata from the uploaded file")
+        _reject_without_video(video_info)
+        
+        logger.info(f"Saved uploaded file to {self.path} ({self.size_bytes} bytes, sha256 {self.hasher.hexdigest()[:12]})")
+        return {
+            "path": str(self.path),
+            "size_bytes": self.size_bytes,
+            "sha256": self.hasher.hexdigest(),
+            "video_info": video_info
+        }
+    
+    def discard(self):
+        """Delete a rejected or failed upload"""
+        self._file.close()
+        _remove_partial_upload(self.path, self.early_probe)
+
+
+def _parse_upload_fields(raw_fields: Dict[str, str]) -> Dict[str, Any]:
+    """Apply the defaults and types of UPLOAD_FORM_FIELDS to the received form fields"""
+    form = {}
+    for name, default in UPLOAD_FORM_FIELDS.items():
+        value = raw_fields.get(name)
+        if value is None:
+            if default is None:
+                raise HTTPException(status_code=422, detail=f"Missing form field: {name}")
+            form[name] = default
+        elif isinstance(default, bool):
+            if value.strip().lower() not in FORM_BOOLEAN_VALUES:
+                raise HTTPException(status_code=422, detail=f"Form field {name} must be a boolean")
+            form[name] = FORM_BOOLEAN_VALUES[value.strip().lower()]
+        else:
+            form[name] = value
+    return form
+
+
+def _max_upload_bytes() -> int:
+    """Upload size limit from server.max_upload_size_mb (default 1000 MB)"""
+    max_upload_size_mb = 1000
+    try:
+        from src.utils.config_loader import get_config_loader
+        config_loader = get_config_loader()
+        app_config = config_loader.get_config('app_config.yaml')
+        max_upload_size_mb = app_config.get('server', {}).get('max_upload_size_mb', max_upload_size_mb)
+    except Exception as e:
+        logger.warning(f"Could not load upload settings, using defaults: {e}")
+    return int(max_upload_size_mb) * 1024 * 1024
+
+
+def _write_upload_chunk(file_obj, hasher, chunk: bytes):
+    """Write and hash one upload chunk (runs off the event loop)"""
+    file_obj.write(chunk)
+    hasher.update(chunk)
+
+
+def _has_video_signature(header: bytes) -> bool:
+    """Check the leading bytes for an MP4/MOV, AVI or Matroska container"""
+    return (header[4:8] in MP4_BOX_TYPES
+            or (header[:4] == b"RIFF" and header[8:12] == b"AVI ")
+            or header[:4] == b"\x1a\x45\xdf\xa3")
+
+
+def _probe_upload(path: str):
+    """
+    Probe a (possibly partial) upload
+    
     Returns:
-        Dictionary containing processing results
+        Metadata dictionary, False if ffprobe could not read it (yet), or None if
+        ffprobe is not installed
     """
-    # Validate file type
+    try:
+        return probe_video_metadata(path) or False
+    except FileNotFoundError:
+        return None
+
+
+def _reject_without_video(video_info):
+    """Reject an upload whose container was read but holds no video stream"""
+    if video_info and not video_info["has_video"]:
+        raise HTTPException(status_code=400, detail="Uploaded file has no video stream")
+
+
+def _remove_partial_upload(temp_path: Path, early_probe=None):
+    """Delete a rejected or failed upload"""
+    if early_probe is not None and not early_probe.done():
+        early_probe.cancel()
+    try:
+        if temp_path.exists():
+            os.remove(temp_path)
+    except OSError:
+        pass
+
+
+def _validate_video_filename(filename: str):
+    """Reject uploads that are not a supported video type"""
     allowed_extensions = {".mp4", ".avi", ".mov", ".mkv"}
-    file_ext = Path(file.filename).suffix.lower()
+    file_ext = Path(filename).suffix.lower()
     
     if file_ext not in allowed_extensions:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
         )
+
+
+def run_video_job(
+    video_path: str,
+    client_name: str,
+    session_guid: str,
+    detection_mode: str = "basic",
+    use_speech: bool = True,
+    use_mouse_detection: bool = True,
+    use_scene_detection: bool = False,
+    use_ai_analysis: bool = True,
+    progress_callback=None,
+    video_info: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Process a video in a job queue worker process
     
-    # Save uploaded file
-    video_path = await save_uploaded_file(file)
-    session_guid = str(uuid.uuid4())
+    Args:
+        video_info: Metadata probed while the upload was received; when given
+                    the video is not opened again just to read it
     
+    Returns:
+        The picklable parts of the process_video result plus video info
+    """
     try:
-        # Process video
-        result = process_video(
+        result = core.process_video(
             video_path=video_path,
             client_name=client_name,
             detection_mode=detection_mode,
@@ -111,74 +399,237 @@ async def process_meeting(
             use_mouse_detection=use_mouse_detection,
             use_scene_detection=use_scene_detection,
             use_ai_analysis=use_ai_analysis,
-            progress_callback=None,  # No progress callback for API
+            progress_callback=progress_callback,
             session_guid=session_guid
         )
         
-        # Get video info
-        video_info = get_video_info(video_path)
-        video_duration = get_video_duration_ffprobe(video_path)
+        # The extractor holds capture handles and models and stays in the worker
+        result.pop("extractor", None)
+        if video_info and video_info["duration"]:
+            result["video_info"] = video_info
+            result["video_duration"] = round(video_info["duration"] / 60, 2)
+        else:
+            result["video_info"] = get_video_info(video_path)
+            result["video_duration"] = core.get_video_duration_ffprobe(video_path)
+        return result
         
-        # Store screenshots and other data in session storage
-        # Convert screenshots to serializable format (store metadata)
-        screenshots_metadata = []
-        for img, timestamp, reason in result["screenshots"]:
-            screenshots_metadata.append({
-                "timestamp": timestamp,
-                "reason": reason
-            })
+    except Exception:
+        # Clean up temp file on error
+        try:
+            if os.path.exists(video_path):
+                os.remove(video_path)
+        except:
+            pass
+        raise
+
+
+def _complete_video_job(result: Dict[str, Any], video_path: str, client_name: str) -> Dict[str, Any]:
+    """
+    Store a processed video in session storage and build the API response
+    
+    Args:
+        result: Return value of run_video_job
+        video_path: Path of the uploaded video
+        client_name: Name of the client
         
-        # Store full data in memory for later use
-        _session_storage[session_guid] = {
-            "screenshots": result["screenshots"],  # Full screenshot objects
-            "speech_timestamps": result["speech_timestamps"],
-            "keyword_results": result.get("keyword_results", []),
-            "video_path": video_path,
-            "client_name": client_name
-        }
+    Returns:
+        Dictionary containing processing results
+    """
+    video_info = result["video_info"]
+    video_duration = result["video_duration"]
+    
+    # Store screenshots and other data in session storage
+    # Convert screenshots to serializable format (store metadata)
+    screenshots_metadata = []
+    for img, timestamp, reason in result["screenshots"]:
+        screenshots_metadata.append({
+            "timestamp": timestamp,
+            "reason": reason
+        })
+    
+    # Store full data for later use (memory tier plus the configured persistent backend)
+    get_session_store().put(result["session_guid"], {
+        "screenshots": result["screenshots"],  # Full screenshot objects
+        "speech_timestamps": result["speech_timestamps"],
+        "keyword_results": result.get("keyword_results", []),
+        "video_path": video_path,
+        "client_name": client_name
+    })
+    
+    # Convert transcript to list of dicts for JSON serialization
+    transcript = []
+    for timestamp, text in result["speech_timestamps"]:
+        transcript.append({
+            "timestamp": timestamp,
+            "text": text
+        })
+    
+    # Prepare response with full transcript (like Streamlit)
+    return {
+        "success": True,
+        "session_guid": result["session_guid"],
+        "session_id": result["session_id"],
+        "video_path": video_path,
+        "video_info": {
+            "filename": os.path.basename(video_path),
+            "duration_minutes": video_duration,
+            "fps": video_info["fps"],
+            "frame_count": video_info["frame_count"],
+            "width": video_info["width"],
+            "height": video_info["height"]
+        },
+        "screenshots": screenshots_metadata,  # Metadata only
+        "screenshots_count": len(result["screenshots"]),
+        "transcript": transcript,  # Full transcript like Streamlit
+        "speech_segments": transcript,  # Alias for compatibility
+        "speech_segments_count": len(result["speech_timestamps"]),
+        "keyword_results": result.get("keyword_results", []),
+        "processing_time": result["processing_time"],
+        "message": "Video processed successfully"
+    }
+
+
+async def submit_meeting(
+    upload: Dict[str, Any],
+    client_name: str,
+    detection_mode: str = "basic",
+    use_speech: bool = True,
+    use_mouse_detection: bool = True,
+    use_scene_detection: bool = False,
+    use_ai_analysis: bool = True
+) -> Dict[str, Any]:
+    """
+    Queue an uploaded meeting video for processing
+    
+    Args:
+        upload: Saved upload from receive_meeting_upload
+        client_name: Name of the client
+        detection_mode: "basic" or "advanced"
+        use_speech: Enable speech-based keyword detection
+        use_mouse_detection: Enable mouse cursor tracking
+        use_scene_detection: Enable scene change detection
+        use_ai_analysis: Enable AI-powered content analysis
         
-        # Convert transcript to list of dicts for JSON serialization
-        transcript = []
-        for timestamp, text in result["speech_timestamps"]:
-            transcript.append({
-                "timestamp": timestamp,
-                "text": text
-            })
+    Returns:
+        Dictionary containing the job id and initial status
+    """
+    video_path = upload["path"]
+    
+    job_kwargs = {
+        "video_path": video_path,
+        "client_name": client_name,
+        "session_guid": str(uuid.uuid4()),
+        "detection_mode": detection_mode,
+        "use_speech": use_speech,
+        "use_mouse_detection": use_mouse_detection,
+        "use_scene_detection": use_scene_detection,
+        "use_ai_analysis": use_ai_analysis,
+        "video_info": upload["video_info"]
+    }
+    
+    try:
+        job_id = get_job_queue().submit(
+            run_video_job,
+            job_kwargs,
+            on_complete=lambda result: _complete_video_job(result, video_path, client_name),
+            # A job cancelled before it starts never reaches run_video_job's cleanup
+            on_cancel=lambda: _remove_partial_upload(Path(video_path))
+        )
+    except (JobQueueFullError, JobQueueUnavailableError) as e:
+        _remove_partial_upload(Path(video_path))
+        raise HTTPException(status_code=503, detail=f"Server busy, try again later: {str(e)}")
+    except Exception:
+        _remove_partial_upload(Path(video_path))
+        raise
+    
+    return {
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/document/jobs/{job_id}",
+        "file_size_bytes": upload["size_bytes"],
+        "file_sha256": upload["sha256"],
+        "message": "Video queued for processing"
+    }
+
+
+def get_job_status(job_id: str) -> Dict[str, Any]:
+    """
+    Get the status, progress and (once completed) result of a processing job
+    
+    Args:
+        job_id: Job id returned by submit_meeting
         
-        # Prepare response with full transcript (like Streamlit)
-        response = {
-            "success": True,
-            "session_guid": result["session_guid"],
-            "session_id": result["session_id"],
-            "video_path": video_path,
-            "video_info": {
-                "filename": os.path.basename(video_path),
-                "duration_minutes": video_duration,
-                "fps": video_info["fps"],
-                "frame_count": video_info["frame_count"],
-                "width": video_info["width"],
-                "height": video_info["height"]
-            },
-            "screenshots": screenshots_metadata,  # Metadata only
-            "screenshots_count": len(result["screenshots"]),
-            "transcript": transcript,  # Full transcript like Streamlit
-            "speech_segments": transcript,  # Alias for compatibility
-            "speech_segments_count": len(result["speech_timestamps"]),
-            "keyword_results": result.get("keyword_results", []),
-            "processing_time": result["processing_time"],
-            "message": "Video processed successfully"
-        }
+    Returns:
+        Dictionary containing the job status
+    """
+    status = get_job_queue().get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return status
+
+
+def cancel_job(job_id: str) -> Dict[str, Any]:
+    """
+    Cancel a queued or running processing job
+    
+    Args:
+        job_id: Job id returned by submit_meeting
         
-        return response
+    Returns:
+        Dictionary confirming the cancellation
+    """
+    job_queue = get_job_queue()
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if not job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} has already finished")
+    return {"success": True, "job_id": job_id, "message": "Cancellation requested"}
+
+
+async def process_meeting(
+    upload: Dict[str, Any],
+    client_name: str,
+    detection_mode: str = "basic",
+    use_speech: bool = True,
+    use_mouse_detection: bool = True,
+    use_scene_detection: bool = False,
+    use_ai_analysis: bool = True
+) -> Dict[str, Any]:
+    """
+    Process uploaded meeting video file
+    
+    The video is processed by the job queue; this call waits for the job
+    without blocking the event loop.
+    
+    Args:
+        upload: Saved upload from receive_meeting_upload
+        client_name: Name of the client
+        detection_mode: "basic" or "advanced"
+        use_speech: Enable speech-based keyword detection
+        use_mouse_detection: Enable mouse cursor tracking
+        use_scene_detection: Enable scene change detection
+        use_ai_analysis: Enable AI-powered content analysis
         
+    Returns:
+        Dictionary containing processing results
+    """
+    submitted = await submit_meeting(
+        upload=upload,
+        client_name=client_name,
+        detection_mode=detection_mode,
+        use_speech=use_speech,
+        use_mouse_detection=use_mouse_detection,
+        use_scene_detection=use_scene_detection,
+        use_ai_analysis=use_ai_analysis
+    )
+    
+    try:
+        return await asyncio.wrap_future(get_job_queue().wait(submitted["job_id"]))
+    except JobCancelledError:
+        raise HTTPException(status_code=409, detail="Video processing was cancelled")
     except Exception as e:
         logger.error(f"Error processing meeting: {e}", exc_info=True)
-        # Clean up temp file on error
-        try:
-            if os.path.exists(video_path):
-                os.remove(video_path)
-        except:
-            pass
         raise HTTPException(status_code=500, detail=f"Error processing video: {str(e)}")
 
 
@@ -210,16 +661,20 @@ async def generate_meeting_document(
     Returns:
         Dictionary containing generated document info
     """
+    zip_temp_file = None
     try:
         # If session_guid is provided, retrieve all data from storage
         if session_guid:
-            if session_guid not in _session_storage:
+            try:
+                stored_data = get_session_store().get(session_guid)
+            except ValueError:
+                stored_data = None
+            if stored_data is None:
                 raise HTTPException(
                     status_code=404,
                     detail=f"Session {session_guid} not found. Please upload and process video first."
                 )
             
-            stored_data = _session_storage[session_guid]
             video_path = stored_data.get("video_path")
             client_name = stored_data.get("client_name")
             screenshots = stored_data.get("screenshots")
@@ -256,7 +711,7 @@ async def generate_meeting_document(
                 logger.info("Processing video to get screenshots and transcript")
                 session_guid = str(uuid.uuid4())
                 # Process video to get screenshots and transcript
-                process_result = process_video(
+                process_result = core.process_video(
                     video_path=video_path,
                     client_name=client_name,
                     detection_mode="basic",
@@ -272,8 +727,20 @@ async def generate_meeting_document(
                 # To expected format: [(1.0, "...")]
                 speech_segments = [(seg["timestamp"], seg["text"]) for seg in speech_segments]
         
+        doc_title_safe = doc_title.replace(" ", "_")
+        today_date = datetime.now().strftime("%Y-%m-%d")
+        
+        # For "Both", write each document into the ZIP archive as soon as it is
+        # rendered instead of holding both documents and the archive in memory
+        on_document = None
+        zip_parts = []
+        if doc_format == "Both":
+            zip_temp_file = tempfile.TemporaryFile()
+            zip_archive = zipfile.ZipFile(zip_temp_file, 'w', zipfile.ZIP_DEFLATED)
+            on_document = _zip_writer(zip_archive, f"{doc_title_safe}_{doc_type}_{today_date}", zip_parts)
+        
         # Generate document
-        result = generate_document(
+        result = core.generate_document(
             video_path=video_path,
             screenshots=screenshots,
             client_name=client_name,
@@ -284,31 +751,19 @@ async def generate_meeting_document(
             enable_missing_questions=enable_missing_questions,
             enable_process_map=enable_process_map,
             include_screenshots=include_screenshots,
-            session_guid=session_guid
+            session_guid=session_guid,
+            on_document=on_document
         )
         
-        # Return file(s) directly as downloadable
-        doc_title_safe = result["title"].replace(" ", "_")
-        today_date = datetime.now().strftime("%Y-%m-%d")
-        
-        # If format is "Both", return a zip file
-        if result["format"] == "Both":
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                if result.get("pdf_bytes"):
-                    zip_file.writestr(
-                        f"{doc_title_safe}_{result['doc_type']}_{today_date}.pdf",
-                        result["pdf_bytes"]
-                    )
-                if result.get("docx_bytes"):
-                    zip_file.writestr(
-                        f"{doc_title_safe}_{result['doc_type']}_{today_date}.docx",
-                        result["docx_bytes"]
-                    )
-            zip_buffer.seek(0)
+        # If format is "Both", stream the zip file
+        if result["format"] == "Both" and zip_parts:
+            zip_archive.close()
+            zip_temp_file.seek(0)
+            zip_stream = _iter_file_chunks(zip_temp_file)
+            zip_temp_file = None  # Closed by the stream once it has been sent
             
-            return Response(
-                content=zip_buffer.getvalue(),
+            return StreamingResponse(
+                zip_stream,
                 media_type="application/zip",
                 headers={
                     "Content-Disposition": f'attachment; filename="{doc_title_safe}_{result["doc_type"]}_{today_date}.zip"'
@@ -340,11 +795,64 @@ async def generate_meeting_document(
             return {
                 "success": False,
                 "message": "No document generated. Please check your parameters.",
-                "has_pdf": result.get("pdf_bytes") is not None,
-                "has_docx": result.get("docx_bytes") is not None
+                "has_pdf": result.get("pdf_bytes") is not None or "pdf" in zip_parts,
+                "has_docx": result.get("docx_bytes") is not None or "docx" in zip_parts
             }
         
     except Exception as e:
         logger.error(f"Error generating document: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating document: {str(e)}")
+    finally:
+        if zip_temp_file is not None:
+            zip_temp_file.close()
+
+
+def get_session_store_stats() -> Dict[str, Any]:
+    """
+    Get session store usage and eviction counters
+    
+    Returns:
+        Dictionary of counters per storage tier
+    """
+    return get_session_store().stats()
+
+
+def _zip_writer(zip_archive: zipfile.ZipFile, base_name: str, written_types: List[str]):
+    """
+    Build an on_document callback that adds each rendered document to a ZIP archive
+    
+    Args:
+        zip_archive: Archive open for writing
+        base_name: File name of the documents without extension
+        written_types: List the extension of each written document is appended to
+        
+    Returns:
+        Function taking (rendered_type, document_bytes)
+    """
+    def write_document(rendered_type: str, document_bytes: bytes):
+        zip_archive.writestr(f"{base_name}.{rendered_type}", document_bytes)
+        written_types.append(rendered_type)
+    
+    return write_document
+
+
+def _iter_file_chunks(file_obj, chunk_size: int = ZIP_STREAM_CHUNK_SIZE):
+    """
+    Stream an open file in chunks and close it afterwards
+    
+    Args:
+        file_obj: Binary file object positioned at the start of the data
+        chunk_size: Bytes per chunk
+        
+    Yields:
+        Chunks of file data
+    """
+    try:
+        while True:
+            chunk = file_obj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file_obj.close()
 
@@ -0,0 +1,368 @@
+"""
+Background job queue for long-running processing requests
+
+Jobs run in a bounded process pool so a video being processed never blocks
+the API event loop. Workers report progress through the existing
+progress_callback(progress, message) hooks, which also check for cancellation.
+Workers are spawned rather than forked, so they never inherit the API process's
+threads, locks or open sockets.
+"""
+
+import concurrent.futures
+import concurrent.futures.process
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Minimum seconds between progress updates sent from a worker
+PROGRESS_INTERVAL = 0.5
+
+
+class JobCancelledError(Exception):
+    """Raised inside a worker when its job has been cancelled"""
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are already queued or running"""
+
+
+class JobQueueUnavailableError(Exception):
+    """Raised when the worker pool cannot accept jobs, even after being restarted"""
+
+
+@dataclass
+class Job:
+    """State of a submitted job as seen by the API process"""
+    job_id: str
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    status: str = QUEUED
+    error: Optional[str] = None
+    result: Any = None
+    future: Optional[concurrent.futures.Future] = None
+    done: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+    on_complete: Optional[Callable[[Any], Any]] = None
+    on_cancel: Optional[Callable[[], Any]] = None
+
+
+def _run_job(job_id: str, target: Callable, kwargs: Dict[str, Any], progress_store, cancel_flags, started):
+    """
+    Worker entry point: run target with a progress callback wired to the shared stores
+
+    The job id is put on the started queue with the first progress update, which
+    moves the job from queued to running in the API process.
+    """
+    last_update = [0.0]
+
+    def progress_callback(progress: float, message: str):
+        if cancel_flags.get(job_id):
+            raise JobCancelledError(f"Job {job_id} was cancelled")
+
+        now = time.time()
+        if now - last_update[0] >= PROGRESS_INTERVAL or progress >= 1.0:
+            progress_store[job_id] = (float(progress), str(message))
+            last_update[0] = now
+
+    if cancel_flags.get(job_id):
+        raise JobCancelledError(f"Job {job_id} was cancelled")
+
+    progress_store[job_id] = (0.0, "Started")
+    started.put(job_id)
+    return target(progress_callback=progress_callback, **kwargs)
+
+
+class JobQueue:
+    """
+    Bounded process-pool job queue with progress reporting and cancellation
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None, retention_seconds: int = None):
+        """
+        Initialize the job queue
+
+        Args:
+            max_workers: Number of worker processes (server.jobs.max_workers, default 2)
+            max_pending: Maximum queued plus running jobs (server.jobs.max_pending, default 20)
+            retention_seconds: How long finished jobs stay queryable (server.jobs.retention_seconds, default 3600)
+        """
+        jobs_config = {}
+        try:
+            from src.utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            jobs_config = app_config.get('server', {}).get('jobs', {}) or {}
+        except Exception as e:
+            logger.warning(f"Could not load job queue settings, using defaults: {e}")
+
+        self.max_workers = max_workers or jobs_config.get('max_workers', 2)
+        self.max_pending = max_pending or jobs_config.get('max_pending', 20)
+        self.retention_seconds = retention_seconds or jobs_config.get('retention_seconds', 3600)
+
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._cancel_flags = None
+        self._started = None
+
+    def _ensure_started(self):
+        """Start the worker pool and the shared progress stores on first use"""
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+            self._progress = self._manager.dict()
+            self._cancel_flags = self._manager.dict()
+            self._started = self._manager.Queue()
+            threading.Thread(target=self._watch_started, args=(self._started,),
+                             name="job-queue-started", daemon=True).start()
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Job queue started with {self.max_workers} worker processes")
+
+    def _restart_pool(self):
+        """Replace a broken worker pool; jobs it was running have already failed"""
+        logger.warning("Job queue worker pool is broken (a worker died), starting a new one")
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+        self._executor = None
+        self._ensure_started()
+
+    def _watch_started(self, started):
+        """Mark jobs running as their workers report the first progress update"""
+        while True:
+            try:
+                job_id = started.get()
+            except Exception:
+                return  # Manager shut down
+            if job_id is None:
+                return
+
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == QUEUED:
+                    job.status = RUNNING
+
+    def submit(self, target: Callable, kwargs: Dict[str, Any],
+               on_complete: Optional[Callable[[Any], Any]] = None,
+               on_cancel: Optional[Callable[[], Any]] = None) -> str:
+        """
+        Queue a job
+
+        Args:
+            target: Picklable module-level function; called in a worker as
+                    target(progress_callback=..., **kwargs)
+            kwargs: Picklable keyword arguments for target
+            on_complete: Optional function run in the API process with the worker's
+                         return value; its return value becomes the job result
+            on_cancel: Optional function run in the API process when the job is
+                       cancelled, e.g. to delete inputs a job that never started
+                       would have cleaned up
+
+        Returns:
+            The job id
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already queued or running
+            JobQueueUnavailableError: If the worker pool cannot be started or restarted
+        """
+        with self._lock:
+            self._prune()
+            pending = sum(1 for job in self._jobs.values() if job.status in (QUEUED, RUNNING))
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f"{pending} jobs are already queued or running")
+
+            job = Job(job_id=uuid.uuid4().hex, on_complete=on_complete, on_cancel=on_cancel)
+            try:
+                self._ensure_started()
+                try:
+                    job.future = self._submit(job.job_id, target, kwargs)
+                except concurrent.futures.process.BrokenProcessPool:
+                    self._restart_pool()
+                    job.future = self._submit(job.job_id, target, kwargs)
+            except Exception as e:
+                raise JobQueueUnavailableError(f"Job queue cannot accept jobs: {e}") from e
+            self._jobs[job.job_id] = job
+
+        job.future.add_done_callback(lambda future, job_id=job.job_id: self._finish(job_id, future))
+        logger.info(f"Queued job {job.job_id}")
+        return job.job_id
+
+    def _submit(self, job_id: str, target: Callable, kwargs: Dict[str, Any]) -> concurrent.futures.Future:
+        """Hand a job to the worker pool"""
+        return self._executor.submit(
+            _run_job, job_id, target, kwargs, self._progress, self._cancel_flags, self._started
+        )
+
+    def _finish(self, job_id: str, future: concurrent.futures.Future):
+        """Record the outcome of a job (runs in the API process)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+
+        try:
+            result = future.result()
+            if job.on_complete is not None:
+                result = job.on_complete(result)
+            job.result = result
+            self._set_status(job, COMPLETED)
+            job.done.set_result(result)
+            logger.info(f"Job {job_id} completed")
+        except (JobCancelledError, concurrent.futures.CancelledError):
+            self._set_status(job, CANCELLED)
+            job.error = "Job was cancelled"
+            job.done.set_exception(JobCancelledError(job.error))
+            logger.info(f"Job {job_id} cancelled")
+            if job.on_cancel is not None:
+                try:
+                    job.on_cancel()
+                except Exception as e:
+                    logger.warning(f"Cleanup of cancelled job {job_id} failed: {e}")
+        except Exception as e:
+            self._set_status(job, FAILED)
+            job.error = str(e)
+            job.done.set_exception(e)
+            logger.error(f"Job {job_id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            # Finished jobs are kept for retention_seconds; drop the future and
+            # callbacks so they do not keep the worker's result alive as well
+            job.future = None
+            job.on_complete = None
+            job.on_cancel = None
+            try:
+                self._progress.pop(job_id, None)
+                self._cancel_flags.pop(job_id, None)
+            except Exception:
+                pass  # Manager already shut down
+
+    def _set_status(self, job: Job, status: str):
+        """Set a final status without racing the started watcher"""
+        with self._lock:
+            job.status = status
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status
+
+        Args:
+            job_id: Job id returned by submit
+
+        Returns:
+            Dictionary with job_id, status, progress, message, error and (once completed)
+            result, or None if the job is unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        progress, message = 0.0, ""
+        if job.status in (QUEUED, RUNNING):
+            update = self._progress.get(job_id)
+            if update is not None:
+                progress, message = update
+        elif job.status == COMPLETED:
+            progress, message = 1.0, "Completed"
+
+        status = {
+            "job_id": job_id,
+            "status": job.status,
+            "progress": progress,
+            "message": message,
+            "error": job.error,
+            "created_at": job.created_at,
+            "finished_at": job.finished_at
+        }
+        if job.status == COMPLETED:
+            status["result"] = job.result
+        return status
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job. Queued jobs never start; running jobs stop at their next progress update.
+
+        Args:
+            job_id: Job id returned by submit
+
+        Returns:
+            True if the job was queued or running, False if it is unknown or already finished
+        """
+        job = self._jobs.get(job_id)
+        future = job.future if job is not None else None
+        if future is None or job.status not in (QUEUED, RUNNING):
+            return False
+
+        self._cancel_flags[job_id] = True
+        if future.cancel():
+            logger.info(f"Cancelled queued job {job_id}")
+        else:
+            logger.info(f"Cancellation requested for running job {job_id}")
+        return True
+
+    def wait(self, job_id: str) -> concurrent.futures.Future:
+        """
+        Future that resolves with the job result (after on_complete) or its error
+
+        Args:
+            job_id: Job id returned by submit
+
+        Returns:
+            concurrent.futures.Future (use asyncio.wrap_future to await it)
+        """
+        return self._jobs[job_id].done
+
+    def _prune(self):
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker pool"""
+        if self._executor is not None:
+            for job in self._jobs.values():
+                if job.status in (QUEUED, RUNNING):
+                    self._cancel_flags[job.job_id] = True
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._started.put(None)
+            self._manager.shutdown()
+            self._executor = None
+            self._manager = None
+
+
+# Global job queue instance
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the global job queue instance
+
+    Returns:
+        JobQueue instance
+    """
+    global _job_queue
+
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
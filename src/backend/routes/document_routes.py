@@ -2,23 +2,41 @@
 Document API routes
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Query
+from fastapi import APIRouter, HTTPException, Form, Query, Request
 from typing import Optional
 from src.backend.controllers import document_controller
 
 router = APIRouter()
 
 
-@router.post("/upload")
-async def upload_meeting(
-    file: UploadFile = File(...),
-    client_name: str = Form(...),
-    detection_mode: str = Form("basic"),
-    use_speech: bool = Form(True),
-    use_mouse_detection: bool = Form(True),
-    use_scene_detection: bool = Form(False),
-    use_ai_analysis: bool = Form(True)
-):
+# Documents the multipart body that receive_meeting_upload parses from the raw
+# request stream (declaring File/Form parameters would spool the upload first)
+MEETING_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file", "client_name"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "client_name": {"type": "string"},
+                        "detection_mode": {"type": "string", "default": "basic"},
+                        "use_speech": {"type": "boolean", "default": True},
+                        "use_mouse_detection": {"type": "boolean", "default": True},
+                        "use_scene_detection": {"type": "boolean", "default": False},
+                        "use_ai_analysis": {"type": "boolean", "default": True}
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+@router.post("/upload", openapi_extra=MEETING_UPLOAD_BODY)
+async def upload_meeting(request: Request):
     """
     Upload and process meeting recording
     
@@ -37,15 +55,45 @@ async def upload_meeting(
     - **video_path**: Use this for document generation
     - Processing statistics and video info
     """
-    return await document_controller.process_meeting(
-        file=file,
-        client_name=client_name,
-        detection_mode=detection_mode,
-        use_speech=use_speech,
-        use_mouse_detection=use_mouse_detection,
-        use_scene_detection=use_scene_detection,
-        use_ai_analysis=use_ai_analysis
-    )
+    form = await document_controller.receive_meeting_upload(request)
+    return await document_controller.process_meeting(**form)
+
+
+@router.post("/jobs", openapi_extra=MEETING_UPLOAD_BODY)
+async def submit_meeting_job(request: Request):
+    """
+    Upload a meeting recording and queue it for background processing
+    
+    Takes the same fields as /upload but returns immediately.
+    
+    Returns:
+    - **job_id**: Poll /jobs/{job_id} for progress; its result has the same shape as /upload
+    - **status_url**: URL of the job status endpoint
+    """
+    form = await document_controller.receive_meeting_upload(request)
+    return await document_controller.submit_meeting(**form)
+
+
+@router.get("/jobs/{job_id}")
+async def get_meeting_job(job_id: str):
+    """
+    Get the status of a processing job
+    
+    Returns:
+    - **status**: queued, running, completed, failed or cancelled
+    - **progress**: 0.0 - 1.0, with the current step in **message**
+    - **result**: Same as the /upload response (once completed)
+    - **error**: Error message (if failed)
+    """
+    return document_controller.get_job_status(job_id)
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_meeting_job(job_id: str):
+    """
+    Cancel a queued or running processing job
+    """
+    return document_controller.cancel_job(job_id)
 
 
 @router.post("/generate/meeting-summary")
@@ -89,6 +137,14 @@ async def generate_meeting_summary(
     )
 
 
+@router.get("/sessions/stats")
+async def get_session_stats():
+    """
+    Session store usage and eviction counters per storage tier
+    """
+    return document_controller.get_session_store_stats()
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -0,0 +1,595 @@
+"""
+Session storage for processed meetings
+
+A processed meeting (screenshots, transcript, keyword results, video path) is kept
+between the upload and the document generation requests. Sessions live in a
+small LRU+TTL memory tier in front of a persistent backend:
+
+- disk: one directory per session holding the screenshots as PNG files and a
+  compact session.json index, so sessions survive restarts and are shared by
+  every uvicorn worker on the host
+- redis: the same layout in a Redis-compatible server (optional dependency; any
+  client with get/set/delete/expire, e.g. a local stand-in, can be passed in)
+
+Screenshots read back from a backend are decoded lazily, only when document
+generation actually touches them, and arrive with their PNG encoding already
+cached on their ScreenshotAsset.
+"""
+
+import abc
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.screenshot_asset import get_screenshot_asset, open_encoded_screenshot
+
+logger = logging.getLogger(__name__)
+
+# Session ids become file and key names, so only accept plain identifiers
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,128}$')
+
+SESSION_INDEX_FILE = "session.json"
+
+
+class SessionStore(abc.ABC):
+    """
+    Interface of a session store
+    """
+
+    def __init__(self):
+        self._stats = {"puts": 0, "hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._stats_lock = threading.Lock()
+
+    @abc.abstractmethod
+    def put(self, session_id: str, data: Dict[str, Any]):
+        """
+        Store a session
+
+        Args:
+            session_id: Session GUID
+            data: Dictionary with "screenshots" ((image, timestamp, reason) tuples),
+                  "speech_timestamps", "keyword_results", "video_path" and "client_name"
+        """
+
+    @abc.abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a session
+
+        Args:
+            session_id: Session GUID
+
+        Returns:
+            The session data, or None if it is unknown or has expired
+        """
+
+    @abc.abstractmethod
+    def delete(self, session_id: str):
+        """
+        Remove a session
+
+        Args:
+            session_id: Session GUID
+        """
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[counter] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Usage and eviction counters
+
+        Returns:
+            Dictionary of counters
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+class LazyScreenshotList(Sequence):
+    """
+    Screenshot list whose images are decoded from stored PNGs on first access
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], load_image: Callable[[int], Optional[bytes]]):
+        """
+        Args:
+            entries: One {"timestamp", "reason"} dictionary per screenshot
+            load_image: Returns the stored PNG bytes of a screenshot by index
+        """
+        self._entries = entries
+        self._load_image = load_image
+        self._images: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+        # Called with the approximate size of every newly decoded image, so a
+        # memory tier holding this list can account for it
+        self.on_decode: Optional[Callable[[int], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        entry = self._entries[index]
+        return self._image(index), entry["timestamp"], entry["reason"]
+
+    def _image(self, index: int):
+        image = self._images.get(index)
+        if image is None:
+            with self._lock:
+                image = self._images.get(index)
+                if image is None:
+                    encoded = self._load_image(index)
+                    image = open_encoded_screenshot(encoded) if encoded else None
+                    self._images[index] = image
+                    decoded = True
+                else:
+                    decoded = False
+            if decoded and image is not None and self.on_decode is not None:
+                self.on_decode(_image_size(image))
+        return image
+
+    def __reduce__(self):
+        # Worker processes get a plain list; the loader may hold files or connections
+        return (list, (list(self),))
+
+
+def _validate_session_id(session_id: str):
+    if not isinstance(session_id, str) or not SESSION_ID_PATTERN.match(session_id):
+        raise ValueError(f"Invalid session id: {session_id!r}")
+
+
+def _session_index(data: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-serializable part of a session, with screenshots reduced to their metadata"""
+    return {
+        "created_at": time.time(),
+        "video_path": data.get("video_path"),
+        "client_name": data.get("client_name"),
+        "speech_timestamps": [list(segment) for segment in data.get("speech_timestamps") or []],
+        "keyword_results": data.get("keyword_results") or [],
+        "screenshots": [{"timestamp": timestamp, "reason": reason}
+                        for _, timestamp, reason in data.get("screenshots") or []]
+    }
+
+
+def _encode_screenshots(data: Dict[str, Any]) -> List[Optional[bytes]]:
+    """PNG bytes of every screenshot (shared with the document renderers through their assets)"""
+    return [get_screenshot_asset(image).png() if image is not None else None
+            for image, _, _ in data.get("screenshots") or []]
+
+
+def _session_from_index(index: Dict[str, Any], load_image: Callable[[int], Optional[bytes]]) -> Dict[str, Any]:
+    """Rebuild session data from its index with lazily loaded screenshots"""
+    return {
+        "screenshots": LazyScreenshotList(index["screenshots"], load_image),
+        "speech_timestamps": [tuple(segment) for segment in index["speech_timestamps"]],
+        "keyword_results": index["keyword_results"],
+        "video_path": index["video_path"],
+        "client_name": index["client_name"]
+    }
+
+
+def _image_size(image: Any) -> int:
+    """Approximate memory footprint of a decoded image in bytes"""
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+def _estimate_size(data: Dict[str, Any]) -> int:
+    """Approximate memory footprint of a session in bytes"""
+    size = 0
+    screenshots = data.get("screenshots") or []
+    if isinstance(screenshots, LazyScreenshotList):
+        # Only decoded images occupy memory; later decodes are reported through on_decode
+        images = list(screenshots._images.values())
+    else:
+        images = [image for image, _, _ in screenshots]
+    for image in images:
+        if image is not None:
+            size += _image_size(image)
+    size += sum(len(str(text)) for _, text in data.get("speech_timestamps") or [])
+    return size
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-process LRU tier bounded by entry count, approximate size and age
+    """
+
+    def __init__(self, max_entries: int = 8, max_size_mb: float = 512, ttl_seconds: float = 3600):
+        """
+        Args:
+            max_entries: Maximum sessions kept in memory
+            max_size_mb: Maximum approximate size of the kept sessions
+            ttl_seconds: Sessions not accessed for this long are dropped
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, session_id: str, data: Dict[str, Any]):
+        screenshots = data.get("screenshots")
+        if isinstance(screenshots, LazyScreenshotList):
+            screenshots.on_decode = lambda image_size: self._grow(session_id, data, image_size)
+        size = _estimate_size(data)
+        with self._lock:
+            self._remove(session_id)
+            self._entries[session_id] = (data, size, time.time())
+            self._size += size
+            self._count("puts")
+            self._evict()
+
+    def _grow(self, session_id: str, data: Dict[str, Any], amount: int):
+        """Add a lazily decoded screenshot to the size of a stored session"""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[0] is not data:
+                return
+            self._entries[session_id] = (data, entry[1] + amount, entry[2])
+            self._size += amount
+            self._evict()
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self._count("misses")
+                return None
+            data, size, last_access = entry
+            if time.time() - last_access > self.ttl_seconds:
+                self._remove(session_id)
+                self._count("expirations")
+                self._count("misses")
+                return None
+            self._entries[session_id] = (data, size, time.time())
+            self._entries.move_to_end(session_id)
+            self._count("hits")
+            return data
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._remove(session_id)
+
+    def _remove(self, session_id: str):
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+    def _evict(self):
+        """Drop expired sessions, then least recently used ones over the limits"""
+        cutoff = time.time() - self.ttl_seconds
+        for session_id in [sid for sid, (_, _, last_access) in self._entries.items() if last_access < cutoff]:
+            self._remove(session_id)
+            self._count("expirations")
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_size_bytes):
+            session_id = next(iter(self._entries))
+            self._remove(session_id)
+            self._count("evictions")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats.update({"entries": len(self._entries), "size_bytes": self._size})
+        return stats
+
+
+class DiskSessionStore(SessionStore):
+    """
+    Session directories with PNG screenshots and a JSON index, bounded by total size and age
+    """
+
+    def __init__(self, root_dir: str = "data/sessions", max_size_mb: float = 2048, ttl_seconds: float = 86400):
+        """
+        Args:
+            root_dir: Directory holding one subdirectory per session
+            max_size_mb: Maximum total size of stored sessions
+            ttl_seconds: Sessions not accessed for this long are deleted
+        """
+        super().__init__()
+        self.root_dir = root_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _session_dir(self, session_id: str) -> str:
+        _validate_session_id(session_id)
+        return os.path.join(self.root_dir, session_id)
+
+    def put(self, session_id: str, data: Dict[str, Any]):
+        session_dir = self._session_dir(session_id)
+        index = _session_index(data)
+
+        # Write into a scratch directory and move it into place so readers in other
+        # workers never see a half-written session
+        staging_dir = os.path.join(self.root_dir, f".staging-{uuid.uuid4().hex}")
+        os.makedirs(staging_dir)
+        try:
+            size = 0
+            for i, encoded in enumerate(_encode_screenshots(data)):
+                if encoded is None:
+                    continue
+                filename = f"screenshot_{i:04d}.png"
+                with open(os.path.join(staging_dir, filename), "wb") as f:
+                    f.write(encoded)
+                index["screenshots"][i]["file"] = filename
+                size += len(encoded)
+            index_bytes = json.dumps(index).encode("utf-8")
+            index["size_bytes"] = size + len(index_bytes)
+            with open(os.path.join(staging_dir, SESSION_INDEX_FILE), "w", encoding="utf-8") as f:
+                json.dump(index, f)
+
+            with self._lock:
+                if os.path.exists(session_dir):
+                    shutil.rmtree(session_dir, ignore_errors=True)
+                os.replace(staging_dir, session_dir)
+        finally:
+            if os.path.exists(staging_dir):
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+        self._count("puts")
+        self._evict()
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        session_dir = self._session_dir(session_id)
+        index_path = os.path.join(session_dir, SESSION_INDEX_FILE)
+        try:
+            if time.time() - os.path.getmtime(index_path) > self.ttl_seconds:
+                self.delete(session_id)
+                self._count("expirations")
+                self._count("misses")
+                return None
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            os.utime(index_path)  # Mark as recently used
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+
+        def load_image(i: int) -> Optional[bytes]:
+            filename = index["screenshots"][i].get("file")
+            if not filename:
+                return None
+            try:
+                with open(os.path.join(session_dir, filename), "rb") as f:
+                    return f.read()
+            except OSError as e:
+                logger.warning(f"Screenshot {i} of session {session_id} is missing: {e}")
+                return None
+
+        self._count("hits")
+        return _session_from_index(index, load_image)
+
+    def delete(self, session_id: str):
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def _scan(self) -> List[Tuple[str, float, int]]:
+        """(session id, last access, size) of every stored session"""
+        sessions = []
+        for entry in os.scandir(self.root_dir):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            index_path = os.path.join(entry.path, SESSION_INDEX_FILE)
+            try:
+                last_access = os.path.getmtime(index_path)
+                with open(index_path, "r", encoding="utf-8") as f:
+                    size = json.load(f).get("size_bytes", 0)
+            except (OSError, ValueError):
+                continue
+            sessions.append((entry.name, last_access, size))
+        return sessions
+
+    def _evict(self):
+        """Delete expired sessions, then least recently used ones until under the size cap"""
+        with self._lock:
+            sessions = sorted(self._scan(), key=lambda session: session[1])
+            cutoff = time.time() - self.ttl_seconds
+            total_size = sum(size for _, _, size in sessions)
+            for session_id, last_access, size in sessions:
+                if last_access < cutoff:
+                    counter = "expirations"
+                elif total_size > self.max_size_bytes:
+                    counter = "evictions"
+                else:
+                    break
+                shutil.rmtree(os.path.join(self.root_dir, session_id), ignore_errors=True)
+                total_size -= size
+                self._count(counter)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            sessions = self._scan()
+        stats.update({"entries": len(sessions), "size_bytes": sum(size for _, _, size in sessions)})
+        return stats
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions in a Redis-compatible server; expiry and memory limits are enforced by the server
+    """
+
+    def __init__(self, client: Any = None, url: str = None, ttl_seconds: float = 86400,
+                 key_prefix: str = "mdoc:session:"):
+        """
+        Args:
+            client: Client with get/set(ex=)/delete/expire (a redis.Redis or a local stand-in)
+            url: Redis URL used to create a client when none is given
+            ttl_seconds: Expiry of session keys, refreshed on every read
+            key_prefix: Prefix of all keys written by the store
+        """
+        super().__init__()
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("The redis session backend requires the 'redis' package") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl_seconds = int(ttl_seconds)
+        self.key_prefix = key_prefix
+
+    def _key(self, session_id: str, suffix: str = "") -> str:
+        _validate_session_id(session_id)
+        return f"{self.key_prefix}{session_id}{suffix}"
+
+    def put(self, session_id: str, data: Dict[str, Any]):
+        index = _session_index(data)
+        for i, encoded in enumerate(_encode_screenshots(data)):
+            if encoded is not None:
+                self.client.set(self._key(session_id, f":screenshot:{i}"), encoded, ex=self.ttl_seconds)
+                index["screenshots"][i]["file"] = i
+        # The index goes last so a session is only visible once its screenshots are stored
+        self.client.set(self._key(session_id), json.dumps(index), ex=self.ttl_seconds)
+        self._count("puts")
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raw_index = self.client.get(self._key(session_id))
+        if raw_index is None:
+            self._count("misses")
+            return None
+        index = json.loads(raw_index)
+
+        screenshot_keys = [self._key(session_id, f":screenshot:{i}") for i in range(len(index["screenshots"]))]
+        for key in [self._key(session_id)] + screenshot_keys:
+            self.client.expire(key, self.ttl_seconds)
+
+        def load_image(i: int) -> Optional[bytes]:
+            if index["screenshots"][i].get("file") is None:
+                return None
+            return self.client.get(screenshot_keys[i])
+
+        self._count("hits")
+        return _session_from_index(index, load_image)
+
+    def delete(self, session_id: str):
+        raw_index = self.client.get(self._key(session_id))
+        count = len(json.loads(raw_index)["screenshots"]) if raw_index is not None else 0
+        self.client.delete(self._key(session_id), *[self._key(session_id, f":screenshot:{i}") for i in range(count)])
+
+
+class TieredSessionStore(SessionStore):
+    """
+    Memory tier in front of a persistent backend; writes go to both
+    """
+
+    def __init__(self, memory: MemorySessionStore, backend: SessionStore):
+        """
+        Args:
+            memory: Hot tier for recently used sessions
+            backend: Persistent tier shared across restarts and workers
+        """
+        super().__init__()
+        self.memory = memory
+        self.backend = backend
+
+    def put(self, session_id: str, data: Dict[str, Any]):
+        try:
+            self.backend.put(session_id, data)
+        except Exception as e:
+            logger.error(f"Could not persist session {session_id}, keeping it in memory only: {e}")
+        self.memory.put(session_id, data)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        data = self.memory.get(session_id)
+        if data is not None:
+            return data
+        try:
+            data = self.backend.get(session_id)
+        except Exception as e:
+            logger.error(f"Could not load session {session_id}: {e}")
+            return None
+        if data is not None:
+            self.memory.put(session_id, data)
+        return data
+
+    def delete(self, session_id: str):
+        self.memory.delete(session_id)
+        self.backend.delete(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"memory": self.memory.stats(), "backend": self.backend.stats()}
+
+
+def create_session_store(sessions_config: Dict[str, Any] = None) -> SessionStore:
+    """
+    Build the session store described by the server.sessions configuration
+
+    Args:
+        sessions_config: Settings dictionary (defaults to server.sessions from app_config.yaml)
+
+    Returns:
+        SessionStore instance
+    """
+    if sessions_config is None:
+        sessions_config = {}
+        try:
+            from src.utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            sessions_config = app_config.get('server', {}).get('sessions', {}) or {}
+        except Exception as e:
+            logger.warning(f"Could not load session store settings, using defaults: {e}")
+
+    ttl_seconds = sessions_config.get('ttl_seconds', 86400)
+    memory = MemorySessionStore(
+        max_entries=sessions_config.get('memory_max_entries', 8),
+        max_size_mb=sessions_config.get('memory_max_mb', 512),
+        ttl_seconds=min(ttl_seconds, sessions_config.get('memory_ttl_seconds', 3600))
+    )
+
+    backend_name = sessions_config.get('backend', 'disk')
+    if backend_name == 'memory':
+        return memory
+    if backend_name == 'redis':
+        redis_url = sessions_config.get('redis_url')
+        if not redis_url or redis_url.startswith('${'):
+            redis_url = "redis://localhost:6379/0"
+        backend = RedisSessionStore(url=redis_url, ttl_seconds=ttl_seconds)
+    else:
+        backend = DiskSessionStore(
+            root_dir=sessions_config.get('disk_dir', 'data/sessions'),
+            max_size_mb=sessions_config.get('disk_max_mb', 2048),
+            ttl_seconds=ttl_seconds
+        )
+    logger.info(f"Session store: memory tier in front of {backend_name} backend")
+    return TieredSessionStore(memory, backend)
+
+
+# Global session store instance
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """
+    Get the global session store instance
+
+    Returns:
+        SessionStore instance
+    """
+    global _session_store
+
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = create_session_store()
+        return _session_store
@@ -0,0 +1,235 @@
+"""
+Diagram Render Cache Module
+
+Content-addressed cache of rendered Mermaid diagrams. Entries are keyed by a
+hash of the normalized Mermaid source and hold the final PNG, the backend that
+produced it and any AI-fixed Mermaid/DOT source, so a known diagram renders
+instantly and a broken diagram that was fixed once never pays for AI fixes again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from io import BytesIO
+from typing import Any, Dict, Optional
+
+from PIL import Image as PILImage
+
+# Global singleton instance
+_diagram_cache_instance = None
+_diagram_cache_lock = threading.Lock()
+
+
+def normalize_mermaid(mermaid_code: str) -> str:
+    """
+    Canonical form of Mermaid source used for cache keys
+
+    Line endings, indentation, trailing whitespace, blank lines and %% comments do
+    not change the rendered diagram, so they do not change the key either. %%{...}%%
+    directives (theme and config) and whitespace inside quoted labels do, and are kept.
+
+    Args:
+        mermaid_code: Mermaid source
+
+    Returns:
+        Normalized source
+    """
+    lines = []
+    for line in mermaid_code.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        # Odd parts of the split are quoted strings, left exactly as written
+        parts = re.split(r'("[^"]*")', line.strip())
+        line = ''.join(part if i % 2 else re.sub(r'[ \t]+', ' ', part) for i, part in enumerate(parts))
+        if line and (not line.startswith('%%') or line.startswith('%%{')):
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+class DiagramRenderCache:
+    """
+    LRU, size-bounded cache of rendered diagrams stored as PNG plus JSON metadata.
+
+    Reads refresh an entry's modification time; writes evict the least recently
+    used entries once the cache grows past its size or entry limit.
+    """
+
+    def __init__(self, cache_dir: str = None, max_size_mb: float = None, max_entries: int = None,
+                 enabled: bool = None):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory for cache entries (defaults to storage.cache_dir/diagrams
+                       from app_config.yaml)
+            max_size_mb: Total size limit of the cache in megabytes
+            max_entries: Maximum number of cached diagrams
+            enabled: Set to False to make the cache a no-op
+        """
+        cache_config = {}
+        storage_cache_dir = "data/cache"
+        try:
+            from ..utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            storage_cache_dir = app_config.get('storage', {}).get('cache_dir', storage_cache_dir)
+            cache_config = app_config.get('processing', {}).get('diagrams', {}).get('cache', {}) or {}
+        except Exception as e:
+            logging.warning(f"Could not load diagram cache settings, using defaults: {e}")
+
+        self.cache_dir = cache_dir or os.path.join(storage_cache_dir, "diagrams")
+        self.max_size_bytes = int((max_size_mb or cache_config.get('max_size_mb', 100)) * 1024 * 1024)
+        self.max_entries = max_entries or cache_config.get('max_entries', 2000)
+        self.enabled = cache_config.get('enabled', True) if enabled is None else enabled
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(mermaid_code: str) -> str:
+        """
+        Cache key of a diagram
+
+        Args:
+            mermaid_code: Mermaid source
+
+        Returns:
+            Hex digest of the normalized source
+        """
+        return hashlib.sha256(normalize_mermaid(mermaid_code).encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}.png"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, mermaid_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a rendered diagram
+
+        Args:
+            mermaid_code: Mermaid source as generated (before any AI fix)
+
+        Returns:
+            Dictionary with "image" (PIL Image), "backend", "mermaid_code" and
+            "dot_code" (the sources that rendered, possibly AI-fixed), or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        key = self.make_key(mermaid_code)
+        png_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(png_path, 'rb') as f:
+                image = PILImage.open(BytesIO(f.read()))
+                image.load()
+            now = time.time()
+            os.utime(png_path, (now, now))  # Mark as recently used
+            os.utime(meta_path, (now, now))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Discarding unreadable diagram cache entry {key}: {e}")
+            self._remove(png_path)
+            self._remove(meta_path)
+            return None
+
+        entry["image"] = image
+        logging.info(f"Diagram cache hit ({entry.get('backend')})")
+        return entry
+
+    def put(self, mermaid_code: str, image: PILImage.Image, backend: str,
+            fixed_mermaid_code: str = None, dot_code: str = None):
+        """
+        Store a rendered diagram and evict old entries if the cache is full
+
+        Args:
+            mermaid_code: Mermaid source as generated (before any AI fix)
+            image: Rendered diagram
+            backend: Rendering backend that succeeded
+            fixed_mermaid_code: Mermaid source that actually rendered, if it was AI-fixed
+            dot_code: DOT source that rendered, for Graphviz-based backends
+        """
+        if not self.enabled:
+            return
+
+        key = self.make_key(mermaid_code)
+        png_path, meta_path = self._paths(key)
+        entry = {
+            "backend": backend,
+            "mermaid_code": fixed_mermaid_code or mermaid_code,
+            "dot_code": dot_code,
+            "created_at": time.time()
+        }
+        try:
+            buffer = BytesIO()
+            image.save(buffer, format='PNG')
+            # Write to temporary files first so readers never see a partial entry;
+            # the metadata goes last because get() reads it first
+            for path, data in ((png_path, buffer.getvalue()), (meta_path, json.dumps(entry).encode('utf-8'))):
+                fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Could not write diagram cache entry {key}: {e}")
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the size and entry limits are met"""
+        with self._lock:
+            entries = {}
+            total_size = 0
+            try:
+                for dir_entry in os.scandir(self.cache_dir):
+                    key, ext = os.path.splitext(dir_entry.name)
+                    if ext in ('.png', '.json'):
+                        stat = dir_entry.stat()
+                        mtime, size = entries.get(key, (0.0, 0))
+                        entries[key] = (max(mtime, stat.st_mtime), size + stat.st_size)
+                        total_size += stat.st_size
+            except OSError as e:
+                logging.warning(f"Could not scan diagram cache: {e}")
+                return
+
+            if total_size <= self.max_size_bytes and len(entries) <= self.max_entries:
+                return
+
+            remaining = len(entries)
+            for key, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+                if total_size <= self.max_size_bytes and remaining <= self.max_entries:
+                    break
+                for path in self._paths(key):
+                    self._remove(path)
+                total_size -= size
+                remaining -= 1
+
+            logging.info(f"Diagram cache evicted {len(entries) - remaining} entries")
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def get_diagram_cache() -> DiagramRenderCache:
+    """
+    Get the shared diagram render cache (singleton pattern)
+
+    Returns:
+        DiagramRenderCache instance
+    """
+    global _diagram_cache_instance
+
+    with _diagram_cache_lock:
+        if _diagram_cache_instance is None:
+            _diagram_cache_instance = DiagramRenderCache()
+        return _diagram_cache_instance
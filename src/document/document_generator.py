@@ -1,126 +1,54 @@
 import os
 import base64
-from datetime import datetime
-from typing import List, Tuple, Dict, Any, Optional
-from io import BytesIO
+import json
+import logging
 import re
 import tempfile
-import requests
 import time
 import subprocess
-# Document generation libraries
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from fpdf import FPDF
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Image, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.colors import black, blue, red, green
-
-# For diagram generation using mermaid.ink API
-from PIL import Image as PILImage
-import base64
-import urllib.parse
-from io import BytesIO
-from reportlab.platypus import Paragraph, Spacer, Image
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.units import inch
-from PIL import Image as PILImage
-from reportlab.platypus import Preformatted
-import urllib.parse
-import os
-import logging
-from docx.shared import Inches
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.oxml.shared import OxmlElement, qn
-import streamlit as st
-
-import logging
-# For OpenAI integration
-import json
-import os
-
-# Import our centralized OpenAI configuration
-from ..utils.openai_config import get_openai_client, get_chat_model_name, OPENAI_AVAILABLE, USE_AZURE
-import logging
-
-from ..utils.logger_config import setup_logger
-
-setup_logger()
-
-import logging
-import requests
-from io import BytesIO
-from PIL import Image as PILImage
-from openai import AzureOpenAI
-import json
-
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.units import inch
-from PIL import Image as PILImage
-from reportlab.platypus import Preformatted
-import base64
-import urllib.parse
-import os
-import logging
-from docx.shared import Inches
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.oxml.shared import OxmlElement, qn
-
-# For OpenAI integration
-import json
-import os
-import base64
+import pickle
+import threading
+import multiprocessing
+import concurrent.futures
 from datetime import datetime
 from typing import List, Tuple, Dict, Any, Optional
 from io import BytesIO
-import re
-import tempfile
+
 import requests
-import time
+import graphviz
+from PIL import Image as PILImage
 
 # Document generation libraries
 from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from fpdf import FPDF
+from docx.shared import Inches
+from docx.oxml.shared import OxmlElement, qn
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Image, Spacer
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Image, Spacer, Preformatted
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.lib.colors import black, blue, red, green
+from reportlab.lib.colors import blue
 
-# For diagram generation using mermaid.ink API
-from PIL import Image as PILImage
-import base64
-import urllib.parse
-from io import BytesIO
-from reportlab.platypus import Paragraph, Spacer, Image
 # Import our centralized OpenAI configuration
 from ..utils.openai_config import get_openai_client, get_chat_model_name, OPENAI_AVAILABLE, USE_AZURE
-import logging
-
 from ..utils.logger_config import setup_logger
+from ..utils.lazy_imports import lazy_import
+from ..utils.api_usage_logger import log_openai_usage
+from .transcript_summarizer import get_transcript_summarizer
+from .screenshot_reasons import SpeechContextIndex, ScreenshotReasonEnhancer
+from .diagram_cache import get_diagram_cache
+from .mermaid_to_dot import mermaid_to_dot
+from ..utils.screenshot_asset import get_screenshot_asset, encode_assets
+
+# Only needed when speech segments come from the Streamlit session
+st = lazy_import("streamlit")
+
+# Worker processes that render PDF and DOCX output concurrently (see iter_documents)
+RENDER_WORKERS = 2
+_render_pool = None
+_render_pool_lock = threading.Lock()
 
 setup_logger()
 
-import base64
-import time
-import logging
-import requests
-from io import BytesIO
-from PIL import Image as PILImage
-import json
-import subprocess
-import requests
-from io import BytesIO
-from PIL import Image as PILImage
-import graphviz
-import re
-from ..utils.api_usage_logger import log_openai_usage, log_whisper_usage
-
 class MermaidDiagramGenerator:
     def __init__(self):
         """
@@ -132,10 +60,25 @@ class MermaidDiagramGenerator:
             "https://kroki.io/mermaid/svg/",
             "https://quickchart.io/mermaid?chart="
         ]
+
+        # "cascade" tries the rendering services in order, "local" renders only with Graphviz,
+        # "hedged" races local Graphviz against hedge_remote
+        self.render_mode = "cascade"
+        self.hedge_remote = "mermaid.ink"
+        try:
+            from ..utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            diagram_config = app_config.get('processing', {}).get('diagrams', {})
+            self.render_mode = diagram_config.get('render_mode', self.render_mode)
+            self.hedge_remote = diagram_config.get('hedge_remote', self.hedge_remote)
+        except Exception as e:
+            logging.warning(f"Could not load diagram settings, using defaults: {e}")
     
     def _convert_mermaid_to_dot(self, mermaid_code: str) -> str:
         """
-        Convert Mermaid flowchart to DOT format using AI.
+        Convert Mermaid flowchart to DOT format, locally when the constructs are
+        supported and using AI otherwise.
         
         Args:
             mermaid_code: The mermaid code to convert
@@ -143,6 +86,11 @@ class MermaidDiagramGenerator:
         Returns:
             DOT format code or None if conversion fails
         """
+        dot_code = mermaid_to_dot(mermaid_code)
+        if dot_code:
+            logging.info("DEBUG: Converted Mermaid to DOT locally")
+            return dot_code
+
         try:
             logging.info("DEBUG: Converting Mermaid to DOT format using AI")
             
@@ -358,12 +306,13 @@ stop
             logging.error(f"Graphviz CLI error: {e}")
             return None
     
-    def _render_with_plantuml_fallback(self, mermaid_code: str) -> PILImage.Image:
+    def _render_with_plantuml_fallback(self, mermaid_code: str, cancel_event: threading.Event = None) -> PILImage.Image:
         """
         Another fallback: Convert to PlantUML and render.
         
         Args:
             mermaid_code: The mermaid code to render
+            cancel_event: Set to abandon the render (e.g. another backend already won)
             
         Returns:
             PIL Image object or None if failed
@@ -384,6 +333,8 @@ stop
             compressed = zlib.compress(plantuml_code.encode('utf-8'))
             encoded = base64.b64encode(compressed).decode('ascii')
             
+            if cancel_event is not None and cancel_event.is_set():
+                return None
             response = requests.get(f"{api_url}{encoded}", timeout=15)
             
             if response.status_code == 200:
@@ -494,13 +445,15 @@ stop
         except:
             return f"HTTP {response.status_code}: Unable to parse error response"
     
-    def _render_with_mermaid_ink(self, mermaid_code: str, max_attempts: int = 5) -> PILImage.Image:
+    def _render_with_mermaid_ink(self, mermaid_code: str, max_attempts: int = 5,
+                                 cancel_event: threading.Event = None) -> PILImage.Image:
         """
         Generate diagram from mermaid code using mermaid.ink with retries.
         
         Args:
             mermaid_code: The mermaid code to render
             max_attempts: Maximum number of attempts
+            cancel_event: Set to stop retrying (e.g. another backend already won)
             
         Returns:
             PIL Image object or error dict if failed
@@ -517,6 +470,9 @@ stop
         api_url = f'https://mermaid.ink/img/{base64_string}'
 
         for attempt in range(max_attempts):
+            if cancel_event is not None and cancel_event.is_set():
+                logging.info("DEBUG: Mermaid.ink render cancelled")
+                return None
             logging.info(f"DEBUG: Mermaid.ink attempt {attempt + 1} - Calling API: {api_url[:100]}...")
             try:
                 response = requests.get(api_url, timeout=15)
@@ -538,11 +494,16 @@ stop
                 if attempt < max_attempts - 1:
                     wait_time = 2 ** attempt  # Exponential backoff
                     logging.info(f"DEBUG: Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    if cancel_event is None:
+                        time.sleep(wait_time)
+                    elif cancel_event.wait(wait_time):
+                        logging.info("DEBUG: Mermaid.ink render cancelled")
+                        return None
 
         return None
     
-    def _generate_diagram_from_code(self, mermaid_code: str, max_attempts: int = 5, api_endpoint: str = "mermaid.ink") -> PILImage.Image:
+    def _generate_diagram_from_code(self, mermaid_code: str, max_attempts: int = 5, api_endpoint: str = "mermaid.ink",
+                                    cancel_event: threading.Event = None) -> PILImage.Image:
         """
         Generate diagram from mermaid code with retries using specified API.
         
@@ -550,6 +511,7 @@ stop
             mermaid_code: The mermaid code to render
             max_attempts: Maximum number of attempts
             api_endpoint: Which API to use ("mermaid.ink", "kroki", "quickchart")
+            cancel_event: Set to stop retrying (e.g. another backend already won)
             
         Returns:
             PIL Image object or error dict if failed
@@ -560,7 +522,7 @@ stop
         elif api_endpoint == "mermaid-cli":
             return self._render_with_mermaid_cli(mermaid_code)
         else: 
-            return self._render_with_mermaid_ink(mermaid_code, max_attempts)
+            return self._render_with_mermaid_ink(mermaid_code, max_attempts, cancel_event=cancel_event)
         
     def _fix_dot_code_with_ai(self, original_dot_code: str, error_message: str, original_mermaid: str, deployment_name: str = None) -> str:
         """
@@ -763,6 +725,11 @@ Please provide only the corrected Mermaid code."""
             PIL Image object of the generated diagram or None if all attempts fail.
         """
         try:
+            # Known diagrams (and broken ones that were AI-fixed before) come straight from the cache
+            cached = get_diagram_cache().get(mermaid_code)
+            if cached:
+                return cached["image"]
+
             logging.info(f"DEBUG: Creating mermaid diagram with enhanced fallbacks")
             
             # Enhanced list of rendering methods in order of preference
@@ -775,10 +742,28 @@ Please provide only the corrected Mermaid code."""
                 ("plantuml", "PlantUML (as last resort)"),
             ]
             
-            # If fallbacks are disabled, only use the primary method
-            if not use_fallbacks:
+            if self.render_mode == "local":
+                # Offline deployments: never wait on a network rendering service
+                rendering_methods = [("graphviz", "Graphviz (local)")]
+            elif not use_fallbacks and self.render_mode == "hedged":
+                # The race itself is the primary method: keep Graphviz and the remote
+                # service, drop the other fallbacks
+                rendering_methods = [method for method in rendering_methods
+                                     if method[0] in ("graphviz", self.hedge_remote)]
+                logging.info(f"DEBUG: Fallbacks disabled, racing only "
+                             f"{', '.join(name for name, _ in rendering_methods)}")
+            elif not use_fallbacks:
+                # If fallbacks are disabled, only use the primary method
                 rendering_methods = rendering_methods[:1]
             
+            original_results = {}
+            if self.render_mode == "hedged":
+                winner, result, dot_code, original_results = self._render_hedged(mermaid_code, rendering_methods)
+                if winner:
+                    get_diagram_cache().put(mermaid_code, result, winner, dot_code=dot_code)
+                    return result
+                logging.info("DEBUG: Every backend failed on the original code, starting AI fixes")
+            
             current_code = mermaid_code
             current_dot_code = None  # Track DOT code for Graphviz
             last_error = None
@@ -798,17 +783,13 @@ Please provide only the corrected Mermaid code."""
                     else:
                         logging.info(f"DEBUG: {method_desc} - AI fixing attempt {ai_attempt}/{max_ai_attempts}")
                     
-                    # Route to appropriate renderer
-                    if method_name == "graphviz":
-                        result = self._render_with_graphviz(
-                            method_mermaid_code, 
-                            dot_code=method_dot_code,
-                            attempt_num=ai_attempt + 1
-                        )
-                    elif method_name == "plantuml":
-                        result = self._render_with_plantuml_fallback(method_mermaid_code)
+                    if ai_attempt == 0 and method_name in original_results:
+                        # Already tried on the original code by the hedged race
+                        result, method_dot_code = original_results[method_name]
                     else:
-                        result = self._generate_diagram_from_code(method_mermaid_code, api_endpoint=method_name)
+                        result, method_dot_code = self._render_with_method(
+                            method_name, method_mermaid_code, dot_code=method_dot_code, attempt_num=ai_attempt + 1
+                        )
                     
                     # If successful, return the image
                     if isinstance(result, PILImage.Image):
@@ -818,6 +799,11 @@ Please provide only the corrected Mermaid code."""
                         if ai_attempt > 0:
                             success_msg += f" after {ai_attempt} AI fix(es)"
                         logging.info(success_msg)
+                        get_diagram_cache().put(
+                            mermaid_code, result, method_name,
+                            fixed_mermaid_code=method_mermaid_code if method_mermaid_code != mermaid_code else None,
+                            dot_code=method_dot_code if method_name == "graphviz" else None
+                        )
                         return result
                     
                     # Handle failures and AI fixing
@@ -863,6 +849,84 @@ Please provide only the corrected Mermaid code."""
             import traceback
             logging.error(f"Full error: {traceback.format_exc()}")
             return None
+
+    def _render_with_method(self, method_name: str, mermaid_code: str, dot_code: str = None, attempt_num: int = 1,
+                            cancel_event: threading.Event = None):
+        """
+        Render mermaid code with one backend.
+
+        Args:
+            method_name: Backend name from the rendering methods list
+            mermaid_code: The mermaid code to render
+            dot_code: DOT code to render with Graphviz (None to convert from mermaid)
+            attempt_num: Current attempt number for logging
+            cancel_event: Set to abandon the render; checked before starting and
+                          between the retries of the remote services
+
+        Returns:
+            Tuple of (result, DOT code used by Graphviz or None), where result is a
+            PIL Image, an error dict or None
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            return None, None
+        if method_name == "graphviz":
+            # Convert here rather than inside the renderer so the DOT source can be cached
+            if dot_code is None:
+                dot_code = self._convert_mermaid_to_dot(mermaid_code)
+            if not dot_code:
+                return None, None
+            return self._render_with_graphviz(mermaid_code, dot_code=dot_code, attempt_num=attempt_num), dot_code
+        if method_name == "plantuml":
+            return self._render_with_plantuml_fallback(mermaid_code, cancel_event=cancel_event), None
+        return self._generate_diagram_from_code(mermaid_code, api_endpoint=method_name, cancel_event=cancel_event), None
+
+    def _render_hedged(self, mermaid_code: str, rendering_methods: list):
+        """
+        Race the rendering backends on the original mermaid code.
+
+        Local Graphviz and the configured remote service start together; if neither
+        produces an image, the remaining backends race next. The first valid image
+        wins; the losers are told to stop through a cancel event, so they give up
+        before their next request or retry instead of finishing in the background.
+
+        Args:
+            mermaid_code: The mermaid code to render
+            rendering_methods: List of (method name, description) tuples
+
+        Returns:
+            Tuple of (winning method name or None, PIL Image or None, DOT code or None,
+            {method name: (result, DOT code)} for every backend that finished)
+        """
+        method_names = [name for name, _ in rendering_methods]
+        first_round = [name for name in ("graphviz", self.hedge_remote) if name in method_names]
+        rounds = [first_round, [name for name in method_names if name not in first_round]]
+
+        results = {}
+        for round_names in rounds:
+            if not round_names:
+                continue
+            logging.info(f"DEBUG: Racing diagram backends: {', '.join(round_names)}")
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(round_names))
+            cancel_event = threading.Event()
+            try:
+                futures = {executor.submit(self._render_with_method, name, mermaid_code, cancel_event=cancel_event): name
+                           for name in round_names}
+                for future in concurrent.futures.as_completed(futures):
+                    name = futures[future]
+                    try:
+                        result, dot_code = future.result()
+                    except Exception as e:
+                        logging.warning(f"{name} rendering failed: {e}")
+                        result, dot_code = None, None
+                    results[name] = (result, dot_code)
+                    if isinstance(result, PILImage.Image):
+                        logging.info(f"✓ Success with {name} (hedged)")
+                        return name, result, dot_code, results
+            finally:
+                cancel_event.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        return None, None, None, results
         
 class MermaidDiagramGenerator_v1:
     def __init__(self):
@@ -1273,7 +1337,6 @@ class DocumentGenerator:
             generate_process_map: Whether to generate process map diagram
         """
         self.video_path = video_path
-        self.screenshots = screenshots
         self.use_ai = use_ai and OPENAI_AVAILABLE
         self.title = title if title else os.path.basename(video_path).split('.')[0]
         self.description = description if description else f"Documentation generated from {os.path.basename(video_path)}"
@@ -1287,8 +1350,12 @@ class DocumentGenerator:
         self.meeting_duration_minutes = meeting_duration_minutes or 0
         
         # The screenshots should already be deduplicated in app.py
-        # Just make sure they're sorted by timestamp
-        self.screenshots.sort(key=lambda x: x[1])
+        # Just make sure they're sorted by timestamp (in a copy: sessions loaded from
+        # storage hand in a read-only sequence)
+        self.screenshots = sorted(screenshots, key=lambda x: x[1])
+        
+        # Document model shared by every output format (built on first use)
+        self._document_model = None
         
         # Initialize OpenAI client if available
         if self.use_ai and OPENAI_AVAILABLE:
@@ -1298,6 +1365,13 @@ class DocumentGenerator:
             self.client = None
             self.model = None
 
+    def __getstate__(self):
+        # The API client holds connections and locks; renderers working from the
+        # document model in another process never need it
+        state = self.__dict__.copy()
+        state['client'] = None
+        return state
+
     
 
     def generate_mermaid_editor_url_docx(self, mermaid_code):
@@ -1423,6 +1497,10 @@ class DocumentGenerator:
             
             # Clean up the mermaid code
             mermaid_code = mermaid_code.strip()
+
+            cached = get_diagram_cache().get(mermaid_code)
+            if cached:
+                return cached["image"]
             
             # Encode the mermaid code for the API
             graphbytes = mermaid_code.encode("utf8")
@@ -1442,6 +1520,7 @@ class DocumentGenerator:
                     if response.status_code == 200:
                         img = PILImage.open(BytesIO(response.content))
                         logging.info(f"DEBUG: Successfully created diagram image: {img.size}")
+                        get_diagram_cache().put(mermaid_code, img, "mermaid.ink")
                         return img
                     else:
                         logging.info(f"Error from mermaid.ink API: Status code {response.status_code}")
@@ -1593,12 +1672,16 @@ class DocumentGenerator:
         
         return keywords[:5]  # Return top 5 keywords
 
-    def _enhance_screenshot_reasons(self, speech_segments):
+    def _enhance_screenshot_reasons(self, speech_segments, context_index: SpeechContextIndex = None):
         """
         Enhance screenshot reasons using AI analysis for better contextual descriptions
         
+        Screenshots that need AI are sent in a few batched requests instead of one
+        request each.
+        
         Args:
             speech_segments: List of (timestamp, text) tuples
+            context_index: Optional prebuilt SpeechContextIndex over speech_segments
             
         Returns:
             List of enhanced screenshots with better contextual reasons
@@ -1606,54 +1689,68 @@ class DocumentGenerator:
         if not self.use_ai:
             return self.screenshots
         
+        if context_index is None:
+            context_index = SpeechContextIndex(speech_segments)
+        
         enhanced_screenshots = []
+        ai_requests = []
         
         try:
             # Prepare context for AI analysis
             for img, ts, original_reason in self.screenshots:
                 # Get speech context around this timestamp (10 seconds before and after)
-                context_speech = []
-                for speech_ts, speech_text in speech_segments:
-                    if abs(speech_ts - ts) <= 10:  # Within 10 seconds
-                        context_speech.append(f"[{speech_ts:.1f}s] {speech_text}")
-                
-                speech_context = "\n".join(context_speech) if context_speech else "No speech detected nearby"
+                context_speech = [f"[{speech_ts:.1f}s] {speech_text}"
+                                  for speech_ts, speech_text in context_index.window(ts, 10, 10)]
                 
                 # Determine screenshot type and enhance reason
                 enhanced_reason = original_reason
+                detection_type = None
+                reason_lower = original_reason.lower()
                 
-                if "sampled frame" in original_reason.lower():
+                if "sampled frame" in reason_lower:
                     # These are generic samples - enhance with AI
-                    if self.use_ai and speech_context != "No speech detected nearby":
-                        enhanced_reason = self._get_ai_enhanced_reason(ts, speech_context, "visual content analysis")
+                    if context_speech:
+                        detection_type = "visual content analysis"
                     else:
                         enhanced_reason = f"Key visual moment at {ts:.1f}s"
                 
-                elif "scene change" in original_reason.lower():
+                elif "scene change" in reason_lower:
                     # Scene change detected - enhance with context
-                    if speech_context != "No speech detected nearby":
-                        enhanced_reason = self._get_ai_enhanced_reason(ts, speech_context, "scene transition")
+                    if context_speech:
+                        detection_type = "scene transition"
                     else:
                         enhanced_reason = f"Scene transition detected - {original_reason}"
                 
-                elif "keyword trigger" in original_reason.lower():
-                    if speech_context != "No speech detected nearby":
-                        enhanced_reason = self._get_ai_enhanced_reason(ts, speech_context, "scene transition")
+                elif "keyword trigger" in reason_lower:
+                    if context_speech:
+                        detection_type = "scene transition"
                     else:
                         enhanced_reason = original_reason.replace("Keyword trigger: ", "Speech keyword detected: ")
                                 
-                elif "ai detected" in original_reason.lower():
+                elif "ai detected" in reason_lower:
                     # AI detection - already enhanced, keep as is
                     enhanced_reason = original_reason
                 
                 else:
                     # Other types (mouse clicks, UI changes, etc.) - enhance if we have speech context
-                    if speech_context != "No speech detected nearby":
-                        enhanced_reason = self._get_ai_enhanced_reason(ts, speech_context, "user interaction")
-                    else:
-                        enhanced_reason = original_reason
+                    if context_speech:
+                        detection_type = "user interaction"
+                
+                if detection_type is not None:
+                    ai_requests.append({
+                        "id": len(enhanced_screenshots),
+                        "timestamp": ts,
+                        "detection_type": detection_type,
+                        "context": context_speech
+                    })
                 
                 enhanced_screenshots.append((img, ts, enhanced_reason))
+            
+            if ai_requests and self.client:
+                enhancer = ScreenshotReasonEnhancer(self.client, self.model)
+                for index, enhanced_reason in enhancer.enhance(ai_requests).items():
+                    img, ts, _ = enhanced_screenshots[index]
+                    enhanced_screenshots[index] = (img, ts, enhanced_reason)
                 
         except Exception as e:
             logging.info(f"Error enhancing screenshot reasons: {e}")
@@ -1661,77 +1758,6 @@ class DocumentGenerator:
         
         return enhanced_screenshots
 
-    def _get_ai_enhanced_reason(self, timestamp, speech_context, detection_type):
-        """
-        Get AI-enhanced reason for a screenshot based on speech context
-        
-        Args:
-            timestamp: Screenshot timestamp
-            speech_context: Speech text around the timestamp
-            detection_type: Type of detection (visual, scene transition, user interaction)
-            
-        Returns:
-            Enhanced contextual reason string
-        """
-        try:
-            from openai_config import get_openai_client, get_chat_model_name
-            
-            client = get_openai_client()
-            if not client:
-                return f"Key moment at {timestamp:.1f}s"
-            
-            model_name = get_chat_model_name()
-            if not model_name:
-                return f"Key moment at {timestamp:.1f}s"
-            
-            prompt = f"""
-            Analyze this screenshot moment and provide a brief, contextual description.
-            
-            Timestamp: {timestamp:.1f} seconds
-            Detection Type: {detection_type}
-            Speech Context:
-            {speech_context}
-            
-            Provide a concise reason (max 60 characters) that explains what's likely happening at this moment based on the speech context. Focus on:
-            - What action or feature is being demonstrated
-            - What UI element or screen is being shown
-            - What process or workflow step is occurring
-            
-            Format: Brief descriptive phrase (no "Screenshot of" or "Image showing")
-            Examples: "Login screen demonstration", "Dashboard navigation", "Settings configuration", "Report generation process"
-            """
-            
-            response = client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": "You are an expert at analyzing video content and providing concise, contextual descriptions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=50,
-                temperature=0.3
-            )
-            
-            usage = response.usage
-            if usage:
-                log_openai_usage(
-                    module_name=__name__,
-                    model=get_chat_model_name(),
-                    prompt_tokens=usage.prompt_tokens,
-                    completion_tokens=usage.completion_tokens,
-                    function_name="_get_ai_enhanced_reason"
-                )
-            enhanced_reason = response.choices[0].message.content.strip()
-            
-            # Ensure it's not too long
-            if len(enhanced_reason) > 60:
-                enhanced_reason = enhanced_reason[:57] + "..."
-            
-            return enhanced_reason
-            
-        except Exception as e:
-            logging.info(f"Error getting AI enhanced reason: {e}")
-            return f"Key moment at {timestamp:.1f}s ({detection_type})"
-
     def _add_formatted_text_to_docx(self, doc, text_content):
         """
         Add formatted text to DOCX document with proper markdown handling
@@ -1798,7 +1824,7 @@ class DocumentGenerator:
             return ""
             
         # Combine all speech segments into a full transcript
-        full_transcript = "\n".join([text for _, text in self.speech_segments])
+        full_transcript = get_transcript_summarizer().condensed_transcript(self.speech_segments, with_timestamps=False)
         
         prompt = f"""
         Based on the following meeting transcript, identify important questions that should be asked in future meetings to gather missing information.
@@ -1867,7 +1893,7 @@ class DocumentGenerator:
             return ""
             
         # Combine all speech segments into a full transcript
-        full_transcript = "\n".join([text for _, text in self.speech_segments])
+        full_transcript = get_transcript_summarizer().condensed_transcript(self.speech_segments, with_timestamps=False)
         
         mermaid_template = """
         
@@ -2009,32 +2035,28 @@ class DocumentGenerator:
         # Sort speech segments by timestamp
         speech_segments.sort(key=lambda x: x[0])
         
-        # Prepare the full transcript for OpenAI analysis
-        full_transcript = ""
-        for timestamp, text in speech_segments:
-            full_transcript += f"[{timestamp:.2f}s] {text}\n"
+        # Prepare the full transcript for OpenAI analysis (condensed window by
+        # window if the meeting is too long for one request)
+        full_transcript = get_transcript_summarizer().condensed_transcript(speech_segments)
         
         # Enhance screenshot reasons with AI analysis if available
-        enhanced_screenshots = self._enhance_screenshot_reasons(speech_segments)
+        context_index = SpeechContextIndex(speech_segments)
+        enhanced_screenshots = self._enhance_screenshot_reasons(speech_segments, context_index)
         
         # Create enhanced screenshot context with 5-second chunking and 30-second speech context
         screenshot_context = "\n🎯 SCREENSHOTS WITH DETAILED CONTEXT:\n"
         
         for enhanced_img, ts, enhanced_reason in enhanced_screenshots:
             # Get 30-second speech context around this screenshot (15 seconds before and after)
-            context_start = max(0, ts - 15)
-            context_end = ts + 15
-            
             speech_context = []
-            for speech_ts, speech_text in speech_segments:
-                if context_start <= speech_ts <= context_end:
-                    time_diff = speech_ts - ts
-                    if time_diff < 0:
-                        speech_context.append(f"  [{time_diff:.1f}s before] {speech_text}")
-                    elif time_diff > 0:
-                        speech_context.append(f"  [+{time_diff:.1f}s after] {speech_text}")
-                    else:
-                        speech_context.append(f"  [EXACT TIME] {speech_text}")
+            for speech_ts, speech_text in context_index.window(ts, 15, 15):
+                time_diff = speech_ts - ts
+                if time_diff < 0:
+                    speech_context.append(f"  [{time_diff:.1f}s before] {speech_text}")
+                elif time_diff > 0:
+                    speech_context.append(f"  [+{time_diff:.1f}s after] {speech_text}")
+                else:
+                    speech_context.append(f"  [EXACT TIME] {speech_text}")
             
             screenshot_context += f"\n📷 Screenshot at {ts:.2f}s: {enhanced_reason}\n"
             if speech_context:
@@ -2465,7 +2487,273 @@ class DocumentGenerator:
             "used_timestamps": used_timestamps,
             "find_screenshot": find_closest_unused_screenshot
         }
-    
+
+    def get_document_model(self) -> Dict[str, Any]:
+        """
+        Get the format-independent document model, building it on first use.
+
+        The narrative structure (one LLM call), the screenshot placements and the
+        process diagram are computed once per generator, so generating both a PDF
+        and a DOCX costs no more LLM calls or diagram renders than generating one.
+        Renderers only read the model.
+
+        Returns:
+            Narrative structure from _generate_narrative_documentation where every
+            section and subsection also has a "screenshots" list of placements
+            ({"timestamp", "image", "reason", "asset"}), every section has "diagram_png"
+            (PNG bytes of its process diagram, or None) and "content_parts" (its
+            content split into text and pre-rendered mermaid diagrams)
+        """
+        if self._document_model is None:
+            self._document_model = self._build_document_model()
+        return self._document_model
+
+    def _build_document_model(self) -> Dict[str, Any]:
+        """Generate the narrative structure and resolve its screenshots and diagram"""
+        doc_structure = self._generate_narrative_documentation()
+        sections = doc_structure.setdefault('sections', [])
+
+        # Make sure the document structure has screenshot timestamps
+        if sections and self.include_screenshots:
+            sections_with_timestamps = sum(1 for s in sections if s.get('screenshot_timestamps'))
+            if sections_with_timestamps == 0:
+                logging.info("DEBUG: No sections have screenshot timestamps, distributing screenshots")
+                all_timestamps = [ts for img, ts, _ in self.screenshots if img is not None]
+                screenshots_per_section = max(1, len(all_timestamps) // len(sections))
+
+                for i, section in enumerate(sections):
+                    start_idx = i * screenshots_per_section
+                    end_idx = min(start_idx + screenshots_per_section, len(all_timestamps))
+                    section['screenshot_timestamps'] = all_timestamps[start_idx:end_idx]
+
+        # Resolve screenshots in document order so each one is placed at most once
+        find_screenshot = self._prepare_screenshot_tracking()["find_screenshot"]
+        for section in sections:
+            section['content_parts'] = self._split_content_diagrams(section.get('content', ''))
+            section['screenshots'] = self._resolve_screenshot_placements(section, find_screenshot)
+            for subsection in section.get('subsections', []):
+                subsection['screenshots'] = self._resolve_screenshot_placements(subsection, find_screenshot)
+
+            section['diagram_png'] = None
+            if section.get('diagram_image') is not None:
+                try:
+                    diagram_buffer = BytesIO()
+                    section['diagram_image'].save(diagram_buffer, format='PNG')
+                    section['diagram_png'] = diagram_buffer.getvalue()
+                except Exception as e:
+                    logging.info(f"Error encoding process diagram: {e}")
+
+        self._render_content_diagrams(sections)
+
+        # Encode every placed screenshot once, in parallel; all renderers reuse the bytes
+        assets = [placement['asset']
+                  for section in sections
+                  for holder in [section] + section.get('subsections', [])
+                  for placement in holder['screenshots']]
+        encode_assets(list(dict.fromkeys(assets)), 'png')
+
+        logging.info(f"DEBUG: Built document model with {len(sections)} sections")
+        return doc_structure
+
+    @staticmethod
+    def _split_content_diagrams(content: str) -> List[Dict[str, Any]]:
+        """
+        Split section content into text parts and mermaid diagram parts
+
+        Args:
+            content: Section content, possibly with ```mermaid blocks
+
+        Returns:
+            List of {"text": str} or {"mermaid": str, "image": None, "png": None} parts
+        """
+        parts = []
+        # re.split puts the captured ```mermaid blocks at the odd indices
+        for index, part in enumerate(re.split(r'```mermaid\s+(.*?)\s+```', content or '', flags=re.DOTALL)):
+            part = part.strip()
+            if not part:
+                continue
+            if index % 2:
+                parts.append({"mermaid": part, "image": None, "png": None})
+            else:
+                parts.append({"text": part})
+        return parts
+
+    def _render_content_diagrams(self, sections: List[Dict[str, Any]]):
+        """
+        Render every mermaid diagram in the section contents concurrently
+
+        Each diagram part gets its PIL image and PNG bytes (None if rendering failed),
+        so renderers embed them from memory.
+
+        Args:
+            sections: Sections with "content_parts" from _split_content_diagrams
+        """
+        diagram_parts = [part for section in sections for part in section['content_parts'] if 'mermaid' in part]
+        if not diagram_parts:
+            return
+
+        max_workers = 4
+        try:
+            from ..utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            max_workers = app_config.get('processing', {}).get('diagrams', {}).get('max_workers', max_workers)
+        except Exception as e:
+            logging.warning(f"Could not load diagram settings, using defaults: {e}")
+
+        # Identical diagrams are rendered once, honouring processing.diagrams.render_mode
+        unique_codes = list(dict.fromkeys(part['mermaid'] for part in diagram_parts))
+        generator = MermaidDiagramGenerator()
+        logging.info(f"DEBUG: Rendering {len(unique_codes)} content diagrams with {max_workers} workers")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique_codes))) as executor:
+            rendered = dict(zip(unique_codes, executor.map(
+                lambda mermaid_code: self._render_diagram_png(mermaid_code, generator), unique_codes)))
+
+        for part in diagram_parts:
+            part['image'], part['png'] = rendered[part['mermaid']]
+
+    def _render_diagram_png(self, mermaid_code: str, generator: "MermaidDiagramGenerator"):
+        """
+        Render a mermaid diagram to a PIL image and PNG bytes
+
+        Args:
+            mermaid_code: The mermaid flowchart code
+            generator: MermaidDiagramGenerator shared by the section diagrams
+
+        Returns:
+            Tuple of (PIL Image, PNG bytes), or (None, None) if rendering failed
+        """
+        try:
+            mermaid_image = generator.create_mermaid_diagram(
+                mermaid_code=mermaid_code,
+                deployment_name="gpt-4o",
+                enable_ai_fix=False  # Failed diagrams are shown as source instead
+            )
+            if mermaid_image is None:
+                return None, None
+            png_buffer = BytesIO()
+            mermaid_image.save(png_buffer, format='PNG')
+            return mermaid_image, png_buffer.getvalue()
+        except Exception as e:
+            logging.info(f"DEBUG: Error rendering mermaid from content: {e}")
+            return None, None
+
+    def _resolve_screenshot_placements(self, section: Dict[str, Any], find_screenshot) -> List[Dict[str, Any]]:
+        """
+        Match a section's requested screenshot timestamps to actual screenshots
+
+        Args:
+            section: Section or subsection with optional "screenshot_timestamps"
+            find_screenshot: Lookup function from _prepare_screenshot_tracking
+
+        Returns:
+            List of {"timestamp", "image", "reason", "asset"} placements
+        """
+        placements = []
+        for ts in section.get('screenshot_timestamps', []):
+            if isinstance(ts, str):
+                try:
+                    ts = float(ts)
+                except ValueError:
+                    continue
+
+            screenshot_result = find_screenshot(ts)
+            if screenshot_result and screenshot_result[0] is not None:
+                img, reason = screenshot_result
+                placements.append({"timestamp": ts, "image": img, "reason": reason,
+                                   "asset": get_screenshot_asset(img)})
+        return placements
+
+    @staticmethod
+    def _placement_png(placement: Dict[str, Any]) -> BytesIO:
+        """
+        PNG of a screenshot placement, shared by every renderer through its ScreenshotAsset
+
+        Args:
+            placement: Screenshot placement from the document model
+
+        Returns:
+            BytesIO positioned at the start of the PNG data
+        """
+        return placement['asset'].buffer('png')
+
+    def _render_payload(self) -> bytes:
+        """
+        Pickle what a render worker needs once the document model is built
+
+        Renderers of the narrative document model only embed the screenshots it
+        places, so the other screenshots stay in this process. The basic format
+        (no AI) lists every screenshot and ships them all.
+
+        Returns:
+            Pickled generator state
+        """
+        state = self.__getstate__()
+        if self.use_ai and OPENAI_AVAILABLE:
+            placed = {}
+            for section in self._document_model.get('sections', []):
+                for holder in [section] + section.get('subsections', []):
+                    for placement in holder['screenshots']:
+                        placed.setdefault(id(placement['image']),
+                                          (placement['image'], placement['timestamp'], placement['reason']))
+            screenshots = sorted(placed.values(), key=lambda x: x[1])
+            if not screenshots:
+                # get_document_bytes only checks that a valid screenshot exists
+                screenshots = [s for s in self.screenshots if s[0] is not None][:1]
+            state['screenshots'] = screenshots
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def iter_documents(self, doc_types: List[str], parallel: bool = False):
+        """
+        Render several output formats from the shared document model
+
+        The document model is built (and every LLM call made) in this process. With
+        parallel=True the model and the screenshots it places are pickled once and
+        each format is laid out in a worker of a long-lived render pool, so a PDF
+        and a DOCX build in parallel.
+
+        Args:
+            doc_types: Formats to render ("pdf", "docx")
+            parallel: Render the formats in parallel worker processes
+
+        Yields:
+            (doc_type, document_bytes) tuples in completion order
+        """
+        self.get_document_model()
+
+        if not parallel or len(doc_types) < 2:
+            for doc_type in doc_types:
+                yield doc_type, self.get_document_bytes(doc_type)
+            return
+
+        rendered = set()
+        executor = None
+        try:
+            payload = self._render_payload()
+            executor = _get_render_pool()
+            futures = {
+                executor.submit(_render_document_bytes, payload, doc_type): doc_type
+                for doc_type in doc_types
+            }
+            del payload
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    doc_type = futures[future]
+                    document_bytes = future.result()
+                    rendered.add(doc_type)
+                    yield doc_type, document_bytes
+            finally:
+                for future in futures:
+                    future.cancel()
+        except Exception as e:
+            if executor is not None and isinstance(e, concurrent.futures.BrokenExecutor):
+                _reset_render_pool(executor)
+            logging.warning(f"Concurrent document rendering failed, rendering sequentially: {e}")
+
+        for doc_type in doc_types:
+            if doc_type not in rendered:
+                yield doc_type, self.get_document_bytes(doc_type)
+
     def generate_docx(self, output_path: str = "") -> str:
         """
         Generate a Word document with the screenshots and descriptions
@@ -2488,121 +2776,88 @@ class DocumentGenerator:
         
         # Generate narrative documentation if AI is available
         if self.use_ai and OPENAI_AVAILABLE:
-            doc_structure = self._generate_narrative_documentation()
-            
-            # Check if we have a saved process diagram file
-            import os
-            temp_diagram_path = "temp_process_diagram.png"
-            
-            # Use your regex pattern approach to find and embed mermaid diagrams
-            import re
-            pattern = r'```mermaid\s+(.*?)\s+```'
+            doc_structure = self.get_document_model()
             
             # Process each section from the narrative structure
             for section in doc_structure.get('sections', []):
                 # Add section heading
                 doc.add_heading(section['title'], level=1)
                 
-                # Add section content with proper formatting
-                content = section.get('content', '')
-                if content:
-                    # First, extract any mermaid diagrams using your pattern
-                    parts = re.split(pattern, content, flags=re.DOTALL)
-                    
-                    for i, part in enumerate(parts):
-                        part = part.strip()
-                        if not part:
+                # Add section content with proper formatting; mermaid diagrams were
+                # rendered by the document model
+                for content_part in section.get('content_parts', []):
+                    if 'mermaid' in content_part:
+                        # This is mermaid code, add its pre-rendered diagram
+                        if content_part['png'] is None:
+                            # Keep the diagram source readable when it could not be rendered
+                            code_paragraph = doc.add_paragraph()
+                            code_run = code_paragraph.add_run(content_part['mermaid'])
+                            code_run.font.name = 'Courier New'
+                            code_run.font.size = Inches(0.08)  # Approximately 9pt
                             continue
-                            
-                        # Check if this part looks like mermaid code
-                        if 'flowchart' in part or '-->' in part:
-                            # This is mermaid code, create and add diagram
-                            try:
-                                mermaid_image = self._create_mermaid_diagram(part)
-                                if mermaid_image:
-                                    # Save temporarily using your approach
-                                    temp_path = f"temp_mermaid_{i}.png"
-                                    mermaid_image.save(temp_path, format='PNG')
-                                    optimal_width, optimal_height = self._calculate_optimal_image_size(mermaid_image)
-
-                                    # Add to document
-                                    doc.add_paragraph("Process Flow Diagram:", style='Heading 3')
-                                    doc.add_picture(temp_path, width=Inches(optimal_width))
-                                    logging.info(f"DEBUG: Added mermaid diagram from content: {temp_path}")
-                                    
-                                    # Clean up temp file
-                                    if os.path.exists(temp_path):
-                                        os.remove(temp_path)
-                                        
-                            except Exception as e:
-                                logging.info(f"DEBUG: Error processing mermaid from content: {e}")
-                                doc.add_paragraph("[Process diagram could not be loaded]")
+                        try:
+                            optimal_width, optimal_height = self._calculate_optimal_image_size(content_part['image'])
+
+                            # Add to document
+                            doc.add_paragraph("Process Flow Diagram:", style='Heading 3')
+                            doc.add_picture(BytesIO(content_part['png']), width=Inches(optimal_width))
+                            logging.info("DEBUG: Added mermaid diagram from content")
+                        except Exception as e:
+                            logging.info(f"DEBUG: Error processing mermaid from content: {e}")
+                            doc.add_paragraph("[Process diagram could not be loaded]")
+                    else:
+                        part = content_part['text']
+                        # This is regular text content
+                        if '**' in part:
+                            lines = part.split('\n')
+                            for line in lines:
+                                line = line.strip()
+                                if not line:
+                                    continue
+                                # Handle bold headings (**TEXT**)
+                                if line.startswith('**') and line.endswith('**'):
+                                    heading_text = line.strip('*')
+                                    para = doc.add_paragraph()
+                                    para.add_run(heading_text).bold = True
+                                # Handle bullet points
+                                elif line.startswith('• ') or line.startswith('- '):
+                                    bullet_text = line[2:]
+                                    doc.add_paragraph(bullet_text, style='List Bullet')
+                                # Regular paragraphs
+                                else:
+                                    doc.add_paragraph(line)
                         else:
-                            # This is regular text content
-                            if '**' in part:
-                                lines = part.split('\n')
-                                for line in lines:
-                                    line = line.strip()
-                                    if not line:
-                                        continue
-                                    # Handle bold headings (**TEXT**)
-                                    if line.startswith('**') and line.endswith('**'):
-                                        heading_text = line.strip('*')
-                                        para = doc.add_paragraph()
-                                        para.add_run(heading_text).bold = True
-                                    # Handle bullet points
-                                    elif line.startswith('• ') or line.startswith('- '):
-                                        bullet_text = line[2:]
-                                        doc.add_paragraph(bullet_text, style='List Bullet')
-                                    # Regular paragraphs
-                                    else:
-                                        doc.add_paragraph(line)
-                            else:
-                                paragraphs = part.split('\n\n')
-                                for para in paragraphs:
-                                    if para.strip():
-                                        doc.add_paragraph(para.strip())
+                            paragraphs = part.split('\n\n')
+                            for para in paragraphs:
+                                if para.strip():
+                                    doc.add_paragraph(para.strip())
                 
                 # Add screenshots for this section if any
-                screenshot_tracking = self._prepare_screenshot_tracking()
-                for timestamp in section.get('screenshot_timestamps', []):
-                    screenshot_result = screenshot_tracking['find_screenshot'](timestamp)
-                    if screenshot_result:
-                        img, actual_timestamp, reason = screenshot_result
-                        
-                        # Add screenshot with caption
-                        from ..utils.media_utils import format_timestamp
-                        caption = f"Screenshot at {format_timestamp(actual_timestamp)}"
-                        caption_para = doc.add_paragraph()
-                        caption_para.add_run(caption).italic = True
-                        
-                        # Add the image
-                        img_buffer = BytesIO()
-                        img.save(img_buffer, format="PNG")
-                        img_buffer.seek(0)
-                        
-                        try:
-                            doc.add_picture(img_buffer, width=Inches(6))
-                        except Exception as e:
-                            logging.info(f"Error adding screenshot to DOCX: {e}")
-                            doc.add_paragraph(f"[Image could not be loaded: {e}]")
+                for placement in section.get('screenshots', []):
+                    # Add screenshot with caption
+                    from ..utils.media_utils import format_timestamp
+                    caption = f"Screenshot at {format_timestamp(placement['timestamp'])}"
+                    caption_para = doc.add_paragraph()
+                    caption_para.add_run(caption).italic = True
+                    
+                    # Add the image
+                    img_buffer = self._placement_png(placement)
+                    
+                    try:
+                        doc.add_picture(img_buffer, width=Inches(6))
+                    except Exception as e:
+                        logging.info(f"Error adding screenshot to DOCX: {e}")
+                        doc.add_paragraph(f"[Image could not be loaded: {e}]")
                 
                 # Add process diagram if this is a process map section
-                if section['title'] == 'Process Map' and section.get('diagram_image'):
+                if section['title'] == 'Process Map' and section.get('diagram_png'):
                     try:
-                        # Save diagram to a temporary file
-                        temp_path = "temp_process_diagram.png"
-                        section['diagram_image'].save(temp_path, format='PNG')
                         optimal_width, optimal_height = self._calculate_optimal_image_size(section['diagram_image'])
 
                         # Add to document
                         doc.add_paragraph("Process Flow Diagram:", style='Heading 3')
-                        doc.add_picture(temp_path, width=Inches(optimal_width))
-                        logging.info(f"DEBUG: Added process diagram to DOCX: {temp_path}")
-                        
-                        # Clean up temp file
-                        if os.path.exists(temp_path):
-                            os.remove(temp_path)
+                        doc.add_picture(BytesIO(section['diagram_png']), width=Inches(optimal_width))
+                        logging.info("DEBUG: Added process diagram to DOCX")
                     except Exception as e:
                         logging.info(f"Error adding process diagram to DOCX: {e}")
                         doc.add_paragraph("[Process diagram could not be loaded]")
@@ -2635,9 +2890,7 @@ class DocumentGenerator:
                 doc.add_paragraph(description_text)
                 
                 # Add the image
-                img_buffer = BytesIO()
-                img.save(img_buffer, format="PNG")
-                img_buffer.seek(0)
+                img_buffer = get_screenshot_asset(img).buffer('png')
                 
                 try:
                     doc.add_picture(img_buffer, width=Inches(6))
@@ -2716,7 +2969,7 @@ class DocumentGenerator:
         
         # Generate narrative documentation structure
         if self.use_ai and OPENAI_AVAILABLE:
-            doc_structure = self._generate_narrative_documentation()
+            doc_structure = self.get_document_model()
             
             # Add sections from the narrative structure
             for section in doc_structure.get('sections', []):
@@ -2724,43 +2977,63 @@ class DocumentGenerator:
                 elements.append(Paragraph(section['title'], heading1_style))
                 elements.append(Spacer(1, 0.2*inch))
                 
-                # Add section content with proper formatting
-                content = section.get('content', '')
-                if content:
-                    if '**' in content:
-                        formatted_content = self._format_content_for_pdf(content, normal_style, bold_style)
-                        elements.extend(formatted_content)
+                # Add section content with proper formatting; mermaid diagrams were
+                # rendered by the document model
+                content_parts = section.get('content_parts', [])
+                for content_part in content_parts:
+                    if 'mermaid' not in content_part:
+                        content = content_part['text']
+                        if '**' in content:
+                            formatted_content = self._format_content_for_pdf(content, normal_style, bold_style)
+                            elements.extend(formatted_content)
+                        else:
+                            elements.append(Paragraph(content, normal_style))
+                    elif content_part['png'] is None:
+                        # Keep the diagram source readable when it could not be rendered
+                        elements.append(Preformatted(
+                            content_part['mermaid'],
+                            ParagraphStyle(
+                                name='code_block',
+                                parent=normal_style,
+                                fontName='Courier',
+                                fontSize=8,
+                                leading=10,
+                                leftIndent=10,
+                            )
+                        ))
                     else:
-                        elements.append(Paragraph(content, normal_style))
+                        try:
+                            width_inches, height_inches = self._calculate_optimal_image_size(content_part['image'])
+                            diagram_img = Image(BytesIO(content_part['png']), width=width_inches*inch,
+                                                height=height_inches*inch)
+                            diagram_img.hAlign = 'CENTER'
+                            elements.append(diagram_img)
+                        except Exception as e:
+                            logging.info(f"Error adding content diagram to PDF: {e}")
+                            elements.append(Paragraph("[Process diagram could not be loaded]", normal_style))
+                if content_parts:
                     elements.append(Spacer(1, 0.2*inch))
                 
                 # Add screenshots for this section if any
-                screenshot_tracking = self._prepare_screenshot_tracking()
-                for timestamp in section.get('screenshot_timestamps', []):
-                    screenshot_result = screenshot_tracking['find_screenshot'](timestamp)
-                    if screenshot_result and screenshot_result[0]:
-                        img, actual_timestamp, reason = screenshot_result
-                        
-                        # Add screenshot with caption
-                        from ..utils.media_utils import format_timestamp
-                        caption = f"Screenshot at {format_timestamp(actual_timestamp)}"
-                        elements.append(Paragraph(caption, 
-                                                ParagraphStyle('caption', parent=normal_style, 
-                                                            fontSize=10, textColor=blue)))
-                        
-                        # Add the image
-                        img_buffer = BytesIO()
-                        img.save(img_buffer, format="PNG")
-                        img_buffer.seek(0)
-                        
-                        try:
-                            img_for_pdf = Image(img_buffer, width=5*inch, height=3*inch)
-                            elements.append(img_for_pdf)
-                        except Exception as e:
-                            logging.info(f"Error adding screenshot to PDF: {e}")
-                            elements.append(Paragraph(f"[Image could not be loaded: {e}]", normal_style))
-                        
-                        elements.append(Spacer(1, 0.3*inch))
+                for placement in section.get('screenshots', []):
+                    # Add screenshot with caption
+                    from ..utils.media_utils import format_timestamp
+                    caption = f"Screenshot at {format_timestamp(placement['timestamp'])}"
+                    elements.append(Paragraph(caption, 
+                                            ParagraphStyle('caption', parent=normal_style, 
+                                                        fontSize=10, textColor=blue)))
+                    
+                    # Add the image
+                    img_buffer = self._placement_png(placement)
+                    
+                    try:
+                        img_for_pdf = Image(img_buffer, width=5*inch, height=3*inch)
+                        elements.append(img_for_pdf)
+                    except Exception as e:
+                        logging.info(f"Error adding screenshot to PDF: {e}")
+                        elements.append(Paragraph(f"[Image could not be loaded: {e}]", normal_style))
+                    
+                    elements.append(Spacer(1, 0.3*inch))
                 
                 # Add visual diagram if this is a process map section
                 if section['title'] == 'Process Map' and section.get('diagram_image'):
@@ -2839,9 +3112,7 @@ class DocumentGenerator:
                 elements.append(Spacer(1, 0.1*inch))
                 
                 # Add the image
-                img_buffer = BytesIO()
-                img.save(img_buffer, format="PNG")
-                img_buffer.seek(0)
+                img_buffer = get_screenshot_asset(img).buffer('png')
                 
                 try:
                     img_for_pdf = Image(img_buffer, width=6*inch, height=3.5*inch)
@@ -2902,7 +3173,7 @@ class DocumentGenerator:
         
         logging.info(f"DEBUG: Starting document generation with {len(self.screenshots)} screenshots")
         valid_screenshots = []
-        doc_structure = self._generate_narrative_documentation()
+        doc_structure = self.get_document_model()
 
         if self.include_screenshots:
             for i, (img, timestamp, reason) in enumerate(self.screenshots):
@@ -2969,25 +3240,6 @@ class DocumentGenerator:
             # Generate descriptions for each screenshot
             descriptions = self._generate_section_descriptions()
             
-            # IMPORTANT: Make sure the document structure has screenshot timestamps
-            # Add screenshots to sections if they don't have any
-            if doc_structure and 'sections' in doc_structure:
-                # Count sections with screenshot timestamps
-                sections_with_timestamps = sum(1 for s in doc_structure['sections'] 
-                                              if 'screenshot_timestamps' in s and s['screenshot_timestamps'])
-                if self.include_screenshots:
-                    if sections_with_timestamps == 0:
-                        logging.info("DEBUG: No sections have screenshot timestamps, distributing screenshots")
-                        all_timestamps = [ts for _, ts, _ in self.screenshots]
-                        num_sections = len(doc_structure['sections'])
-                        screenshots_per_section = max(1, len(all_timestamps) // num_sections)
-                        
-                        for i, section in enumerate(doc_structure['sections']):
-                            start_idx = i * screenshots_per_section
-                            end_idx = min(start_idx + screenshots_per_section, len(all_timestamps))
-                            section['screenshot_timestamps'] = all_timestamps[start_idx:end_idx]
-                            logging.info(f"DEBUG: Added {len(section['screenshot_timestamps'])} screenshots to section {i+1}")
-                
             # Add document title
             elements.append(Paragraph(doc_structure.get("title", self.title), heading1_style))
             elements.append(Spacer(1, 0.2*inch))
@@ -2997,11 +3249,6 @@ class DocumentGenerator:
             elements.append(Paragraph(doc_structure.get("introduction", self.description), normal_style))
             elements.append(Spacer(1, 0.3*inch))
             
-            # Use our helper method to prepare deduplicated screenshots
-            screenshot_data = self._prepare_screenshot_tracking()
-            screenshot_map = screenshot_data["screenshot_map"]
-            find_screenshot = screenshot_data["find_screenshot"]
-            
             # Add each section with its content and screenshots
             for section_idx, section in enumerate(doc_structure.get("sections", [])):
                 # Add section heading
@@ -3020,37 +3267,24 @@ class DocumentGenerator:
                 
                 # Add screenshots for this section
                 if self.include_screenshots:
-                    for ts in section.get("screenshot_timestamps", []):
-                        if isinstance(ts, str):
-                            try:
-                                ts = float(ts)
-                            except ValueError:
-                                continue
-                                
-                        screenshot_result = find_screenshot(ts)
+                    for placement in section.get("screenshots", []):
+                        from ..utils.media_utils import format_timestamp
+                        timestamp_text = f"Screenshot at {format_timestamp(placement['timestamp'])}"
+                        elements.append(Paragraph(timestamp_text, 
+                                                ParagraphStyle('timestamp', 
+                                                            parent=normal_style, 
+                                                            fontName='Helvetica-Oblique')))
                         
-                        if screenshot_result and screenshot_result[0] is not None:
-                            img, reason = screenshot_result
-                            
-                            from ..utils.media_utils import format_timestamp
-                            timestamp_text = f"Screenshot at {format_timestamp(ts)}"
-                            elements.append(Paragraph(timestamp_text, 
-                                                    ParagraphStyle('timestamp', 
-                                                                parent=normal_style, 
-                                                                fontName='Helvetica-Oblique')))
-                            
-                            img_buffer = BytesIO()
-                            img.save(img_buffer, format="PNG")
-                            img_buffer.seek(0)
-                            
-                            try:
-                                img_for_pdf = Image(img_buffer, width=6*inch, height=3.5*inch)
-                                elements.append(img_for_pdf)
-                            except Exception as img_err:
-                                logging.info(f"Error adding image to PDF: {img_err}")
-                                elements.append(Paragraph(f"[Image placeholder - could not load image: {img_err}]", normal_style))
-                            
-                            elements.append(Spacer(1, 0.2*inch))
+                        img_buffer = self._placement_png(placement)
+                        
+                        try:
+                            img_for_pdf = Image(img_buffer, width=6*inch, height=3.5*inch)
+                            elements.append(img_for_pdf)
+                        except Exception as img_err:
+                            logging.info(f"Error adding image to PDF: {img_err}")
+                            elements.append(Paragraph(f"[Image placeholder - could not load image: {img_err}]", normal_style))
+                        
+                        elements.append(Spacer(1, 0.2*inch))
                     
                 # Add process diagram if this is a process map section
                 
@@ -3209,37 +3443,24 @@ class DocumentGenerator:
                     elements.append(Spacer(1, 0.15*inch))
                     
                     if self.include_screenshots:
-                        for ts in subsection.get("screenshot_timestamps", []):
-                            if isinstance(ts, str):
-                                try:
-                                    ts = float(ts)
-                                except ValueError:
-                                    continue
-                                
-                            screenshot_result = find_screenshot(ts)
+                        for placement in subsection.get("screenshots", []):
+                            from ..utils.media_utils import format_timestamp
+                            timestamp_text = f"Screenshot at {format_timestamp(placement['timestamp'])}"
+                            elements.append(Paragraph(timestamp_text, 
+                                                    ParagraphStyle('timestamp', 
+                                                                parent=normal_style, 
+                                                                fontName='Helvetica-Oblique')))
                             
-                            if screenshot_result and screenshot_result[0] is not None:
-                                img, reason = screenshot_result
-                                
-                                from ..utils.media_utils import format_timestamp
-                                timestamp_text = f"Screenshot at {format_timestamp(ts)}"
-                                elements.append(Paragraph(timestamp_text, 
-                                                        ParagraphStyle('timestamp', 
-                                                                    parent=normal_style, 
-                                                                    fontName='Helvetica-Oblique')))
-                                
-                                img_buffer = BytesIO()
-                                img.save(img_buffer, format="PNG")
-                                img_buffer.seek(0)
-                                
-                                try:
-                                    img_for_pdf = Image(img_buffer, width=6*inch, height=3.5*inch)
-                                    elements.append(img_for_pdf)
-                                except Exception as img_err:
-                                    logging.info(f"Error adding image to PDF: {img_err}")
-                                    elements.append(Paragraph(f"[Image placeholder - could not load image: {img_err}]", normal_style))
-                                
-                                elements.append(Spacer(1, 0.2*inch))
+                            img_buffer = self._placement_png(placement)
+                            
+                            try:
+                                img_for_pdf = Image(img_buffer, width=6*inch, height=3.5*inch)
+                                elements.append(img_for_pdf)
+                            except Exception as img_err:
+                                logging.info(f"Error adding image to PDF: {img_err}")
+                                elements.append(Paragraph(f"[Image placeholder - could not load image: {img_err}]", normal_style))
+                            
+                            elements.append(Spacer(1, 0.2*inch))
                     
                 if section_idx < len(doc_structure.get("sections", [])) - 1:
                     elements.append(Spacer(1, 0.3*inch))
@@ -3276,11 +3497,6 @@ class DocumentGenerator:
             doc.add_heading("Introduction", level=2)
             doc.add_paragraph(doc_structure.get("introduction", self.description))
             
-            # Use our helper method to prepare deduplicated screenshots
-            screenshot_data = self._prepare_screenshot_tracking()
-            screenshot_map = screenshot_data["screenshot_map"]
-            find_screenshot = screenshot_data["find_screenshot"]
-            
             # Add each section with its content and screenshots
             for section_idx, section in enumerate(doc_structure.get("sections", [])):
                 # Add section heading
@@ -3314,46 +3530,31 @@ class DocumentGenerator:
                 
                 # Add screenshots for this section
                 if self.include_screenshots:
-                    for ts in section.get("screenshot_timestamps", []):
-                        if isinstance(ts, str):
-                            try:
-                                ts = float(ts)
-                            except ValueError:
-                                continue
-                                
-                        screenshot_result = find_screenshot(ts)
+                    for placement in section.get("screenshots", []):
+                        from ..utils.media_utils import format_timestamp
+                        timestamp_text = f"Screenshot at {format_timestamp(placement['timestamp'])}"
+                        timestamp_para = doc.add_paragraph()
+                        timestamp_para.add_run(timestamp_text).italic = True
                         
-                        if screenshot_result and screenshot_result[0] is not None:
-                            img, reason = screenshot_result
-                            
-                            from ..utils.media_utils import format_timestamp
-                            timestamp_text = f"Screenshot at {format_timestamp(ts)}"
-                            timestamp_para = doc.add_paragraph()
-                            timestamp_para.add_run(timestamp_text).italic = True
-                            
-                            img_buffer = BytesIO()
-                            img.save(img_buffer, format="PNG")
-                            img_buffer.seek(0)
-                            
-                            try:
-                                doc.add_picture(img_buffer, width=Inches(6))
-                            except Exception as img_err:
-                                logging.info(f"Error adding image to DOCX: {img_err}")
-                                doc.add_paragraph(f"[Image placeholder - could not load image: {img_err}]")
+                        img_buffer = self._placement_png(placement)
+                        
+                        try:
+                            doc.add_picture(img_buffer, width=Inches(6))
+                        except Exception as img_err:
+                            logging.info(f"Error adding image to DOCX: {img_err}")
+                            doc.add_paragraph(f"[Image placeholder - could not load image: {img_err}]")
                     
                 # Add process diagram if this is a process map section
-                if section['title'] == 'Process Map' and section.get('diagram_image'):
+                if section['title'] == 'Process Map' and section.get('diagram_png'):
                     try:
-                        temp_path = "temp_process_diagram.png"
-                        section['diagram_image'].save(temp_path, format='PNG')
                         optimal_width, optimal_height = self._calculate_optimal_image_size(section['diagram_image'])
 
                         # Add diagram header
                         doc.add_paragraph("Process Flow Diagram:", style='Heading 3')
                         
                         # Add the diagram image
-                        doc.add_picture(temp_path, width=Inches(optimal_width))
-                        logging.info(f"DEBUG: Added process diagram to DOCX: {temp_path}")
+                        doc.add_picture(BytesIO(section['diagram_png']), width=Inches(optimal_width))
+                        logging.info("DEBUG: Added process diagram to DOCX")
                         
                         # Add some spacing
                         doc.add_paragraph()
@@ -3414,10 +3615,6 @@ class DocumentGenerator:
                         
                         # Add final spacing
                         doc.add_paragraph()
-                        
-                        # Clean up temp file
-                        if os.path.exists(temp_path):
-                            os.remove(temp_path)
                             
                     except Exception as e:
                         logging.info(f"Error adding process diagram to DOCX: {e}")
@@ -3452,34 +3649,68 @@ class DocumentGenerator:
                                 doc.add_paragraph(para.strip())
                     
                     if self.include_screenshots:
-                        for ts in subsection.get("screenshot_timestamps", []):
-                            if isinstance(ts, str):
-                                try:
-                                    ts = float(ts)
-                                except ValueError:
-                                    continue
-                                
-                            screenshot_result = find_screenshot(ts)
+                        for placement in subsection.get("screenshots", []):
+                            from ..utils.media_utils import format_timestamp
+                            timestamp_text = f"Screenshot at {format_timestamp(placement['timestamp'])}"
+                            timestamp_para = doc.add_paragraph()
+                            timestamp_para.add_run(timestamp_text).italic = True
                             
-                            if screenshot_result and screenshot_result[0] is not None:
-                                img, reason = screenshot_result
-                                
-                                from ..utils.media_utils import format_timestamp
-                                timestamp_text = f"Screenshot at {format_timestamp(ts)}"
-                                timestamp_para = doc.add_paragraph()
-                                timestamp_para.add_run(timestamp_text).italic = True
-                                
-                                img_buffer = BytesIO()
-                                img.save(img_buffer, format="PNG")
-                                img_buffer.seek(0)
-                                
-                                try:
-                                    doc.add_picture(img_buffer, width=Inches(6))
-                                except Exception as img_err:
-                                    logging.info(f"Error adding image to DOCX: {img_err}")
-                                    doc.add_paragraph(f"[Image placeholder - could not load image: {img_err}]")
+                            img_buffer = self._placement_png(placement)
+                            
+                            try:
+                                doc.add_picture(img_buffer, width=Inches(6))
+                            except Exception as img_err:
+                                logging.info(f"Error adding image to DOCX: {img_err}")
+                                doc.add_paragraph(f"[Image placeholder - could not load image: {img_err}]")
             
             # Save the document to the buffer
             doc.save(doc_buffer)
             doc_buffer.seek(0)
-            return doc_buffer.getvalue()
\ No newline at end of file
+            return doc_buffer.getvalue()
+
+
+def _get_render_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Get the process pool that renders documents, starting it on first use
+
+    Workers are spawned rather than forked, so they do not inherit the threads,
+    locks and memory of a busy server process, and they stay up between requests.
+
+    Returns:
+        ProcessPoolExecutor with RENDER_WORKERS workers
+    """
+    global _render_pool
+
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _render_pool
+
+
+def _reset_render_pool(executor: concurrent.futures.ProcessPoolExecutor):
+    """Discard a broken render pool so the next request starts a new one"""
+    global _render_pool
+
+    with _render_pool_lock:
+        if _render_pool is executor:
+            _render_pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_document_bytes(payload: bytes, doc_type: str) -> bytes:
+    """
+    Worker entry point for DocumentGenerator.iter_documents
+
+    Args:
+        payload: Generator state from DocumentGenerator._render_payload
+        doc_type: Format to render ("pdf" or "docx")
+
+    Returns:
+        Bytes of the generated document
+    """
+    generator = DocumentGenerator.__new__(DocumentGenerator)
+    generator.__dict__.update(pickle.loads(payload))
+    return generator.get_document_bytes(doc_type)
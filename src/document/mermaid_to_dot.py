@@ -0,0 +1,413 @@
+"""
+Mermaid to DOT Conversion Module
+
+Deterministic translation of the Mermaid constructs our process-map prompts
+produce (flowcharts and sequence diagrams) into Graphviz DOT, so diagrams can be
+rendered locally without a network service or an AI conversion call.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Flowchart node shapes: opener -> (closer, DOT attributes). Longer openers first.
+FLOWCHART_SHAPES = [
+    ("(((", ")))", 'shape=doublecircle'),
+    ("((", "))", 'shape=circle'),
+    ("([", "])", 'shape=box, style="rounded,filled"'),
+    ("[[", "]]", 'shape=box, peripheries=2'),
+    ("[(", ")]", 'shape=cylinder'),
+    ("{{", "}}", 'shape=hexagon'),
+    ("[/", "/]", 'shape=parallelogram'),
+    ("[\\", "\\]", 'shape=parallelogram'),
+    ("[/", "\\]", 'shape=trapezium'),
+    ("[\\", "/]", 'shape=invtrapezium'),
+    ("[", "]", 'shape=box'),
+    ("(", ")", 'shape=box, style="rounded,filled"'),
+    ("{", "}", 'shape=diamond'),
+    (">", "]", 'shape=cds'),
+]
+
+RANKDIR = {"TD": "TB", "TB": "TB", "BT": "BT", "LR": "LR", "RL": "RL"}
+
+NODE_ID_RE = re.compile(r'\s*([A-Za-z0-9_][A-Za-z0-9_]*)')
+CLASS_SUFFIX_RE = re.compile(r':::([A-Za-z0-9_-]+)')
+# "-- text -->", "-. text .->", "== text ==>"
+TEXT_LINK_RE = re.compile(r'\s*(?P<head><?)(?P<open>--|-\.|==)\s+(?P<text>[^|>]*?)\s*'
+                          r'(?P<line>-{2,}|\.-+|={2,})(?P<tail>[>ox]?)(?=[\s\w"(\[{])')
+# "-->", "---", "-.->", "==>", "<-->", "--o", "--x"
+LINK_RE = re.compile(r'\s*(?P<head><?)(?P<line>-{2,}|-\.+-|={2,})(?P<tail>[>ox]?)')
+PIPE_LABEL_RE = re.compile(r'\s*\|(?P<label>[^|]*)\|')
+
+# Styling and interaction statements; style, classDef and class are mapped to node colors
+FLOWCHART_IGNORED = ("linkStyle", "click", "direction")
+# Mermaid style property -> DOT node attribute
+STYLE_ATTRIBUTES = {"fill": "fillcolor", "stroke": "color", "color": "fontcolor", "stroke-width": "penwidth"}
+
+SEQUENCE_MESSAGE_RE = re.compile(
+    r'^(?P<src>[^:>]+?)\s*(?P<arrow>--?(?:>>|>|x|\)))\s*[+-]?\s*(?P<dst>[^:]+?)\s*(?::\s*(?P<text>.*))?$'
+)
+SEQUENCE_NOTE_RE = re.compile(r'^note\s+(?:left of|right of|over)\s+(?P<who>[^:]+?)\s*:\s*(?P<text>.*)$', re.IGNORECASE)
+SEQUENCE_BLOCKS = ("loop", "alt", "else", "opt", "par", "and", "critical", "option", "break", "rect")
+
+
+def _escape(text: str) -> str:
+    """Escape a label for a double-quoted DOT string"""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        text = text[1:-1]
+    text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _split_statements(mermaid_code: str) -> List[str]:
+    """Split Mermaid source into statements on newlines and on semicolons outside labels"""
+    statements = []
+    for raw_line in mermaid_code.replace('\r\n', '\n').split('\n'):
+        line = raw_line.strip()
+        if not line or line.startswith('%%'):
+            continue
+        depth, in_quotes, start = 0, False, 0
+        for i, char in enumerate(line):
+            if char == '"':
+                in_quotes = not in_quotes
+            elif not in_quotes and char in '[({':
+                depth += 1
+            elif not in_quotes and char in '])}':
+                depth = max(depth - 1, 0)
+            elif char == ';' and depth == 0 and not in_quotes:
+                statements.append(line[start:i].strip())
+                start = i + 1
+        statements.append(line[start:].strip())
+    return [statement for statement in statements if statement]
+
+
+def _style_attributes(style: str) -> List[str]:
+    """Map a Mermaid style such as "fill:#f9f,stroke:#333,stroke-width:2px" to DOT node attributes"""
+    attributes = []
+    for declaration in style.split(','):
+        name, _, value = declaration.partition(':')
+        attribute = STYLE_ATTRIBUTES.get(name.strip())
+        value = value.strip().rstrip(';')
+        if attribute == "penwidth":
+            value = re.sub(r'px$', '', value)
+            if re.fullmatch(r'\d+(\.\d+)?', value):
+                attributes.append(f'penwidth={value}')
+        elif attribute and value:
+            attributes.append(f'{attribute}="{_escape(value)}"')
+    return attributes
+
+
+def _parse_node(statement: str, pos: int) -> Tuple[Optional[str], Optional[str], Optional[str], int]:
+    """
+    Parse a node reference such as A, A[Label] or A{"Label"} at pos
+
+    Returns:
+        (node id, label or None, DOT shape attributes or None, position after the node);
+        the id is None if there is no node at pos. A trailing :::class is left at the
+        returned position.
+    """
+    match = NODE_ID_RE.match(statement, pos)
+    if not match:
+        return None, None, None, pos
+    node_id = match.group(1)
+    pos = match.end()
+
+    for opener, closer, attributes in FLOWCHART_SHAPES:
+        if not statement.startswith(opener, pos):
+            continue
+        start = pos + len(opener)
+        if statement.startswith('"', start):
+            quote_end = statement.find('"', start + 1)
+            if quote_end == -1 or not statement.startswith(closer, quote_end + 1):
+                continue
+            end = quote_end + 1
+        else:
+            end = statement.find(closer, start)
+            if end == -1:
+                continue
+        return node_id, statement[start:end], attributes, end + len(closer)
+
+    return node_id, None, None, pos
+
+
+def _parse_node_group(statement: str, pos: int, nodes: Dict[str, Dict[str, Any]]) -> Tuple[List[str], int]:
+    """Parse "A" or "A & B & C", registering node labels, shapes and :::class suffixes"""
+    group = []
+    while True:
+        node_id, label, attributes, pos = _parse_node(statement, pos)
+        if node_id is None:
+            return group, pos
+        node = nodes.setdefault(node_id, {"label": node_id, "attributes": 'shape=box', "classes": []})
+        if label is not None:
+            node["label"] = label
+            node["attributes"] = attributes
+        class_suffix = CLASS_SUFFIX_RE.match(statement, pos)
+        if class_suffix:
+            node["classes"].append(class_suffix.group(1))
+            pos = class_suffix.end()
+        group.append(node_id)
+
+        ampersand = re.compile(r'\s*&').match(statement, pos)
+        if not ampersand:
+            return group, pos
+        pos = ampersand.end()
+
+
+def _parse_link(statement: str, pos: int) -> Tuple[Optional[Dict[str, str]], int]:
+    """Parse a link and its optional label at pos"""
+    match = TEXT_LINK_RE.match(statement, pos) or LINK_RE.match(statement, pos)
+    if not match:
+        return None, pos
+    pos = match.end()
+    groups = match.groupdict()
+    label = groups.get("text")
+
+    pipe = PIPE_LABEL_RE.match(statement, pos)
+    if pipe:
+        label = pipe.group("label")
+        pos = pipe.end()
+
+    line = groups["line"] + groups.get("open", "")
+    attributes = []
+    if '.' in line:
+        attributes.append('style=dashed')
+    elif '=' in line:
+        attributes.append('penwidth=2')
+    tail = {">": "normal", "o": "odot", "x": "tee"}.get(groups["tail"], "none")
+    attributes.append(f'arrowhead={tail}')
+    if groups["head"] == '<':
+        attributes.append('dir=both, arrowtail=normal')
+    if label:
+        attributes.append(f'label="{_escape(label)}"')
+    return {"attributes": ", ".join(attributes)}, pos
+
+
+def _flowchart_to_dot(statements: List[str]) -> Optional[str]:
+    """Convert flowchart/graph statements to DOT"""
+    header = statements[0].split()
+    rankdir = RANKDIR.get(header[1].upper(), "TB") if len(header) > 1 else "TB"
+
+    nodes: Dict[str, Dict[str, Any]] = {}
+    edges: List[str] = []
+    class_styles: Dict[str, List[str]] = {}
+    node_styles: Dict[str, List[str]] = {}
+    node_classes: Dict[str, List[str]] = {}
+    # Subgraph tree: every cluster holds its node ids and child clusters
+    root = {"nodes": [], "children": []}
+    stack = [root]
+
+    for statement in statements[1:]:
+        words = statement.split(None, 1)
+        keyword, rest = words[0], words[1] if len(words) > 1 else ''
+        if keyword in FLOWCHART_IGNORED:
+            continue
+        if keyword in ("style", "classDef"):
+            names, style = (rest.split(None, 1) + [''])[:2]
+            target = node_styles if keyword == "style" else class_styles
+            for name in names.split(','):
+                target[name.strip()] = _style_attributes(style)
+            continue
+        if keyword == "class":
+            node_ids, _, class_name = rest.strip().rpartition(' ')
+            for node_id in node_ids.split(','):
+                node_classes.setdefault(node_id.strip(), []).append(class_name.strip())
+            continue
+        if statement == "end":
+            if len(stack) == 1:
+                return None
+            stack.pop()
+            continue
+        if statement.startswith("subgraph"):
+            title = statement[len("subgraph"):].strip()
+            titled = re.match(r'^[A-Za-z0-9_]+\s*\[(.*)\]$', title)
+            cluster = {"label": titled.group(1) if titled else title, "nodes": [], "children": []}
+            stack[-1]["children"].append(cluster)
+            stack.append(cluster)
+            continue
+
+        group, pos = _parse_node_group(statement, 0, nodes)
+        if not group:
+            return None
+        stack[-1]["nodes"].extend(group)
+        while pos < len(statement):
+            link, pos = _parse_link(statement, pos)
+            if link is None:
+                return None
+            targets, pos = _parse_node_group(statement, pos, nodes)
+            if not targets:
+                return None
+            stack[-1]["nodes"].extend(targets)
+            for source in group:
+                for target in targets:
+                    edges.append(f'  "{source}" -> "{target}" [{link["attributes"]}];')
+            group = targets
+            while pos < len(statement) and statement[pos].isspace():
+                pos += 1
+
+    if len(stack) != 1 or not nodes:
+        return None
+
+    lines = [
+        'digraph G {',
+        f'  rankdir={rankdir};',
+        '  node [fontname="Helvetica", fontsize=11, style=filled, fillcolor="#ECECFF", color="#9370DB"];',
+        '  edge [fontname="Helvetica", fontsize=10, color="#333333"];',
+    ]
+    placed = set()
+    cluster_count = [0]
+
+    def emit_cluster(cluster, indent):
+        for child in cluster["children"]:
+            lines.append(f'{indent}subgraph cluster_{cluster_count[0]} {{')
+            cluster_count[0] += 1
+            lines.append(f'{indent}  label="{_escape(child["label"])}"; style=rounded; color="#AAAA33";')
+            emit_cluster(child, indent + '  ')
+            lines.append(f'{indent}}}')
+        for node_id in cluster["nodes"]:
+            if node_id not in placed:
+                placed.add(node_id)
+                node = nodes[node_id]
+                attributes = [node["attributes"]]
+                for class_name in node["classes"] + node_classes.get(node_id, []):
+                    attributes.extend(class_styles.get(class_name, []))
+                attributes.extend(node_styles.get(node_id, []))
+                lines.append(f'{indent}"{node_id}" [label="{_escape(node["label"])}", {", ".join(attributes)}];')
+
+    emit_cluster(root, '  ')
+    lines.extend(edges)
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def _sequence_to_dot(statements: List[str]) -> Optional[str]:
+    """
+    Convert sequenceDiagram statements to DOT
+
+    Participants become a row of boxes with dashed lifelines; every message or note
+    is one row of the layout, so the diagram reads top to bottom in message order.
+    """
+    participants: Dict[str, str] = {}
+    actors = set()
+    rows: List[Tuple[str, Dict[str, str]]] = []
+    autonumber = False
+
+    def participant(name: str) -> str:
+        name = name.strip()
+        participants.setdefault(name, name)
+        return name
+
+    for statement in statements[1:]:
+        keyword = statement.split()[0].lower()
+        if keyword in ("participant", "actor"):
+            declaration = statement.split(None, 1)[1] if len(statement.split()) > 1 else ""
+            name, _, alias = declaration.partition(" as ")
+            name = participant(name)
+            if alias.strip():
+                participants[name] = alias.strip()
+            if keyword == "actor":
+                actors.add(name)
+        elif keyword == "autonumber":
+            autonumber = True
+        elif keyword in ("activate", "deactivate", "end", "title", "style", "classdef", "class", "click", "linkstyle"):
+            continue
+        elif keyword in SEQUENCE_BLOCKS:
+            rows.append(("block", {"text": statement}))
+        elif keyword == "note":
+            note = SEQUENCE_NOTE_RE.match(statement)
+            if not note:
+                return None
+            who = [participant(name) for name in note.group("who").split(",")]
+            rows.append(("note", {"who": who[0], "text": note.group("text")}))
+        else:
+            message = SEQUENCE_MESSAGE_RE.match(statement)
+            if not message:
+                return None
+            rows.append(("message", {
+                "src": participant(message.group("src")),
+                "dst": participant(message.group("dst")),
+                "arrow": message.group("arrow"),
+                "text": message.group("text") or ""
+            }))
+
+    if not participants:
+        return None
+
+    names = list(participants)
+    index = {name: i for i, name in enumerate(names)}
+    lines = [
+        'digraph G {',
+        '  rankdir=TB; nodesep=1.2; ranksep=0.4;',
+        '  node [fontname="Helvetica", fontsize=11];',
+        '  edge [fontname="Helvetica", fontsize=10];',
+    ]
+
+    header = []
+    for i, name in enumerate(names):
+        style = 'shape=box, style="rounded,filled", fillcolor="#FFF5AD"' if name in actors \
+            else 'shape=box, style=filled, fillcolor="#ECECFF", color="#9370DB"'
+        lines.append(f'  p{i} [label="{_escape(participants[name])}", {style}];')
+        header.append(f'p{i}')
+    lines.append(f'  {{ rank=same; {"; ".join(header)}; }}')
+    lines.append(f'  {" -> ".join(header)} [style=invis];' if len(header) > 1 else '')
+
+    previous = header
+    message_number = 0
+    for row, (kind, data) in enumerate(rows):
+        points = [f's{row}_{i}' for i in range(len(names))]
+        for point in points:
+            lines.append(f'  {point} [shape=point, width=0.01, height=0.01, label=""];')
+        rank = list(points)
+        for above, below in zip(previous, points):
+            lines.append(f'  {above} -> {below} [style=dashed, arrowhead=none, color="#999999", weight=100];')
+
+        if kind == "message":
+            text = data["text"]
+            if autonumber:
+                message_number += 1
+                text = f'{message_number}. {text}'
+            arrow = data["arrow"]
+            attributes = ['constraint=false', f'label="{_escape(text)}"']
+            if arrow.startswith('--'):
+                attributes.append('style=dashed')
+            head = arrow.lstrip('-')
+            attributes.append('arrowhead=' + {">>": "normal", ">": "none", "x": "tee", ")": "vee"}[head])
+            lines.append(f'  s{row}_{index[data["src"]]} -> s{row}_{index[data["dst"]]} [{", ".join(attributes)}];')
+        else:
+            shape = 'shape=note, style=filled, fillcolor="#FFF5AD"' if kind == "note" \
+                else 'shape=plaintext, fontcolor="#555555"'
+            lines.append(f'  n{row} [label="{_escape(data["text"])}", {shape}];')
+            anchor = index.get(data.get("who"), 0)
+            rank.insert(anchor + 1, f'n{row}')
+
+        lines.append(f'  {{ rank=same; {"; ".join(rank)}; }}')
+        lines.append(f'  {" -> ".join(rank)} [style=invis];' if len(rank) > 1 else '')
+        previous = points
+
+    lines.append('}')
+    return '\n'.join(line for line in lines if line)
+
+
+def mermaid_to_dot(mermaid_code: str) -> Optional[str]:
+    """
+    Convert Mermaid source to Graphviz DOT without any AI or network call
+
+    Args:
+        mermaid_code: Mermaid flowchart/graph or sequenceDiagram source
+
+    Returns:
+        DOT source, or None if the diagram type or a statement is not supported
+    """
+    try:
+        statements = _split_statements(mermaid_code)
+        if not statements:
+            return None
+        diagram_type = statements[0].split()[0]
+        if diagram_type in ("flowchart", "graph"):
+            return _flowchart_to_dot(statements)
+        if diagram_type == "sequenceDiagram":
+            return _sequence_to_dot(statements)
+        return None
+    except Exception as e:
+        logging.warning(f"Local Mermaid to DOT conversion failed: {e}")
+        return None
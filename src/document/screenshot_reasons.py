@@ -0,0 +1,207 @@
+"""
+Screenshot Reason Enhancement Module
+
+Rewrites the detector's screenshot reasons ("Scene change", "Keyword trigger",
+...) into short contextual descriptions. Screenshots are packed into a few
+structured-JSON requests that run concurrently under a shared rate limit, and
+the speech around each screenshot is looked up with a bisect index over the
+sorted segment timestamps.
+"""
+
+import bisect
+import concurrent.futures
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from ..utils.api_usage_logger import log_openai_usage
+
+# Longest enhanced reason kept, in characters
+MAX_REASON_LENGTH = 60
+
+
+class SpeechContextIndex:
+    """
+    Time index over speech segments for fast context-window lookups
+    """
+
+    def __init__(self, speech_segments: List[Tuple[float, str]]):
+        """
+        Build the index
+
+        Args:
+            speech_segments: List of (timestamp, text) tuples in any order
+        """
+        self.segments = sorted(speech_segments, key=lambda x: x[0])
+        self.timestamps = [ts for ts, _ in self.segments]
+
+    def window(self, timestamp: float, before: float, after: float) -> List[Tuple[float, str]]:
+        """
+        Speech segments between timestamp - before and timestamp + after (inclusive)
+
+        Args:
+            timestamp: Centre of the window in seconds
+            before: Seconds before the timestamp
+            after: Seconds after the timestamp
+
+        Returns:
+            List of (timestamp, text) tuples in time order
+        """
+        start = bisect.bisect_left(self.timestamps, timestamp - before)
+        end = bisect.bisect_right(self.timestamps, timestamp + after)
+        return self.segments[start:end]
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces requests evenly to stay under a per-minute rate
+    """
+
+    def __init__(self, requests_per_minute: float):
+        """
+        Args:
+            requests_per_minute: Allowed request rate (0 or None for unlimited)
+        """
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller may send its next request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ScreenshotReasonEnhancer:
+    """
+    Batched, concurrent AI enhancement of screenshot reasons
+    """
+
+    def __init__(self, client: Any, model: str, batch_size: int = None, max_workers: int = None,
+                 requests_per_minute: float = None):
+        """
+        Initialize the enhancer
+
+        Args:
+            client: OpenAI client
+            model: Chat model or deployment name
+            batch_size: Screenshots per request (processing.document.reason_enhancement.batch_size)
+            max_workers: Concurrent requests (processing.document.reason_enhancement.max_workers)
+            requests_per_minute: Request rate limit shared by all workers
+                                 (processing.document.reason_enhancement.requests_per_minute)
+        """
+        enhancement_config = {}
+        try:
+            from ..utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            enhancement_config = app_config.get('processing', {}).get('document', {}).get('reason_enhancement', {}) or {}
+        except Exception as e:
+            logging.warning(f"Could not load reason enhancement settings, using defaults: {e}")
+
+        self.client = client
+        self.model = model
+        self.batch_size = batch_size or enhancement_config.get('batch_size', 15)
+        self.max_workers = max_workers or enhancement_config.get('max_workers', 4)
+        self.rate_limiter = RateLimiter(
+            requests_per_minute if requests_per_minute is not None
+            else enhancement_config.get('requests_per_minute', 60)
+        )
+
+    def enhance(self, items: List[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Get enhanced reasons for a set of screenshots
+
+        Args:
+            items: One dictionary per screenshot with "id", "timestamp", "detection_type"
+                   and "context" (list of "[12.3s] text" lines)
+
+        Returns:
+            Mapping of item id to enhanced reason. Items whose batch failed get a
+            generic "Key moment at ..." reason.
+        """
+        if not items:
+            return {}
+
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        logging.info(f"Enhancing {len(items)} screenshot reasons in {len(batches)} batched requests")
+
+        reasons = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch_reasons in executor.map(self._enhance_batch, batches):
+                reasons.update(batch_reasons)
+        return reasons
+
+    def _enhance_batch(self, batch: List[Dict[str, Any]]) -> Dict[int, str]:
+        """Enhance one batch of screenshots with a single JSON-mode request"""
+        fallback = {item["id"]: f"Key moment at {item['timestamp']:.1f}s ({item['detection_type']})" for item in batch}
+
+        screenshots_text = ""
+        for item in batch:
+            screenshots_text += (f"\nScreenshot {item['id']} at {item['timestamp']:.1f} seconds "
+                                 f"(detection type: {item['detection_type']})\nSpeech Context:\n")
+            screenshots_text += "\n".join(item["context"]) + "\n"
+
+        prompt = f"""
+        Analyze these screenshot moments and provide a brief, contextual description for each.
+        {screenshots_text}
+        For every screenshot, provide a concise reason (max {MAX_REASON_LENGTH} characters) that explains what's likely happening at that moment based on the speech context. Focus on:
+        - What action or feature is being demonstrated
+        - What UI element or screen is being shown
+        - What process or workflow step is occurring
+
+        Format: Brief descriptive phrase (no "Screenshot of" or "Image showing")
+        Examples: "Login screen demonstration", "Dashboard navigation", "Settings configuration", "Report generation process"
+
+        Respond with JSON in this structure:
+        {{"reasons": [{{"id": 1, "reason": "Dashboard navigation"}}]}}
+        """
+
+        try:
+            self.rate_limiter.acquire()
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are an expert at analyzing video content and providing concise, contextual descriptions."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=40 * len(batch) + 50,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+
+            usage = response.usage
+            if usage:
+                log_openai_usage(
+                    module_name=__name__,
+                    model=self.model,
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens,
+                    function_name="_enhance_batch"
+                )
+
+            result = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            logging.info(f"Error getting AI enhanced reasons for {len(batch)} screenshots: {e}")
+            return fallback
+
+        reasons = dict(fallback)
+        for entry in result.get("reasons", []):
+            try:
+                item_id = int(entry["id"])
+                reason = str(entry["reason"]).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if item_id in reasons and reason:
+                # Ensure it's not too long
+                if len(reason) > MAX_REASON_LENGTH:
+                    reason = reason[:MAX_REASON_LENGTH - 3] + "..."
+                reasons[item_id] = reason
+        return reasons
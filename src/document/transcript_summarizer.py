@@ -0,0 +1,354 @@
+"""
+Transcript Summarizer Module
+
+Map-reduce summarization of long meeting transcripts. The transcript is split
+into token-budgeted windows that overlap slightly; every window is condensed to
+timestamped notes by its own LLM call, run concurrently (map), and the notes are
+merged into the meeting attendees and highlights in one combined call (reduce).
+Prompts that need the whole meeting use the notes once the raw transcript no
+longer fits in a single request, so latency follows the longest window rather
+than the length of the meeting.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from ..utils.openai_config import get_openai_client, get_chat_model_name, OPENAI_AVAILABLE
+from ..utils.api_usage_logger import log_openai_usage
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Global singleton instance
+_transcript_summarizer_instance = None
+_transcript_summarizer_lock = threading.Lock()
+
+# Number of transcripts whose window notes and metadata are kept in memory
+MEMO_SIZE = 16
+
+
+class TranscriptSummarizer:
+    """
+    Token-budgeted map-reduce summarizer for (timestamp, text) speech segments
+    """
+
+    def __init__(self, client: Any = None, model: str = None, window_tokens: int = None,
+                 overlap_tokens: int = None, direct_tokens: int = None, max_workers: int = None):
+        """
+        Initialize the summarizer
+
+        Args:
+            client: OpenAI client (defaults to get_openai_client() on first use)
+            model: Chat model or deployment name (defaults to get_chat_model_name())
+            window_tokens: Transcript tokens per map window (processing.summarization.window_tokens)
+            overlap_tokens: Tokens repeated at the start of the next window so points spanning
+                            a boundary are not lost (processing.summarization.overlap_tokens)
+            direct_tokens: Transcripts up to this size are sent whole instead of being
+                           summarized (processing.summarization.direct_tokens)
+            max_workers: Concurrent map requests (processing.summarization.max_workers)
+        """
+        summary_config = {}
+        try:
+            from ..utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            summary_config = app_config.get('processing', {}).get('summarization', {}) or {}
+        except Exception as e:
+            logging.warning(f"Could not load summarization settings, using defaults: {e}")
+
+        self._client = client
+        self._model = model
+        self.window_tokens = window_tokens or summary_config.get('window_tokens', 6000)
+        self.overlap_tokens = overlap_tokens if overlap_tokens is not None else summary_config.get('overlap_tokens', 300)
+        self.direct_tokens = direct_tokens or summary_config.get('direct_tokens', 12000)
+        self.max_workers = max_workers or summary_config.get('max_workers', 4)
+
+        self._encoding = None
+        if TIKTOKEN_AVAILABLE:
+            try:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logging.warning(f"Could not load tiktoken encoding, estimating token counts: {e}")
+
+        self._memo: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_openai_client()
+        return self._client
+
+    @property
+    def model(self) -> str:
+        if self._model is None:
+            self._model = get_chat_model_name()
+        return self._model
+
+    def count_tokens(self, text: str) -> int:
+        """Number of tokens in text (estimated at 4 characters per token without tiktoken)"""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // 4 + 1
+
+    @staticmethod
+    def format_transcript(speech_segments: List[Tuple[float, str]], with_timestamps: bool = True) -> str:
+        """
+        Render speech segments as prompt text
+
+        Args:
+            speech_segments: List of (timestamp, text) tuples
+            with_timestamps: Prefix every line with "[12.34s]"
+
+        Returns:
+            One line per segment
+        """
+        if with_timestamps:
+            return "".join(f"[{timestamp:.2f}s] {text}\n" for timestamp, text in speech_segments)
+        return "\n".join(text for _, text in speech_segments)
+
+    def split_windows(self, speech_segments: List[Tuple[float, str]]) -> List[List[Tuple[float, str]]]:
+        """
+        Split a transcript into windows of at most window_tokens tokens
+
+        Consecutive windows share overlap_tokens worth of segments. A single segment
+        longer than a window becomes a window of its own.
+
+        Args:
+            speech_segments: List of (timestamp, text) tuples sorted by timestamp
+
+        Returns:
+            List of segment lists
+        """
+        segment_tokens = [self.count_tokens(f"[{ts:.2f}s] {text}\n") for ts, text in speech_segments]
+
+        windows = []
+        start = 0
+        while start < len(speech_segments):
+            end = start
+            used = 0
+            while end < len(speech_segments) and (end == start or used + segment_tokens[end] <= self.window_tokens):
+                used += segment_tokens[end]
+                end += 1
+            windows.append(speech_segments[start:end])
+            if end >= len(speech_segments):
+                break
+
+            # Step back over the last overlap_tokens of this window for the next one
+            next_start = end
+            overlap = 0
+            while next_start - 1 > start and overlap + segment_tokens[next_start - 1] <= self.overlap_tokens:
+                next_start -= 1
+                overlap += segment_tokens[next_start]
+            start = next_start
+
+        return windows
+
+    def _memo_entry(self, speech_segments: List[Tuple[float, str]]) -> Dict[str, Any]:
+        """Per-transcript memo of window notes and metadata (most recently used kept)"""
+        digest = hashlib.sha256(self.format_transcript(speech_segments).encode('utf-8')).hexdigest()
+        key = f"{digest}|{self.model}|{self.window_tokens}|{self.overlap_tokens}"
+        with self._memo_lock:
+            entry = self._memo.get(key)
+            if entry is None:
+                entry = {"lock": threading.Lock()}
+                self._memo[key] = entry
+                while len(self._memo) > MEMO_SIZE:
+                    self._memo.popitem(last=False)
+            else:
+                self._memo.move_to_end(key)
+            return entry
+
+    def _chat_json(self, system_prompt: str, user_prompt: str, max_tokens: int, function_name: str) -> Dict[str, Any]:
+        """Send one JSON-mode chat request and parse the reply"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        usage = response.usage
+        if usage:
+            log_openai_usage(
+                module_name=__name__,
+                model=self.model,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                function_name=function_name
+            )
+        return json.loads(response.choices[0].message.content)
+
+    def _summarize_window(self, index: int, total: int, window: List[Tuple[float, str]]) -> Dict[str, Any]:
+        """Map step: condense one transcript window to speakers and timestamped notes"""
+        prompt = f"""
+        This is part {index + 1} of {total} of a meeting transcript
+        ({window[0][0]:.2f}s to {window[-1][0]:.2f}s). Condense it into notes that keep every
+        discussion point, decision, action item, owner, deadline and process step.
+
+        TRANSCRIPT:
+        {self.format_transcript(window)}
+
+        Respond with JSON in this structure:
+        {{
+            "speakers": ["Names of people speaking or addressed by name"],
+            "notes": [{{"timestamp": 12.34, "text": "One self-contained point"}}]
+        }}
+        Use the timestamp of the transcript line where each point is made.
+        """
+        try:
+            result = self._chat_json(
+                "You are an expert meeting note-taker. Condense transcript excerpts without losing facts.",
+                prompt, max_tokens=1500, function_name="summarize_transcript_window"
+            )
+        except Exception as e:
+            logging.error(f"Error summarizing transcript window {index + 1}/{total}: {e}")
+            # Fall back to the raw lines so nothing from this window is lost
+            return {"speakers": [], "notes": [{"timestamp": ts, "text": text} for ts, text in window]}
+
+        notes = []
+        for note in result.get("notes", []):
+            try:
+                notes.append({"timestamp": float(note.get("timestamp", window[0][0])), "text": str(note["text"]).strip()})
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        speakers = [str(s) for s in result.get("speakers", []) if s]
+        return {"speakers": speakers, "notes": notes}
+
+    def summarize_windows(self, speech_segments: List[Tuple[float, str]]) -> List[Dict[str, Any]]:
+        """
+        Map step over the whole transcript, with at most max_workers requests in flight
+
+        Args:
+            speech_segments: List of (timestamp, text) tuples
+
+        Returns:
+            One {"speakers", "notes"} dictionary per window, in transcript order
+        """
+        speech_segments = sorted(speech_segments, key=lambda x: x[0])
+        entry = self._memo_entry(speech_segments)
+        with entry["lock"]:
+            if "windows" not in entry:
+                windows = self.split_windows(speech_segments)
+                logging.info(f"Summarizing transcript in {len(windows)} windows "
+                             f"({self.window_tokens} tokens, {self.max_workers} concurrent)")
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    entry["windows"] = list(executor.map(
+                        lambda args: self._summarize_window(args[0], len(windows), args[1]),
+                        enumerate(windows)
+                    ))
+            return entry["windows"]
+
+    def condensed_transcript(self, speech_segments: List[Tuple[float, str]], with_timestamps: bool = True) -> str:
+        """
+        Transcript text for prompts that need the whole meeting
+
+        Args:
+            speech_segments: List of (timestamp, text) tuples
+            with_timestamps: Prefix lines with "[12.34s]" when the raw transcript is used
+
+        Returns:
+            The raw transcript if it fits in direct_tokens, otherwise the merged window
+            notes as "[12.34s] note" lines
+        """
+        speech_segments = sorted(speech_segments, key=lambda x: x[0])
+        transcript = self.format_transcript(speech_segments, with_timestamps)
+        if not OPENAI_AVAILABLE or self.count_tokens(transcript) <= self.direct_tokens:
+            return transcript
+
+        seen = set()
+        notes = []
+        for window in self.summarize_windows(speech_segments):
+            for note in window["notes"]:
+                # Overlapping windows can report the same point twice
+                if note["text"].lower() not in seen:
+                    seen.add(note["text"].lower())
+                    notes.append((note["timestamp"], note["text"]))
+        notes.sort(key=lambda x: x[0])
+        return self.format_transcript(notes)
+
+    def extract_meeting_metadata(self, speech_segments: List[Tuple[float, str]]) -> Tuple[List[str], List[str]]:
+        """
+        Reduce step: attendees and key highlights of a meeting in one request
+
+        Args:
+            speech_segments: List of (timestamp, text) tuples
+
+        Returns:
+            Tuple of (attendees, highlights)
+        """
+        if not speech_segments or not OPENAI_AVAILABLE:
+            return [], []
+
+        speech_segments = sorted(speech_segments, key=lambda x: x[0])
+        entry = self._memo_entry(speech_segments)
+        if "metadata" in entry:
+            return entry["metadata"]
+
+        transcript = self.condensed_transcript(speech_segments)
+        speakers = []
+        if "windows" in entry:
+            for window in entry["windows"]:
+                speakers.extend(s for s in window["speakers"] if s not in speakers)
+
+        prompt = f"""
+        Analyze this meeting transcript and identify the attendees and the key highlights.
+        {f"Speakers detected in the meeting: {', '.join(speakers)}" if speakers else ""}
+
+        TRANSCRIPT:
+        {transcript}
+
+        Your task:
+        1. Identify each unique person speaking in the meeting. Use their names if mentioned
+           (e.g., "Hi, I'm John" or "Thanks, Sarah"), otherwise generic identifiers (Speaker 1, Speaker 2, etc.)
+        2. Identify the 5-8 most important discussion points, decisions, action items and
+           commitments, key agreements and conclusions
+
+        Respond with JSON in this structure:
+        {{
+            "attendees": ["Name 1", "Name 2"],
+            "highlights": ["Highlight 1: Description", "Highlight 2: Description"]
+        }}
+        """
+        try:
+            result = self._chat_json(
+                "You are an expert at analyzing meetings. Extract attendee names and the most important discussion points from transcripts.",
+                prompt, max_tokens=800, function_name="extract_meeting_metadata"
+            )
+        except Exception as e:
+            logging.error(f"Error extracting meeting metadata: {e}")
+            return [], []
+
+        attendees = result.get("attendees", [])
+        highlights = result.get("highlights", [])
+        metadata = (attendees if isinstance(attendees, list) else [],
+                    highlights if isinstance(highlights, list) else [])
+        entry["metadata"] = metadata
+        logging.info(f"Extracted {len(metadata[0])} attendees and {len(metadata[1])} highlights from meeting")
+        return metadata
+
+
+def get_transcript_summarizer() -> TranscriptSummarizer:
+    """
+    Get the shared transcript summarizer (singleton pattern)
+
+    Returns:
+        TranscriptSummarizer instance
+    """
+    global _transcript_summarizer_instance
+
+    with _transcript_summarizer_lock:
+        if _transcript_summarizer_instance is None:
+            _transcript_summarizer_instance = TranscriptSummarizer()
+        return _transcript_summarizer_instance
@@ -25,17 +25,15 @@ import base64
 import uuid
 from datetime import datetime
 
-# Import business logic from main.py
-from main import (
-    process_video,
-    generate_document,
-    get_video_duration_ffprobe,
-    generate_session_id,
-    OPENAI_AVAILABLE
-)
+# Import business logic from main.py (loaded on first use so the page renders
+# before the processing stack is imported)
+from src.utils.lazy_imports import lazy_import
+from src.utils.openai_config import OPENAI_AVAILABLE
+core = lazy_import("main")
 
 # Import utilities
 from src.utils.media_utils import get_video_info, format_timestamp
+from src.utils.screenshot_asset import get_screenshot_asset, encode_assets
 from src.utils.config_loader import get_config_loader
 from dotenv import load_dotenv
 
@@ -170,14 +168,15 @@ def download_screenshots():
         st.error("No screenshots to download.")
         return
     
+    # Reuse the PNGs already encoded for the documents; encode the rest in parallel
+    assets = [get_screenshot_asset(img) for img, _, _ in st.session_state.screenshots]
+    encode_assets(assets, 'png')
+
     zip_buffer = io.BytesIO()
     with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-        for i, (img, timestamp, reason) in enumerate(st.session_state.screenshots):
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='PNG')
-            img_byte_arr.seek(0)
-            filename = f"screenshot_{i+1:03d}_{format_timestamp(timestamp, for_filename=True)}.png"
-            zip_file.writestr(filename, img_byte_arr.getvalue())
+        for i, (asset, (_, timestamp, reason)) in enumerate(zip(assets, st.session_state.screenshots)):
+            filename, png_bytes = asset.zip_entry(f"screenshot_{i+1:03d}_{format_timestamp(timestamp, for_filename=True)}")
+            zip_file.writestr(filename, png_bytes)
             
             # Add a text file with the reason and timestamp
             reason_text = f"Time: {format_timestamp(timestamp)}\nReason: {reason}"
@@ -269,7 +268,7 @@ def main():
 
         # Analysis Settings - Compact Card
         if st.session_state.video_path and not st.session_state.analysis_complete:
-            st.session_state.session_id = generate_session_id()
+            st.session_state.session_id = core.generate_session_id()
             # Session logging is handled in main.py process_video function
 
 
@@ -320,7 +319,7 @@ def main():
                                 status_text.text(message)
                             
                             # Call business logic function from main.py
-                            result = process_video(
+                            result = core.process_video(
                                 video_path=st.session_state.video_path,
                                 client_name=st.session_state.client_name,
                                 detection_mode=detection_mode,
@@ -425,7 +424,7 @@ def main():
                 video_filename = os.path.basename(st.session_state.video_path)
                 video_size = os.path.getsize(st.session_state.video_path)
                 video_size_mb = round(video_size / (1024 * 1024), 2)
-                video_duration = get_video_duration_ffprobe(st.session_state.video_path)
+                video_duration = core.get_video_duration_ffprobe(st.session_state.video_path)
 
                 st.caption(f"📁 **File:** {video_filename}")
                 st.caption(f"💾 **Size:** {video_size_mb:.1f} MB")
@@ -512,7 +511,7 @@ def main():
                 with st.spinner("Generating your document..."):
                     try:
                         # Call business logic function from main.py
-                        result = generate_document(
+                        result = core.generate_document(
                             video_path=st.session_state.video_path,
                             screenshots=st.session_state.screenshots,
                             client_name=st.session_state.client_name,
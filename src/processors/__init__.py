@@ -7,13 +7,26 @@ Organized into submodules:
 - utils: Processor utilities (chunking, PII protection, etc.)
 """
 
-from .video.video_processor import VideoProcessor
-from .video.screenshot_extractor import ScreenshotExtractor
-from .audio.whisper_processor import WhisperProcessor, get_optimized_whisper_processor
+from ..utils.lazy_imports import lazy_attributes
+
+# Submodules load on first attribute access, so importing one processor does not
+# pull in Whisper, OCR and every other processor
+__getattr__ = lazy_attributes(__name__, {
+    'VideoProcessor': '.video.video_processor',
+    'FrameBatchFetcher': '.video.video_processor',
+    'ScreenshotExtractor': '.video.screenshot_extractor',
+    'PerceptualHashIndex': '.video.screenshot_dedup',
+    'deduplicate_screenshots': '.video.screenshot_dedup',
+    'WhisperProcessor': '.audio.whisper_processor',
+    'get_optimized_whisper_processor': '.audio.whisper_processor',
+})
 
 __all__ = [
     'VideoProcessor',
+    'FrameBatchFetcher',
     'ScreenshotExtractor',
+    'PerceptualHashIndex',
+    'deduplicate_screenshots',
     'WhisperProcessor',
     'get_optimized_whisper_processor',
 ]
@@ -0,0 +1,210 @@
+"""
+Audio Track Module
+
+Decodes a video's audio once into a 16 kHz mono int16 buffer that every speech
+consumer of a job shares. Slices are NumPy views (no copy) and WAV files are
+produced by prepending a header to the raw samples, so neither pydub nor ffmpeg
+has to run again after the initial decode.
+"""
+
+import logging
+import os
+import struct
+import subprocess
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def wav_header(data_size: int, sample_rate: int = SAMPLE_RATE, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    Build a canonical 44-byte PCM WAV header
+
+    Args:
+        data_size: Size of the PCM payload in bytes
+        sample_rate: Samples per second
+        channels: Number of channels
+        sample_width: Bytes per sample
+
+    Returns:
+        Header bytes
+    """
+    block_align = channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', data_size
+    )
+
+
+def encode_wav(pcm_data, sample_rate: int = SAMPLE_RATE, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    Encode raw PCM as a WAV file in memory
+
+    Args:
+        pcm_data: Raw PCM bytes (or any bytes-like object)
+        sample_rate: Samples per second
+        channels: Number of channels
+        sample_width: Bytes per sample
+
+    Returns:
+        WAV file bytes
+    """
+    pcm_data = memoryview(pcm_data).cast('B')
+    return wav_header(len(pcm_data), sample_rate, channels, sample_width) + pcm_data
+
+
+class AudioTrack:
+    """
+    A job's audio, decoded once to 16 kHz mono int16 PCM
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE, backing_file: Optional[str] = None):
+        """
+        Wrap already decoded samples
+
+        Args:
+            samples: Mono int16 samples (in memory or memory-mapped)
+            sample_rate: Samples per second
+            backing_file: Temporary file the samples are mapped from (deleted on close)
+        """
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.backing_file = backing_file
+
+    @classmethod
+    def from_video(cls, video_path: str, memmap: bool = None) -> "AudioTrack":
+        """
+        Decode the audio of a video with a single ffmpeg run
+
+        Args:
+            video_path: Path to the video file
+            memmap: Decode into a temporary file and memory-map it instead of holding
+                    the samples in memory (defaults to processing.audio.memmap_audio_track
+                    in app_config.yaml)
+
+        Returns:
+            AudioTrack instance
+
+        Raises:
+            RuntimeError: If ffmpeg fails or the video has no audio
+        """
+        if memmap is None:
+            memmap = False
+            try:
+                from ...utils.config_loader import get_config_loader
+                config_loader = get_config_loader()
+                app_config = config_loader.get_config('app_config.yaml')
+                memmap = app_config.get('processing', {}).get('audio', {}).get('memmap_audio_track', False)
+            except Exception as e:
+                logging.warning(f"Could not load audio track settings, using defaults: {e}")
+
+        command = ['ffmpeg', '-v', 'error', '-i', video_path, '-vn',
+                   '-ac', '1', '-ar', str(SAMPLE_RATE), '-f', 's16le', '-acodec', 'pcm_s16le']
+
+        if memmap:
+            fd, backing_file = tempfile.mkstemp(suffix='.pcm')
+            os.close(fd)
+            result = subprocess.run(command + ['-y', backing_file], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if result.returncode != 0 or os.path.getsize(backing_file) < 2:
+                os.remove(backing_file)
+                raise RuntimeError(f"FFmpeg audio decode failed: {result.stderr.decode(errors='replace').strip()}")
+            samples = np.memmap(backing_file, dtype='<i2', mode='r')
+        else:
+            backing_file = None
+            result = subprocess.run(command + ['pipe:1'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if result.returncode != 0 or len(result.stdout) < 2:
+                raise RuntimeError(f"FFmpeg audio decode failed: {result.stderr.decode(errors='replace').strip()}")
+            samples = np.frombuffer(result.stdout, dtype='<i2', count=len(result.stdout) // 2)
+
+        track = cls(samples, SAMPLE_RATE, backing_file)
+        logging.info(f"Decoded {track.duration:.1f}s of audio from {os.path.basename(video_path)}"
+                     f"{' (memory-mapped)' if memmap else ''}")
+        return track
+
+    @property
+    def duration(self) -> float:
+        """Length of the track in seconds"""
+        return len(self.samples) / self.sample_rate
+
+    def slice(self, start_seconds: float = 0.0, end_seconds: float = None) -> np.ndarray:
+        """
+        Samples between two times, as a view into the track (no copy)
+
+        Args:
+            start_seconds: Start time
+            end_seconds: End time (defaults to the end of the track)
+
+        Returns:
+            int16 NumPy view
+        """
+        start = max(0, int(round(start_seconds * self.sample_rate)))
+        end = len(self.samples) if end_seconds is None else max(start, int(round(end_seconds * self.sample_rate)))
+        return self.samples[start:end]
+
+    def pcm(self, start_seconds: float = 0.0, end_seconds: float = None) -> memoryview:
+        """Raw little-endian PCM bytes between two times, as a zero-copy memoryview"""
+        return memoryview(np.ascontiguousarray(self.slice(start_seconds, end_seconds))).cast('B')
+
+    def wav_bytes(self, start_seconds: float = 0.0, end_seconds: float = None) -> bytes:
+        """
+        Encode part of the track as an in-memory WAV file
+
+        Args:
+            start_seconds: Start time
+            end_seconds: End time (defaults to the end of the track)
+
+        Returns:
+            WAV file bytes
+        """
+        return encode_wav(self.pcm(start_seconds, end_seconds), self.sample_rate)
+
+    def write_wav(self, path: str, start_seconds: float = 0.0, end_seconds: float = None) -> str:
+        """
+        Write part of the track to a WAV file without re-encoding
+
+        Args:
+            path: Output file path
+            start_seconds: Start time
+            end_seconds: End time (defaults to the end of the track)
+
+        Returns:
+            The output path
+        """
+        pcm = self.pcm(start_seconds, end_seconds)
+        with open(path, 'wb') as f:
+            f.write(wav_header(len(pcm), self.sample_rate))
+            f.write(pcm)
+        return path
+
+    def segment(self, start_seconds: float = 0.0, end_seconds: float = None):
+        """
+        Part of the track as a pydub AudioSegment, for consumers that expect one
+
+        Args:
+            start_seconds: Start time
+            end_seconds: End time (defaults to the end of the track)
+
+        Returns:
+            AudioSegment built directly from the PCM (no decode)
+        """
+        from pydub import AudioSegment
+        return AudioSegment(data=bytes(self.pcm(start_seconds, end_seconds)),
+                            sample_width=2, frame_rate=self.sample_rate, channels=1)
+
+    def close(self):
+        """Release the samples and delete the memory-mapped backing file, if any"""
+        self.samples = np.zeros(0, dtype='<i2')
+        if self.backing_file:
+            try:
+                os.remove(self.backing_file)
+            except OSError:
+                pass
+            self.backing_file = None
+
+    def __del__(self):
+        self.close()
@@ -15,6 +15,9 @@ import json
 import requests
 from typing import Dict, Any, Optional, List, Tuple
 from pydub import AudioSegment
+
+from .transcription_cache import get_transcription_cache, pcm_from_segment
+from .audio_track import encode_wav
 import logging
 
 from ...utils.logger_config import setup_logger
@@ -115,19 +118,34 @@ class AzureSpeechClient:
         if not self.is_available():
             raise Exception("Azure AI Speech client not available")
         
+        # Never pay for the same audio twice
+        cache = get_transcription_cache()
+        cache_key = None
+        pcm_data = pcm_from_segment(audio_segment)
+        if cache.enabled:
+            cache_key = cache.make_key(pcm_data, "azure_speech", "sdk" if self.use_sdk else "rest", language)
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                logging.info("Using cached Azure AI Speech transcription")
+                return cached_result
+        
         # Create temporary file for audio
         temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
         temp_file.close()
         
         try:
-            # Export audio to WAV format (Azure Speech prefers WAV)
-            audio_segment.export(temp_file.name, format="wav", parameters=["-ac", "1", "-ar", "16000"])
+            # Write 16 kHz mono WAV (Azure Speech prefers WAV) without an ffmpeg re-encode
+            with open(temp_file.name, 'wb') as f:
+                f.write(encode_wav(pcm_data))
             
             # Transcribe using appropriate method
             if self.use_sdk:
                 result = self._transcribe_file_sdk(temp_file.name, language)
             else:
                 result = self._transcribe_file_rest(temp_file.name, language)
+            # A partial transcript must be retried next time, not served from the cache
+            if cache_key is not None and result.get('complete', True):
+                cache.put(cache_key, result)
             return result
             
         finally:
@@ -155,6 +173,10 @@ class AzureSpeechClient:
     def _transcribe_file_sdk(self, file_path: str, language: Optional[str] = None) -> Dict[str, Any]:
         """
         Transcribe audio file using Azure AI Speech SDK
+
+        Raises an exception if recognition is canceled with an error. If recognition
+        does not finish within the timeout, the partial text is returned with
+        'complete' set to False.
         """
         try:
             # Set language if provided
@@ -173,6 +195,8 @@ class AzureSpeechClient:
             # Collect all transcribed text using continuous recognition
             all_text = []
             done = threading.Event()
+            session_stopped = threading.Event()
+            cancellation_errors = []
             
             def handle_final_result(evt):
                 if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
@@ -186,23 +210,34 @@ class AzureSpeechClient:
                         logging.error(f"Error details: {cancellation_details.error_details}")
             
             def handle_session_stopped(evt):
+                session_stopped.set()
+                done.set()
+            
+            def handle_canceled(evt):
+                # End of the audio file is also reported as a cancellation
+                if evt.cancellation_details.reason == speechsdk.CancellationReason.Error:
+                    cancellation_errors.append(evt.cancellation_details.error_details)
                 done.set()
             
             # Connect event handlers
             recognizer.recognized.connect(handle_final_result)
             recognizer.session_stopped.connect(handle_session_stopped)
-            recognizer.canceled.connect(handle_session_stopped)
+            recognizer.canceled.connect(handle_canceled)
             
             # Start continuous recognition
             recognizer.start_continuous_recognition()
             
             # Wait for completion with timeout
-            if not done.wait(timeout=60):  # 60 second timeout
+            timed_out = not done.wait(timeout=60)  # 60 second timeout
+            if timed_out:
                 logging.warning("Speech recognition timed out")
             
             # Stop recognition
             recognizer.stop_continuous_recognition()
             
+            if cancellation_errors:
+                raise Exception(f"Azure AI Speech recognition canceled: {cancellation_errors[0]}")
+            
             # Return complete text
             complete_text = " ".join(all_text).strip()
             
@@ -210,7 +245,8 @@ class AzureSpeechClient:
                 'text': complete_text,
                 'confidence': 0.95,
                 'service': 'Azure AI Speech SDK',
-                'language': language or 'en-IN'
+                'language': language or 'en-IN',
+                'complete': session_stopped.is_set() and not timed_out
             }
                     
         except Exception as e:
@@ -13,6 +13,9 @@ from pydub import AudioSegment
 import logging
 from openai import OpenAI, AzureOpenAI
 
+from .transcription_cache import get_transcription_cache, pcm_from_segment
+from .audio_track import encode_wav
+
 logger = logging.getLogger(__name__)
 
 from ...utils.logger_config import setup_logger
@@ -93,17 +96,30 @@ class DirectAzureWhisperClient:
         if not self.is_available():
             raise Exception("Whisper client not available")
         
+        # Never pay for the same audio twice
+        cache = get_transcription_cache()
+        cache_key = None
+        pcm_data = pcm_from_segment(audio_segment)
+        if cache.enabled:
+            cache_key = cache.make_key(pcm_data, "azure_whisper", "whisper-1", language)
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                logging.info("Using cached Whisper transcription")
+                return cached_result
+        
         # Create temporary file for audio
         temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
         temp_file.close()
         
         try:
-            # Export as optimized WAV for Whisper
-            audio_segment.set_channels(1).set_frame_rate(16000).export(
-                temp_file.name, format="wav"
-            )
+            # Write optimized 16 kHz mono WAV for Whisper
+            with open(temp_file.name, 'wb') as f:
+                f.write(encode_wav(pcm_data))
             
-            return self._transcribe_file(temp_file.name, language)
+            result = self._transcribe_file(temp_file.name, language)
+            if cache_key is not None:
+                cache.put(cache_key, result)
+            return result
             
         finally:
             # Clean up temporary file
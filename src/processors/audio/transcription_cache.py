@@ -0,0 +1,217 @@
+"""
+Transcription Cache Module
+
+Disk-backed cache of speech-to-text results, keyed by a hash of the decoded
+16 kHz mono PCM audio plus the provider, model and language that produced them.
+Regenerating a document from the same recording (or uploading the same file
+twice) reuses the stored segments instead of running ASR or calling a paid API
+again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import wave
+from typing import Any, Dict, Optional
+
+# Global singleton instance
+_transcription_cache_instance = None
+_transcription_cache_lock = threading.Lock()
+
+
+def pcm_from_segment(audio_segment) -> bytes:
+    """
+    Raw 16 kHz mono 16-bit PCM of a pydub AudioSegment, as sent to the ASR providers.
+
+    Args:
+        audio_segment: pydub AudioSegment
+
+    Returns:
+        PCM bytes
+    """
+    return audio_segment.set_channels(1).set_frame_rate(16000).set_sample_width(2).raw_data
+
+
+def pcm_from_wav(wav_path: str) -> Optional[bytes]:
+    """
+    Raw PCM frames of a WAV file, or None if the file is not a readable PCM WAV.
+
+    Args:
+        wav_path: Path to the WAV file
+
+    Returns:
+        PCM bytes or None
+    """
+    try:
+        with wave.open(wav_path, 'rb') as wav_file:
+            header = f"{wav_file.getnchannels()}:{wav_file.getframerate()}:{wav_file.getsampwidth()}"
+            return header.encode() + wav_file.readframes(wav_file.getnframes())
+    except (wave.Error, EOFError, OSError):
+        return None
+
+
+class TranscriptionCache:
+    """
+    LRU, size-bounded cache of transcription results stored as JSON files.
+
+    Every entry is one file named after its key. Reads refresh the file's
+    modification time, and writes evict the least recently used entries once
+    the cache grows past its size or entry limit.
+    """
+
+    def __init__(self, cache_dir: str = None, max_size_mb: float = None, max_entries: int = None,
+                 enabled: bool = None):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory for cache entries (defaults to
+                       storage.cache_dir/transcriptions from app_config.yaml)
+            max_size_mb: Total size limit of the cache in megabytes
+            max_entries: Maximum number of cached results
+            enabled: Set to False to make the cache a no-op
+        """
+        cache_config = {}
+        storage_cache_dir = "data/cache"
+        try:
+            from ...utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            storage_cache_dir = app_config.get('storage', {}).get('cache_dir', storage_cache_dir)
+            cache_config = app_config.get('processing', {}).get('audio', {}).get('transcription_cache', {}) or {}
+        except Exception as e:
+            logging.warning(f"Could not load transcription cache settings, using defaults: {e}")
+
+        self.cache_dir = cache_dir or os.path.join(storage_cache_dir, "transcriptions")
+        self.max_size_bytes = int((max_size_mb or cache_config.get('max_size_mb', 200)) * 1024 * 1024)
+        self.max_entries = max_entries or cache_config.get('max_entries', 5000)
+        self.enabled = cache_config.get('enabled', True) if enabled is None else enabled
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pcm_data: bytes, provider: str, model: str, language: Optional[str] = None) -> str:
+        """
+        Build the cache key for a piece of audio
+
+        Args:
+            pcm_data: Decoded PCM audio (see pcm_from_segment and pcm_from_wav)
+            provider: ASR provider, e.g. "local_whisper", "azure_whisper", "azure_speech"
+            model: Model or service variant used by the provider
+            language: Language code requested from the provider (None for auto-detect)
+
+        Returns:
+            Hex digest identifying the audio and transcription settings
+        """
+        audio_digest = hashlib.sha256(pcm_data).hexdigest()
+        settings = f"{audio_digest}|{provider}|{model}|{language or 'auto'}"
+        return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached transcription result
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached result dictionary, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Discarding unreadable transcription cache entry {key}: {e}")
+            self._remove(path)
+            return None
+
+        return entry.get('result')
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a transcription result and evict old entries if the cache is full
+
+        Args:
+            key: Cache key from make_key
+            result: JSON-serializable transcription result
+        """
+        if not self.enabled:
+            return
+
+        try:
+            # Write to a temporary file first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'result': result}, f)
+            os.replace(temp_path, self._entry_path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Could not write transcription cache entry {key}: {e}")
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the size and entry limits are met"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            try:
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+            except OSError as e:
+                logging.warning(f"Could not scan transcription cache: {e}")
+                return
+
+            if total_size <= self.max_size_bytes and len(entries) <= self.max_entries:
+                return
+
+            entries.sort()
+            remaining = len(entries)
+            for _, size, path in entries:
+                if total_size <= self.max_size_bytes and remaining <= self.max_entries:
+                    break
+                self._remove(path)
+                total_size -= size
+                remaining -= 1
+
+            logging.info(f"Transcription cache evicted {len(entries) - remaining} entries")
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def get_transcription_cache() -> TranscriptionCache:
+    """
+    Get the shared transcription cache (singleton pattern)
+
+    Returns:
+        TranscriptionCache instance
+    """
+    global _transcription_cache_instance
+
+    with _transcription_cache_lock:
+        if _transcription_cache_instance is None:
+            _transcription_cache_instance = TranscriptionCache()
+        return _transcription_cache_instance
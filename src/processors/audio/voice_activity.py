@@ -0,0 +1,188 @@
+"""
+Voice Activity Detection Module
+
+Lightweight energy / zero-crossing voice activity detector for 16 kHz mono PCM.
+It finds the speech regions of a recording so that silent stretches (e.g. while
+someone shares their screen) are never sent to a speech-to-text service, and
+plans ASR chunks that start and end at pauses instead of at fixed offsets.
+"""
+
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """
+    Frame-based voice activity detector.
+
+    Each frame is classified from its RMS energy against an adaptive noise
+    floor; quieter frames with a high zero-crossing rate (unvoiced consonants)
+    also count as speech. The frame decisions are smoothed with a hangover so
+    short pauses inside a sentence do not split it.
+    """
+
+    def __init__(self, frame_ms: int = 30, energy_ratio: float = 3.0, min_rms: float = 200.0,
+                 zcr_threshold: float = 0.25, min_speech_ms: int = 150, min_silence_ms: int = 300,
+                 padding_ms: int = 200, enabled: bool = True):
+        """
+        Initialize the detector
+
+        Args:
+            frame_ms: Analysis frame length in milliseconds
+            energy_ratio: Speech must be this many times louder (RMS) than the noise floor
+            min_rms: Absolute RMS (int16 scale) below which a frame is never speech
+            zcr_threshold: Zero-crossing rate above which a quieter frame counts as unvoiced speech
+            min_speech_ms: Speech runs shorter than this are discarded as clicks
+            min_silence_ms: Pauses shorter than this are kept inside the speech region
+            padding_ms: Audio kept before and after every speech region
+            enabled: Set to False to treat the whole recording as speech
+        """
+        self.frame_ms = frame_ms
+        self.energy_ratio = energy_ratio
+        self.min_rms = min_rms
+        self.zcr_threshold = zcr_threshold
+        self.min_speech_ms = min_speech_ms
+        self.min_silence_ms = min_silence_ms
+        self.padding_ms = padding_ms
+        self.enabled = enabled
+
+    @classmethod
+    def from_config(cls) -> "VoiceActivityDetector":
+        """
+        Create a detector from processing.audio.vad in app_config.yaml
+
+        Returns:
+            VoiceActivityDetector instance (defaults if the config cannot be read)
+        """
+        try:
+            from ...utils.config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            vad_config = app_config.get('processing', {}).get('audio', {}).get('vad', {}) or {}
+            return cls(**vad_config)
+        except Exception as e:
+            logging.warning(f"Could not load VAD settings, using defaults: {e}")
+            return cls()
+
+    def _frame_features(self, samples: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Per-frame RMS energy and zero-crossing rate, plus the frame length in samples"""
+        frame_length = max(1, int(sample_rate * self.frame_ms / 1000))
+        frame_count = len(samples) // frame_length
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length).astype(np.float32)
+
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        return rms, zcr, frame_length
+
+    def speech_regions(self, samples: np.ndarray, sample_rate: int = 16000) -> List[Tuple[float, float]]:
+        """
+        Find the speech regions of a recording
+
+        Args:
+            samples: Mono int16 PCM samples
+            sample_rate: Sample rate of the samples
+
+        Returns:
+            List of (start_seconds, end_seconds) tuples in time order
+        """
+        duration = len(samples) / sample_rate
+        if not self.enabled:
+            return [(0.0, duration)] if len(samples) else []
+
+        rms, zcr, _ = self._frame_features(samples, sample_rate)
+        if len(rms) == 0:
+            return []
+
+        noise_floor = np.percentile(rms, 10)
+        threshold = max(self.min_rms, noise_floor * self.energy_ratio)
+        is_speech = (rms > threshold) | ((rms > threshold / 2) & (zcr > self.zcr_threshold))
+
+        runs = self._runs(is_speech)
+
+        # Hangover: bridge pauses too short to be a real break in speech
+        min_silence_frames = self.min_silence_ms / self.frame_ms
+        bridged = []
+        for start, end in runs:
+            if bridged and start - bridged[-1][1] < min_silence_frames:
+                bridged[-1] = (bridged[-1][0], end)
+            else:
+                bridged.append((start, end))
+
+        min_speech_frames = self.min_speech_ms / self.frame_ms
+        padding = self.padding_ms / 1000
+        frame_seconds = self.frame_ms / 1000
+
+        regions = []
+        for start, end in bridged:
+            if end - start < min_speech_frames:
+                continue
+            region_start = max(0.0, start * frame_seconds - padding)
+            region_end = min(duration, end * frame_seconds + padding)
+            if regions and region_start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], region_end)
+            else:
+                regions.append((region_start, region_end))
+
+        return regions
+
+    def speech_chunks(self, samples: np.ndarray, sample_rate: int = 16000, max_chunk_seconds: float = 30.0,
+                      max_merge_gap_seconds: float = 2.0) -> List[Tuple[float, float]]:
+        """
+        Plan ASR chunks that contain only speech and start and end at pauses
+
+        Neighbouring speech regions are merged into one chunk while the pause between
+        them is short and the chunk stays under max_chunk_seconds. Regions longer than
+        that are split at their quietest frame, so words are not cut at the chunk edge.
+
+        Args:
+            samples: Mono int16 PCM samples
+            sample_rate: Sample rate of the samples
+            max_chunk_seconds: Longest chunk to send to the ASR service
+            max_merge_gap_seconds: Longest pause kept inside a chunk
+
+        Returns:
+            List of (start_seconds, end_seconds) tuples in time order
+        """
+        regions = self.speech_regions(samples, sample_rate)
+        if not regions:
+            return []
+
+        chunks = []
+        for start, end in regions:
+            if (chunks and start - chunks[-1][1] <= max_merge_gap_seconds
+                    and end - chunks[-1][0] <= max_chunk_seconds):
+                chunks[-1] = (chunks[-1][0], end)
+            else:
+                chunks.append((start, end))
+
+        rms, _, frame_length = self._frame_features(samples, sample_rate)
+        frame_seconds = frame_length / sample_rate
+
+        split_chunks = []
+        for start, end in chunks:
+            while end - start > max_chunk_seconds:
+                # Cut at the quietest frame in the second half of the allowed length
+                first = int((start + max_chunk_seconds / 2) / frame_seconds)
+                last = min(int((start + max_chunk_seconds) / frame_seconds), len(rms))
+                if last <= first:
+                    cut = start + max_chunk_seconds
+                else:
+                    cut = (first + int(np.argmin(rms[first:last]))) * frame_seconds
+                split_chunks.append((start, cut))
+                start = cut
+            split_chunks.append((start, end))
+
+        speech_seconds = sum(end - start for start, end in split_chunks)
+        total_seconds = len(samples) / sample_rate
+        logging.info(f"VAD kept {speech_seconds:.1f}s of {total_seconds:.1f}s audio in {len(split_chunks)} chunks")
+        return split_chunks
+
+    @staticmethod
+    def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+        """(start, end) frame indices of the True runs in a boolean array"""
+        padded = np.concatenate([[False], mask, [False]])
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
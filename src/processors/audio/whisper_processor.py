@@ -9,17 +9,27 @@ import whisper
 import ffmpeg
 import tempfile
 import os
-from pydub import AudioSegment
 from typing import List, Tuple, Optional
 import numpy as np
 import threading
 import psutil
 
+from .transcription_cache import get_transcription_cache, pcm_from_wav
+from .audio_track import AudioTrack
+
 # Global singleton instance
 _whisper_processor_instance = None
 _whisper_lock = threading.Lock()
 
 
+def _remove_file(path: str):
+    """Delete a temporary audio file, ignoring one that is already gone"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
 class WhisperProcessor:
     """
     High-quality speech-to-text processing using OpenAI Whisper
@@ -59,40 +69,44 @@ class WhisperProcessor:
             else:
                 raise e
     
-    def convert_video_to_wav(self, video_path: str, output_path: str = None) -> str:
+    def convert_video_to_wav(self, video_path: str, output_path: str = None,
+                             audio_track: Optional[AudioTrack] = None) -> str:
         """
         Convert video file to WAV audio format for Whisper processing
         
         Args:
             video_path: Path to input video file
-            output_path: Path for output WAV file (optional)
+            output_path: Path for output WAV file (optional, a temporary file by default)
+            audio_track: Audio already decoded from the video by the caller (optional);
+                         written out as is instead of decoding the video again
             
         Returns:
             Path to the converted WAV file
         """
         if output_path is None:
             # Create temporary file
-            temp_dir = tempfile.mkdtemp()
-            output_path = os.path.join(temp_dir, "audio_for_whisper.wav")
+            fd, output_path = tempfile.mkstemp(suffix=".wav", prefix="audio_for_whisper_")
+            os.close(fd)
         
         try:
-            # Use pydub for reliable audio extraction
-            print(f"Converting video to audio: {video_path}")
-            audio = AudioSegment.from_file(video_path)
-            
-            # Convert to mono and resample to 16kHz (Whisper's preferred format)
-            audio = audio.set_channels(1)  # Convert to mono
-            audio = audio.set_frame_rate(16000)  # Resample to 16kHz
+            if audio_track is not None:
+                audio_track.write_wav(output_path)
+                print(f"Wrote decoded audio for Whisper: {output_path}")
+                return output_path
             
-            # Export as WAV
-            audio.export(output_path, format="wav")
+            # Decode straight to 16kHz mono PCM (Whisper's preferred format) in one
+            # ffmpeg run and write it out with a WAV header - no pydub resampling
+            print(f"Converting video to audio: {video_path}")
+            audio_track = AudioTrack.from_video(video_path)
+            audio_track.write_wav(output_path)
+            audio_track.close()
             print(f"Audio conversion complete: {output_path}")
             
             return output_path
             
         except Exception as e:
             print(f"Error converting video to audio: {e}")
-            # Fallback to ffmpeg-python if pydub fails
+            # Fall back to letting ffmpeg-python write the WAV file itself
             try:
                 print("Trying ffmpeg-python as fallback")
                 (
@@ -104,7 +118,8 @@ class WhisperProcessor:
                 )
                 return output_path
             except Exception as ffmpeg_error:
-                raise Exception(f"Both pydub and ffmpeg failed: {e}, {ffmpeg_error}")
+                _remove_file(output_path)
+                raise Exception(f"Both ffmpeg decodes failed: {e}, {ffmpeg_error}")
     
     def transcribe_audio(self, audio_path: str, language: str = None) -> dict:
         """
@@ -120,6 +135,17 @@ class WhisperProcessor:
         if self.model is None:
             raise Exception("Whisper model not loaded")
         
+        # Skip transcription entirely if this exact audio was transcribed before
+        cache = get_transcription_cache()
+        cache_key = None
+        pcm_data = pcm_from_wav(audio_path) if cache.enabled else None
+        if pcm_data is not None:
+            cache_key = cache.make_key(pcm_data, "local_whisper", self.model_size, language)
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                print(f"Using cached Whisper transcription ({len(cached_result.get('segments', []))} segments)")
+                return cached_result
+        
         # Use lock to ensure thread-safe transcription
         with self._transcription_lock:
             try:
@@ -144,29 +170,48 @@ class WhisperProcessor:
                     raise Exception("Whisper returned None result")
                 
                 print(f"Transcription complete. Found {len(result.get('segments', []))} segments")
+                
+                if cache_key is not None:
+                    cache.put(cache_key, {
+                        'text': result.get('text', ''),
+                        'language': result.get('language'),
+                        'segments': [
+                            {
+                                'start': float(segment.get('start', 0.0)),
+                                'end': float(segment.get('end', 0.0)),
+                                'text': segment.get('text', '')
+                            }
+                            for segment in result.get('segments', [])
+                        ]
+                    })
                 return result
                 
             except Exception as e:
                 print(f"Error during Whisper transcription: {e}")
                 raise e
     
-    def extract_speech_segments(self, video_path: str, language: str = None) -> List[Tuple[float, str]]:
+    def extract_speech_segments(self, video_path: str, language: str = None,
+                                audio_track: Optional[AudioTrack] = None) -> List[Tuple[float, str]]:
         """
         Extract speech segments from video with timestamps
         
         Args:
             video_path: Path to video file
             language: Language code for transcription
+            audio_track: Audio already decoded from the video (optional)
             
         Returns:
             List of (timestamp, text) tuples
         """
         try:
             # Convert video to audio
-            audio_path = self.convert_video_to_wav(video_path)
+            audio_path = self.convert_video_to_wav(video_path, audio_track=audio_track)
             
             # Transcribe audio
-            result = self.transcribe_audio(audio_path, language)
+            try:
+                result = self.transcribe_audio(audio_path, language)
+            finally:
+                _remove_file(audio_path)
             
             # Extract segments with timestamps
             speech_segments = []
@@ -179,12 +224,6 @@ class WhisperProcessor:
                     if text:  # Only add non-empty text
                         speech_segments.append((timestamp, text))
             
-            # Clean up temporary audio file
-            try:
-                os.remove(audio_path)
-            except:
-                pass
-            
             print(f"Extracted {len(speech_segments)} speech segments using Whisper")
             return speech_segments
             
@@ -192,7 +231,8 @@ class WhisperProcessor:
             print(f"Error extracting speech segments: {e}")
             return []
     
-    def extract_speech_with_keywords(self, video_path: str, keywords: List[str] = None, language: str = None) -> Tuple[List[Tuple[float, str]], List[Tuple[float, str]]]:
+    def extract_speech_with_keywords(self, video_path: str, keywords: List[str] = None, language: str = None,
+                                     audio_track: Optional[AudioTrack] = None) -> Tuple[List[Tuple[float, str]], List[Tuple[float, str]]]:
         """
         Extract speech segments and identify keyword matches
         
@@ -200,12 +240,13 @@ class WhisperProcessor:
             video_path: Path to video file
             keywords: List of keywords to search for
             language: Language code for transcription
+            audio_track: Audio already decoded from the video (optional)
             
         Returns:
             Tuple of (all_speech_segments, keyword_segments)
         """
         # Get all speech segments
-        speech_segments = self.extract_speech_segments(video_path, language)
+        speech_segments = self.extract_speech_segments(video_path, language, audio_track=audio_track)
         
         # Find keyword matches if keywords provided
         keyword_segments = []
@@ -221,29 +262,28 @@ class WhisperProcessor:
         
         return speech_segments, keyword_segments
     
-    def get_detailed_transcription(self, video_path: str, language: str = None) -> dict:
+    def get_detailed_transcription(self, video_path: str, language: str = None,
+                                   audio_track: Optional[AudioTrack] = None) -> dict:
         """
         Get detailed transcription with word-level timestamps
         
         Args:
             video_path: Path to video file
             language: Language code for transcription
+            audio_track: Audio already decoded from the video (optional)
             
         Returns:
             Detailed transcription data
         """
         try:
             # Convert video to audio
-            audio_path = self.convert_video_to_wav(video_path)
+            audio_path = self.convert_video_to_wav(video_path, audio_track=audio_track)
             
             # Get full transcription with word timestamps
-            result = self.transcribe_audio(audio_path, language)
-            
-            # Clean up
             try:
-                os.remove(audio_path)
-            except:
-                pass
+                result = self.transcribe_audio(audio_path, language)
+            finally:
+                _remove_file(audio_path)
             
             # Extract detailed information
             detailed_result = {
@@ -5,13 +5,11 @@ This module enhances the screenshot extraction process with parallel processing
 It wraps the standard screenshot extractor and enables parallel processing of video chunks.
 """
 
-import os
 import time
 import concurrent.futures
-from typing import List, Tuple, Dict, Any, Optional
-import math
 from PIL import Image
 import numpy as np
+from .parallel_frame_decoder import ParallelFrameDecoder, get_parallel_settings
 
 class ParallelExtractor:
     """
@@ -32,7 +30,7 @@ class ParallelExtractor:
         self.video_processor = video_processor
         self.fps = fps
         self.frame_count = frame_count
-        self.max_workers = os.cpu_count() or 4
+        self.mode, self.max_workers = get_parallel_settings()
         
     def process_in_parallel(self, progress_callback=None):
         """
@@ -178,6 +176,38 @@ class ParallelExtractor:
         completed = 0
         shared_processed_frames = set()  # Track processed frames globally
         
+        if self.mode == 'process':
+            # Decode each batch's frames in a worker process with its own capture handle,
+            # then run key frame detection on the prefetched frames as they arrive.
+            # Batches hold as many timestamp windows as fit in one shared memory block,
+            # so the frames held at once do not grow with the number of timestamps
+            decoder = ParallelFrameDecoder(self.video_processor.video_path, self.fps, self.max_workers)
+            frames_per_timestamp = len(self._batch_frame_numbers([(0, None)]))
+            batch_size = max(1, decoder.max_shared_frames // frames_per_timestamp)
+            batches = [(i // batch_size, key_timestamps[i:i + batch_size])
+                       for i in range(0, len(key_timestamps), batch_size)]
+            frame_batches = [self._batch_frame_numbers(batch_timestamps) for _, batch_timestamps in batches]
+            
+            for index, frames in decoder.decode_frame_batches(frame_batches):
+                batch_id, batch_timestamps = batches[index]
+                try:
+                    screenshots.extend(self._process_timestamp_batch(
+                        batch_id, batch_timestamps, shared_processed_frames, frames
+                    ))
+                except Exception as e:
+                    print(f"Error processing batch {batch_id}: {e}")
+                
+                completed += 1
+                if progress_callback:
+                    progress_percent = 0.5 + (completed / len(batches)) * 0.5
+                    progress_callback(
+                        progress_percent, 
+                        f"Processed batch {completed}/{len(batches)}"
+                    )
+            
+            screenshots.sort(key=lambda x: x[1])
+            return screenshots
+        
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all batch processing tasks
             future_to_batch = {
@@ -212,7 +242,24 @@ class ParallelExtractor:
         
         return screenshots
         
-    def _process_timestamp_batch(self, batch_id, timestamps, shared_processed_frames):
+    def _batch_frame_numbers(self, timestamps, window_size=10):
+        """
+        Frame numbers a batch may read: each timestamp's frame and its surrounding window
+        
+        Args:
+            timestamps: List of (timestamp, reason) tuples
+            window_size: Frames checked on each side of a timestamp
+            
+        Returns:
+            List of frame numbers
+        """
+        frame_numbers = []
+        for timestamp, _ in timestamps:
+            center_frame_number = int(timestamp * self.fps)
+            frame_numbers.extend(range(center_frame_number - window_size, center_frame_number + window_size + 1))
+        return frame_numbers
+        
+    def _process_timestamp_batch(self, batch_id, timestamps, shared_processed_frames, frame_source=None):
         """
         Process a batch of timestamps to extract screenshots
         
@@ -220,10 +267,14 @@ class ParallelExtractor:
             batch_id: ID of the batch
             timestamps: List of (timestamp, reason) tuples
             shared_processed_frames: Set to track globally processed frames
+            frame_source: Optional prefetched frames to read from instead of the shared VideoProcessor
             
         Returns:
             List of (image, timestamp, reason) screenshots
         """
+        if frame_source is None:
+            frame_source = self.video_processor
+        
         batch_screenshots = []
         start_time = time.time()
         # Local set to track processed frames in this batch
@@ -243,7 +294,7 @@ class ParallelExtractor:
                 
             # Special handling for scene changes - use exact frame
             if "Scene change" in reason:
-                frame = self.video_processor.get_frame_at_position(center_frame_number)
+                frame = frame_source.get_frame_at_position(center_frame_number)
                 if frame is not None:
                     img_pil = Image.fromarray(frame)
                     batch_screenshots.append((img_pil, timestamp, reason))
@@ -252,7 +303,7 @@ class ParallelExtractor:
             
             # Special handling for AI detection - always capture exact frame
             elif "AI detected" in reason or "AI Detected" in reason:
-                frame = self.video_processor.get_frame_at_position(center_frame_number)
+                frame = frame_source.get_frame_at_position(center_frame_number)
                 if frame is not None:
                     img_pil = Image.fromarray(frame)
                     batch_screenshots.append((img_pil, timestamp, reason))
@@ -280,7 +331,7 @@ class ParallelExtractor:
                 shared_processed_frames.add(frame_number)
                 
                 # Get the frame
-                frame = self.video_processor.get_frame_at_position(frame_number)
+                frame = frame_source.get_frame_at_position(frame_number)
                 if frame is None:
                     continue
                     
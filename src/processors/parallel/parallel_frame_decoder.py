@@ -0,0 +1,404 @@
+"""
+Multi-process frame decoding module.
+
+cv2.VideoCapture handles cannot be shared between threads and the Python code
+around them is serialized by the GIL. This module decodes video in a process
+pool instead: every worker opens its own VideoProcessor on a disjoint frame
+range and hands decoded frames back through shared memory, or returns only
+the (small) scene detection results.
+"""
+
+import collections
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from ..video.video_processor import VideoProcessor, FrameBatchFetcher
+from ..video.scene_scorer import SceneChangeScorer
+
+
+# Frames per shared memory block handed back by a decode worker
+DEFAULT_MAX_SHARED_FRAMES = 16
+
+
+def _parallel_config():
+    try:
+        from ...utils.config_loader import get_config_loader
+        config_loader = get_config_loader()
+        app_config = config_loader.get_config('app_config.yaml')
+        return app_config.get('processing', {}).get('parallel_processing', {}) or {}
+    except Exception as e:
+        print(f"Could not load parallel processing settings, using defaults: {e}")
+        return {}
+
+
+def get_parallel_settings():
+    """
+    Read the parallel processing settings from app_config.yaml.
+
+    Returns:
+        tuple: (mode, max_workers) where mode is 'process' or 'thread'
+    """
+    parallel_config = _parallel_config()
+    mode = parallel_config.get('mode', "thread")
+    max_workers = int(parallel_config.get('max_workers') or os.cpu_count() or 4)
+    return mode, max(1, max_workers)
+
+
+def get_max_shared_frames():
+    """
+    Read the shared memory block limit from app_config.yaml.
+
+    Returns:
+        int: Maximum number of frames a decode worker places in one block
+    """
+    max_shared_frames = _parallel_config().get('max_shared_frames', DEFAULT_MAX_SHARED_FRAMES)
+    return max(1, int(max_shared_frames))
+
+
+def split_frame_range(start_frame, end_frame, parts, align=1):
+    """
+    Split [start_frame, end_frame) into disjoint contiguous ranges.
+
+    Args:
+        start_frame: First frame of the range
+        end_frame: Frame to stop before
+        parts: Number of ranges to produce (at most)
+        align: Range boundaries are multiples of this (e.g. a sampling step)
+
+    Returns:
+        List of (start_frame, end_frame) tuples
+    """
+    total = max(0, end_frame - start_frame)
+    if total == 0:
+        return []
+
+    align = max(1, int(align))
+    range_size = math.ceil(total / max(1, parts) / align) * align
+
+    return [(start, min(start + range_size, end_frame))
+            for start in range(start_frame, end_frame, range_size)]
+
+
+def _decode_blocks_worker(worker_id, video_path, blocks, results, stop):
+    """
+    Worker: decode a contiguous run of frame blocks with one capture handle.
+
+    The capture is opened once and the blocks are decoded forward in frame
+    order, so consecutive blocks are reached without reopening or seeking back.
+    Each block is handed over through a shared memory block; putting it on the
+    bounded results queue blocks while the parent is behind.
+
+    Args:
+        worker_id: Index of this worker
+        video_path: Path to the video file
+        blocks: List of (block id, frame numbers) in frame order
+        results: Queue receiving ("block", worker_id, block id, result, error)
+                 messages and a final ("done", worker_id) message
+        stop: Event set by the parent when it no longer wants frames
+    """
+    try:
+        fetcher = FrameBatchFetcher(VideoProcessor(video_path))
+        for block_id, frame_numbers in blocks:
+            if stop.is_set():
+                break
+            try:
+                result, error = _share_frames(fetcher.fetch(frame_numbers)), None
+            except Exception as e:
+                result, error = None, str(e)
+            results.put(("block", worker_id, block_id, result, error))
+    finally:
+        results.put(("done", worker_id))
+
+
+def _share_frames(frames):
+    """
+    Place decoded frames in a new shared memory block.
+
+    Returns:
+        Tuple of (shared memory name, block shape, decoded frame numbers)
+    """
+    if not frames:
+        return None, (), []
+
+    decoded_numbers = sorted(frames)
+    shape = (len(decoded_numbers),) + frames[decoded_numbers[0]].shape
+
+    block = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+    try:
+        stacked = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+        for i, frame_number in enumerate(decoded_numbers):
+            stacked[i] = frames[frame_number]
+        del stacked
+    finally:
+        block.close()
+
+    return block.name, shape, decoded_numbers
+
+
+def _collect_shared_frames(result):
+    """
+    Copy frames out of a worker's shared memory block and release the block.
+
+    Returns:
+        Dict mapping frame number to RGB frame
+    """
+    name, shape, frame_numbers = result
+    if not frame_numbers:
+        return {}
+
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        stacked = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+        frames = {frame_number: stacked[i].copy() for i, frame_number in enumerate(frame_numbers)}
+        del stacked
+    finally:
+        block.close()
+        block.unlink()
+
+    return frames
+
+
+def _scene_similarity_worker(video_path, start_frame, end_frame, step, detection_height, use_ffmpeg):
+    """
+    Worker: compute SSIM between consecutive sampled frames in [start_frame, end_frame).
+
+    The sample just before start_frame is decoded as the reference for the
+    first comparison, so the ranges of all workers together produce exactly
+    the pairs a single sequential scan would. Frames are decoded as small
+    grayscale detection frames and scored in vectorized windows.
+
+    Returns:
+        List of (frame_number, timestamp, similarity) tuples
+    """
+    processor = VideoProcessor(video_path)
+    first_frame = max(0, start_frame - step)
+
+    sampled_frames = processor.sample_detection_frames(
+        step=step, start_frame=first_frame, end_frame=end_frame,
+        height=detection_height, use_ffmpeg=use_ffmpeg
+    )
+    return [(frame_number, timestamp, similarity)
+            for frame_number, timestamp, similarity in SceneChangeScorer().score_stream(sampled_frames)
+            if frame_number >= start_frame]
+
+
+class PrefetchedFrames:
+    """
+    Frame source over frames decoded by a worker process.
+
+    Mirrors the read API of VideoProcessor (get_frame_at_position and
+    sample_frames) so detection code can run on prefetched frames unchanged.
+    """
+
+    def __init__(self, frames, fps):
+        """
+        Args:
+            frames: Dict mapping frame number to RGB frame
+            fps: Frames per second of the video
+        """
+        self.frames = frames
+        self.fps = fps
+
+    def get_frame_at_position(self, frame_number):
+        """Return the prefetched frame, or None if it was not decoded."""
+        return self.frames.get(frame_number)
+
+    def sample_frames(self, step=1, start_frame=0, end_frame=None, frame_numbers=None, max_skip=0):
+        """Yield (frame_number, timestamp, frame) for the prefetched frames that were requested."""
+        if frame_numbers is None:
+            step = max(1, int(step))
+            frame_numbers = [n for n in self.frames
+                             if n >= start_frame and (n - start_frame) % step == 0]
+
+        for frame_number in sorted(set(frame_numbers)):
+            if end_frame is not None and frame_number >= end_frame:
+                break
+            frame = self.frames.get(frame_number)
+            if frame is not None:
+                timestamp = frame_number / self.fps if self.fps > 0 else 0.0
+                yield frame_number, timestamp, frame
+
+
+class ParallelFrameDecoder:
+    """
+    Decodes a video in a process pool, one VideoCapture handle per worker.
+    """
+
+    def __init__(self, video_path, fps, max_workers=None):
+        """
+        Initialize the decoder.
+
+        Args:
+            video_path: Path to the video file
+            fps: Frames per second of the video
+            max_workers: Number of worker processes (defaults to
+                processing.parallel_processing.max_workers in app_config.yaml)
+        """
+        self.video_path = video_path
+        self.fps = fps
+        self.max_workers = max_workers or get_parallel_settings()[1]
+        self.max_shared_frames = get_max_shared_frames()
+
+    def decode_frame_batches(self, frame_batches):
+        """
+        Decode several batches of frames in parallel.
+
+        Batches are split into blocks of at most max_shared_frames frames, and
+        the blocks are divided into one contiguous run per worker process, so
+        every worker opens its capture once and decodes its run forward. Workers
+        hand blocks over through a queue of max_workers entries, so at most
+        2 x max_workers blocks are in shared memory at any time however large
+        the batches are.
+
+        Args:
+            frame_batches: List of frame number lists
+
+        Yields:
+            Tuple of (batch index, PrefetchedFrames) as each batch completes
+        """
+        if not frame_batches:
+            return
+
+        blocks = []
+        for index, frame_numbers in enumerate(frame_batches):
+            frame_numbers = sorted(set(frame_numbers))
+            if not frame_numbers:
+                blocks.append((index, []))
+            for start in range(0, len(frame_numbers), self.max_shared_frames):
+                blocks.append((index, frame_numbers[start:start + self.max_shared_frames]))
+
+        # Contiguous runs in frame order, one per worker
+        order = sorted(range(len(blocks)), key=lambda block_id: blocks[block_id][1][:1])
+        runs = [[(block_id, blocks[block_id][1]) for block_id in order[start:end]]
+                for start, end in split_frame_range(0, len(blocks), self.max_workers)]
+
+        start_time = time.time()
+        print(f"Decoding {len(frame_batches)} frame batches ({len(blocks)} blocks) with {len(runs)} worker processes")
+
+        # Workers must share our resource tracker, otherwise each one reports the
+        # blocks it hands over to us as leaked when it exits
+        resource_tracker.ensure_running()
+
+        context = multiprocessing.get_context()
+        results = context.Queue(maxsize=len(runs))
+        stop = context.Event()
+        workers = [context.Process(target=_decode_blocks_worker,
+                                   args=(worker_id, self.video_path, run, results, stop), daemon=True)
+                   for worker_id, run in enumerate(runs)]
+        for worker in workers:
+            worker.start()
+
+        remaining = collections.Counter(index for index, _ in blocks)
+        undelivered = [{block_id for block_id, _ in run} for run in runs]
+        running = set(range(len(workers)))
+        batch_frames = {}
+
+        def receive():
+            """Next message from the workers; a worker that died counts as done"""
+            while True:
+                try:
+                    return results.get(timeout=1)
+                except queue.Empty:
+                    for worker_id in list(running):
+                        if not workers[worker_id].is_alive():
+                            print(f"Frame decode worker {worker_id} exited with code {workers[worker_id].exitcode}")
+                            return ("done", worker_id)
+
+        try:
+            while running:
+                message = receive()
+                if message[0] == "done":
+                    worker_id = message[1]
+                    running.discard(worker_id)
+                    # Blocks of a worker that failed are yielded without their frames
+                    finished = [blocks[block_id][0] for block_id in undelivered[worker_id]]
+                    undelivered[worker_id] = set()
+                else:
+                    _, worker_id, block_id, result, error = message
+                    undelivered[worker_id].discard(block_id)
+                    index = blocks[block_id][0]
+                    frames = {}
+                    if error is not None:
+                        print(f"Error decoding frame batch {index}: {error}")
+                    else:
+                        try:
+                            frames = _collect_shared_frames(result)
+                        except Exception as e:
+                            print(f"Error decoding frame batch {index}: {e}")
+                    batch_frames.setdefault(index, {}).update(frames)
+                    finished = [index]
+
+                for index in finished:
+                    remaining[index] -= 1
+                    if remaining[index] == 0:
+                        yield index, PrefetchedFrames(batch_frames.pop(index, {}), self.fps)
+        finally:
+            # Release the blocks of a consumer that stopped early
+            stop.set()
+            while running:
+                message = receive()
+                if message[0] == "done":
+                    running.discard(message[1])
+                elif message[3] is not None:
+                    try:
+                        _collect_shared_frames(message[3])
+                    except Exception:
+                        pass
+            for worker in workers:
+                worker.join()
+
+        print(f"Decoded {len(frame_batches)} frame batches in {time.time() - start_time:.2f}s")
+
+    def scene_similarities(self, frame_count, step, progress_callback=None, detection_height=360, use_ffmpeg=False):
+        """
+        Compute SSIM between consecutive sampled frames, splitting the video
+        into one disjoint frame range per worker.
+
+        Args:
+            frame_count: Total number of frames
+            step: Sampling step in frames
+            progress_callback: Optional callback for progress updates
+            detection_height: Height of the grayscale frames compared
+            use_ffmpeg: Let ffmpeg decode and downscale the frames
+
+        Returns:
+            List of (frame_number, timestamp, similarity) tuples sorted by frame
+        """
+        frame_ranges = split_frame_range(0, frame_count, self.max_workers, align=step)
+        if not frame_ranges:
+            return []
+
+        start_time = time.time()
+        print(f"Scanning {len(frame_ranges)} frame ranges for scene changes with {len(frame_ranges)} worker processes")
+
+        similarities = []
+        completed = 0
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(frame_ranges)) as executor:
+            future_to_range = {
+                executor.submit(_scene_similarity_worker, self.video_path, start, end, step,
+                                detection_height, use_ffmpeg): (start, end)
+                for start, end in frame_ranges
+            }
+
+            for future in concurrent.futures.as_completed(future_to_range):
+                start, end = future_to_range[future]
+                try:
+                    similarities.extend(future.result())
+                except Exception as e:
+                    print(f"Error scanning frames {start}-{end}: {e}")
+
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed / len(frame_ranges),
+                                      f"Scanning for scene changes: {completed}/{len(frame_ranges)} ranges")
+
+        similarities.sort(key=lambda x: x[0])
+        print(f"Scene scan of {frame_count} frames completed in {time.time() - start_time:.2f}s")
+        return similarities
@@ -6,7 +6,6 @@ significantly speeding up screenshot extraction and document generation.
 """
 
 import concurrent.futures
-import os
 import time
 import math
 import numpy as np
@@ -14,6 +13,8 @@ from PIL import Image
 import cv2
 from typing import List, Tuple, Dict, Any, Optional
 import io
+from ..video.video_processor import VideoProcessor
+from .parallel_frame_decoder import ParallelFrameDecoder, get_parallel_settings
 
 class VideoChunkProcessor:
     """
@@ -34,7 +35,7 @@ class VideoChunkProcessor:
         self.video_processor = video_processor
         self.fps = fps
         self.frame_count = frame_count
-        self.max_workers = os.cpu_count() or 4
+        self.mode, self.max_workers = get_parallel_settings()
         
     def split_video_into_chunks(self, chunk_duration_seconds=30):
         """
@@ -60,12 +61,35 @@ class VideoChunkProcessor:
         print(f"Split video into {len(chunks)} chunks of {chunk_duration_seconds}s each")
         return chunks
     
-    def process_chunk(self, chunk_data):
+    def chunk_frame_numbers(self, chunk_data, window_size=5, scan_step=15):
+        """
+        Frame numbers process_chunk may read for a chunk.
+        
+        Args:
+            chunk_data: Tuple of (chunk_id, start_frame, end_frame, start_time, end_time)
+            window_size: Frames checked on each side of a key timestamp
+            scan_step: Sampling step of the full-chunk scan
+            
+        Returns:
+            List of frame numbers within the chunk
+        """
+        _, start_frame, end_frame, start_time, end_time = chunk_data
+        
+        frame_numbers = list(range(start_frame, end_frame, scan_step))
+        for timestamp, _ in getattr(self.extractor, 'key_timestamps', None) or []:
+            if start_time <= timestamp <= end_time:
+                center_frame = int(timestamp * self.fps)
+                frame_numbers.extend(range(max(start_frame, center_frame - window_size),
+                                           min(end_frame, center_frame + window_size + 1)))
+        return frame_numbers
+    
+    def process_chunk(self, chunk_data, frame_source=None):
         """
         Process a single video chunk.
         
         Args:
             chunk_data: Tuple of (chunk_id, start_frame, end_frame, start_time, end_time)
+            frame_source: Optional prefetched frames for this chunk (see chunk_frame_numbers)
             
         Returns:
             Tuple of (chunk_id, screenshots, timestamps)
@@ -83,6 +107,10 @@ class VideoChunkProcessor:
         frame_buffer = []
         processed_frames = set()
         
+        # Decode through a dedicated capture handle - the shared one cannot be
+        # advanced sequentially by several chunk threads at once
+        chunk_reader = frame_source if frame_source is not None else VideoProcessor(self.video_processor.video_path)
+        
         # Get key timestamps that fall within this chunk's time range
         chunk_timestamps = []
         try:
@@ -112,24 +140,17 @@ class VideoChunkProcessor:
                 window_size = 5  # frames to check on each side
                 best_screenshot = None
                 
-                for offset in range(-window_size, window_size + 1):
-                    frame_number = center_frame + offset
-                    
-                    # Skip if out of range or already processed
-                    if frame_number < start_frame or frame_number >= end_frame or frame_number in processed_frames:
-                        continue
-                    
-                    # Get the frame
-                    frame = self.video_processor.get_frame_at_position(frame_number)
-                    if frame is None:
-                        continue
-                    
+                # Skip frames that are out of range or already processed
+                window_frames = [
+                    center_frame + offset for offset in range(-window_size, window_size + 1)
+                    if start_frame <= center_frame + offset < end_frame
+                    and center_frame + offset not in processed_frames
+                ]
+                
+                for frame_number, exact_timestamp, frame in chunk_reader.sample_frames(frame_numbers=window_frames):
                     # Mark as processed
                     processed_frames.add(frame_number)
                     
-                    # Calculate exact timestamp
-                    exact_timestamp = frame_number / self.fps
-                    
                     # For scene changes, always use the exact frame
                     if "Scene change" in reason:
                         print(f"Chunk {chunk_id}: Processing scene change at {exact_timestamp:.2f}s")
@@ -206,17 +227,9 @@ class VideoChunkProcessor:
             frame_buffer = []
             
             # Process frames with reasonable sampling (every 15th frame)
-            for frame_number in range(start_frame, end_frame, 15):
+            for frame_number, timestamp, frame in chunk_reader.sample_frames(step=15, start_frame=start_frame, end_frame=end_frame):
                 if frame_number in processed_frames:
                     continue
-                    
-                # Get the frame
-                frame = self.video_processor.get_frame_at_position(frame_number)
-                if frame is None:
-                    continue
-                    
-                # Calculate timestamp
-                timestamp = frame_number / self.fps
                 
                 # Add to frame buffer
                 if len(frame_buffer) >= 15:
@@ -289,22 +302,21 @@ class VideoChunkProcessor:
         max_workers = min(self.max_workers, len(chunks))
         print(f"Processing {len(chunks)} video chunks with {max_workers} workers in parallel")
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all chunk processing tasks
-            future_to_chunk = {
-                executor.submit(self.process_chunk, data): data[0]  # chunk_id
-                for data in task_data
-            }
+        if self.mode == 'process':
+            # Worker processes decode disjoint chunks; detection runs here on the prefetched frames
+            decoder = ParallelFrameDecoder(self.video_processor.video_path, self.fps, max_workers)
+            frame_batches = [self.chunk_frame_numbers(data) for data in task_data]
             
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_chunk):
-                chunk_id = future_to_chunk[future]
+            for index, frames in decoder.decode_frame_batches(frame_batches):
+                chunk_id = task_data[index][0]
                 try:
-                    _, chunk_screenshots = future.result()
+                    _, chunk_screenshots = self.process_chunk(task_data[index], frames)
                     all_screenshots.extend(chunk_screenshots)
                     print(f"Added {len(chunk_screenshots)} screenshots from chunk {chunk_id}")
                 except Exception as e:
                     print(f"Error processing chunk {chunk_id}: {e}")
+        else:
+            self._process_chunks_in_threads(task_data, max_workers, all_screenshots)
         
         # Sort screenshots by timestamp
         all_screenshots.sort(key=lambda x: x[1])
@@ -324,6 +336,33 @@ class VideoChunkProcessor:
             return deduplicated
         
         return []
+    
+    def _process_chunks_in_threads(self, task_data, max_workers, all_screenshots):
+        """
+        Process chunks in a thread pool; each chunk opens its own capture handle.
+        
+        Args:
+            task_data: List of (chunk_id, start_frame, end_frame, start_time, end_time)
+            max_workers: Number of worker threads
+            all_screenshots: List the chunk screenshots are appended to
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all chunk processing tasks
+            future_to_chunk = {
+                executor.submit(self.process_chunk, data): data[0]  # chunk_id
+                for data in task_data
+            }
+            
+            # Process results as they complete
+            for future in concurrent.futures.as_completed(future_to_chunk):
+                chunk_id = future_to_chunk[future]
+                try:
+                    _, chunk_screenshots = future.result()
+                    all_screenshots.extend(chunk_screenshots)
+                    print(f"Added {len(chunk_screenshots)} screenshots from chunk {chunk_id}")
+                except Exception as e:
+                    print(f"Error processing chunk {chunk_id}: {e}")
+
 
 def process_video_in_parallel(extractor, video_processor, fps, frame_count):
     """
@@ -0,0 +1,165 @@
+import numpy as np
+
+
+class SceneChangeScorer:
+    """
+    Vectorized SSIM for consecutive frames of a grayscale frame stack.
+
+    Scores every consecutive pair of an N x H x W stack in one call, using
+    integral-image box filters for the local means, variances and covariance.
+    The result matches skimage's structural_similarity with its defaults
+    (7x7 uniform window, sample covariance) without building an SSIM map per
+    pair. Pairs whose mean absolute difference is below the pre-filter
+    threshold are treated as unchanged and skip SSIM entirely.
+    """
+
+    def __init__(self, win_size=7, data_range=255, prefilter_threshold=1.0):
+        """
+        Initialize the scorer.
+
+        Args:
+            win_size (int): Side of the square SSIM window.
+            data_range (float): Value range of the frames (255 for uint8).
+            prefilter_threshold (float): Pairs with a mean absolute pixel difference
+                below this are reported as identical (similarity 1.0) without SSIM.
+                Set to 0 to score every pair.
+        """
+        self.win_size = win_size
+        self.prefilter_threshold = prefilter_threshold
+        self.c1 = (0.01 * data_range) ** 2
+        self.c2 = (0.03 * data_range) ** 2
+
+        pixels_per_window = win_size * win_size
+        self.cov_norm = pixels_per_window / (pixels_per_window - 1)
+
+    def score(self, frames):
+        """
+        Compute the similarity of each frame to the previous one.
+
+        Args:
+            frames (numpy.ndarray or list): N grayscale frames of identical size (N x H x W).
+
+        Returns:
+            numpy.ndarray: N-1 similarities; element i compares frame i+1 to frame i.
+        """
+        stack = np.asarray(frames)
+        if stack.ndim != 3:
+            raise ValueError(f"Expected an N x H x W frame stack, got shape {stack.shape}")
+        if len(stack) < 2:
+            return np.ones(0)
+        if min(stack.shape[1:]) < self.win_size:
+            raise ValueError(f"Frames must be at least {self.win_size} pixels on each side")
+
+        similarities = np.ones(len(stack) - 1)
+
+        changed = np.arange(len(stack) - 1)
+        if self.prefilter_threshold > 0:
+            changed = changed[self.mean_abs_diff(stack) >= self.prefilter_threshold]
+        if len(changed) == 0:
+            return similarities
+
+        similarities[changed] = self._pair_ssim(stack, changed)
+        return similarities
+
+    def score_stream(self, sampled_frames, window=16):
+        """
+        Score a stream of sampled frames in windows of consecutive frames.
+
+        The last frame of each window is carried over as the first frame of the
+        next one, so every consecutive pair of the stream is scored exactly once.
+
+        Args:
+            sampled_frames (iterable): (frame_number, timestamp, gray frame) tuples.
+            window (int): Number of pairs scored per vectorized call.
+
+        Yields:
+            tuple: (frame_number, timestamp, similarity to the previous frame) for
+                every frame except the first.
+        """
+        frames = []
+        positions = []
+        for frame_number, timestamp, gray in sampled_frames:
+            frames.append(gray)
+            positions.append((frame_number, timestamp))
+
+            if len(frames) > window:
+                yield from self._score_window(frames, positions)
+                frames, positions = frames[-1:], positions[-1:]
+
+        if len(frames) > 1:
+            yield from self._score_window(frames, positions)
+
+    def _score_window(self, frames, positions):
+        """Yield (frame_number, timestamp, similarity) for the pairs of one window."""
+        for (frame_number, timestamp), similarity in zip(positions[1:], self.score(frames)):
+            yield frame_number, timestamp, float(similarity)
+
+    def mean_abs_diff(self, frames):
+        """
+        Mean absolute pixel difference between consecutive frames.
+
+        Args:
+            frames (numpy.ndarray): N x H x W frame stack.
+
+        Returns:
+            numpy.ndarray: N-1 mean absolute differences.
+        """
+        stack = np.asarray(frames)
+        diffs = np.empty(len(stack) - 1)
+        for i in range(len(stack) - 1):
+            # Per pair to keep the int16 temporary at one frame
+            diffs[i] = np.abs(stack[i + 1].astype(np.int16) - stack[i]).mean()
+        return diffs
+
+    def _pair_ssim(self, stack, pairs):
+        """Mean SSIM for the pairs (pairs[i], pairs[i] + 1) of the stack."""
+        # Per-frame statistics are computed once even if a frame is in two pairs
+        frame_indices = np.union1d(pairs, pairs + 1)
+        position = {index: i for i, index in enumerate(frame_indices)}
+        first = np.array([position[i] for i in pairs])
+        second = np.array([position[i + 1] for i in pairs])
+
+        pixels = stack[frame_indices].astype(np.float64)
+        pixels_per_window = self.win_size * self.win_size
+
+        # Window sums need float64 precision; the per-window statistics do not
+        mean = (self._box_sums(pixels) / pixels_per_window).astype(np.float32)
+        mean_sq = (self._box_sums(pixels * pixels) / pixels_per_window).astype(np.float32)
+        mean_xy = (self._box_sums(pixels[first] * pixels[second]) / pixels_per_window).astype(np.float32)
+        del pixels
+
+        mu_x, mu_y = mean[first], mean[second]
+        mu_xy = mu_x * mu_y
+        mu_sq_sum = mu_x * mu_x
+        mu_sq_sum += mu_y * mu_y
+
+        # Variance sum and covariance, reusing the statistics buffers in place
+        var_sum = mean_sq[first]
+        var_sum += mean_sq[second]
+        var_sum -= mu_sq_sum
+        var_sum *= self.cov_norm
+        var_sum += self.c2
+        mean_xy -= mu_xy
+        mean_xy *= 2 * self.cov_norm
+        mean_xy += self.c2
+
+        mu_xy *= 2
+        mu_xy += self.c1
+        mu_sq_sum += self.c1
+
+        # SSIM = (2 mu_x mu_y + C1)(2 cov_xy + C2) / ((mu_x^2 + mu_y^2 + C1)(var_x + var_y + C2))
+        mu_xy *= mean_xy
+        mu_sq_sum *= var_sum
+        mu_xy /= mu_sq_sum
+        return mu_xy.mean(axis=(1, 2), dtype=np.float64)
+
+    def _box_sums(self, stack):
+        """Sum over every full win_size x win_size window of each image, via integral images."""
+        n, height, width = stack.shape
+        k = self.win_size
+
+        integral = np.zeros((n, height + 1, width + 1), dtype=np.float64)
+        np.cumsum(stack, axis=1, out=integral[:, 1:, 1:])
+        np.cumsum(integral[:, 1:, 1:], axis=2, out=integral[:, 1:, 1:])
+
+        return integral[:, k:, k:] - integral[:, :-k, k:] - integral[:, k:, :-k] + integral[:, :-k, :-k]
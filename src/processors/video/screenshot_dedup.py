@@ -0,0 +1,212 @@
+import cv2
+import logging
+import numpy as np
+from skimage.metrics import structural_similarity
+
+# Size of the grayscale thumbnails compared with SSIM to confirm a hash match
+THUMBNAIL_SIZE = (160, 90)
+
+# Number of set bits in every byte value, for Hamming distances on NumPy < 2.0
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount64(values):
+    """Number of set bits in each element of a uint64 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return _BYTE_POPCOUNT[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def _to_gray(image):
+    """Grayscale uint8 array from a PIL image or an RGB/grayscale numpy array."""
+    if hasattr(image, 'convert'):
+        return np.asarray(image.convert('L'))
+    image = np.asarray(image)
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+
+def dhash(gray):
+    """
+    Compute the 64-bit difference hash of a grayscale image.
+
+    The image is shrunk to 9x8 and each bit records whether a pixel is brighter
+    than its right-hand neighbour, so the hash survives rescaling, compression
+    noise and small brightness changes.
+
+    Args:
+        gray (numpy.ndarray): Grayscale image.
+
+    Returns:
+        int: The hash as an unsigned 64-bit integer.
+    """
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+class PerceptualHashIndex:
+    """
+    Index of 64-bit perceptual hashes with Hamming-distance lookup.
+
+    Hashes are kept in one growing uint64 array, so a lookup is a single
+    vectorized XOR and popcount over all entries.
+    """
+
+    def __init__(self, capacity=256):
+        """
+        Initialize an empty index.
+
+        Args:
+            capacity (int): Initial number of hashes the array can hold before growing.
+        """
+        self._hashes = np.zeros(max(1, capacity), dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, image_hash):
+        """
+        Add a hash to the index.
+
+        Args:
+            image_hash (int): 64-bit hash.
+
+        Returns:
+            int: Position of the hash in the index.
+        """
+        if self._size == len(self._hashes):
+            self._hashes = np.concatenate([self._hashes, np.zeros_like(self._hashes)])
+        self._hashes[self._size] = image_hash
+        self._size += 1
+        return self._size - 1
+
+    def distances(self, image_hash):
+        """
+        Hamming distances from a hash to every hash in the index.
+
+        Args:
+            image_hash (int): 64-bit hash.
+
+        Returns:
+            numpy.ndarray: One distance per indexed hash, in insertion order.
+        """
+        return _popcount64(self._hashes[:self._size] ^ np.uint64(image_hash))
+
+    def within(self, image_hash, max_distance):
+        """
+        Find every indexed hash within max_distance bits, closest first.
+
+        Args:
+            image_hash (int): 64-bit hash.
+            max_distance (int): Largest Hamming distance that counts as a match.
+
+        Returns:
+            list: (position, distance) tuples sorted by distance.
+        """
+        if self._size == 0:
+            return []
+
+        distances = self.distances(image_hash)
+        positions = np.flatnonzero(distances <= max_distance)
+        positions = positions[np.argsort(distances[positions], kind='stable')]
+        return [(int(position), int(distances[position])) for position in positions]
+
+    def nearest(self, image_hash, max_distance):
+        """
+        Find the closest indexed hash within max_distance bits.
+
+        Args:
+            image_hash (int): 64-bit hash.
+            max_distance (int): Largest Hamming distance that counts as a match.
+
+        Returns:
+            tuple: (position, distance) of the closest match, or (None, None) if none is close enough.
+        """
+        if self._size == 0:
+            return None, None
+
+        distances = self.distances(image_hash)
+        position = int(np.argmin(distances))
+        if distances[position] > max_distance:
+            return None, None
+        return position, int(distances[position])
+
+
+def _reason_priority(reason):
+    """Rank screenshot reasons: keyword triggers first, then AI detections, then the rest."""
+    if "Keyword trigger" in reason:
+        return 2
+    if "AI detected" in reason:
+        return 1
+    return 0
+
+
+def _thumbnail(gray):
+    """Small grayscale thumbnail used to confirm a hash match with SSIM."""
+    return cv2.resize(gray, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def deduplicate_screenshots(screenshots, max_distance=6, min_similarity=0.97):
+    """
+    Collapse visually near-identical screenshots to one representative each.
+
+    Screenshots are visited best first (by reason priority, then sharpness) and each
+    one either joins a representative or becomes a new one. The 64-bit dHash only
+    preselects representatives within max_distance bits; slides sharing a layout can
+    hash that close, so a match is confirmed by the SSIM of small thumbnails before
+    merging. The same slide shown several times during a meeting therefore ends up
+    in the document once, as its best capture.
+
+    Args:
+        screenshots (list): (image, timestamp, reason) tuples.
+        max_distance (int): Largest dHash Hamming distance (0-64) considered for a merge.
+        min_similarity (float): Smallest thumbnail SSIM (0-1) treated as a duplicate.
+
+    Returns:
+        tuple: (kept screenshots sorted by timestamp,
+                list of {"timestamp", "reason", "merged_timestamps"} dicts for
+                representatives that absorbed duplicates)
+    """
+    if len(screenshots) < 2:
+        return list(screenshots), []
+
+    candidates = []
+    for image, timestamp, reason in screenshots:
+        gray = _to_gray(image)
+        sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
+        candidates.append((_reason_priority(reason), sharpness, dhash(gray), _thumbnail(gray),
+                           (image, timestamp, reason)))
+
+    candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+
+    index = PerceptualHashIndex(capacity=len(candidates))
+    representatives = []
+    thumbnails = []
+    merged_timestamps = []
+    for _, _, image_hash, thumbnail, screenshot in candidates:
+        position = next((position for position, _ in index.within(image_hash, max_distance)
+                         if structural_similarity(thumbnail, thumbnails[position]) >= min_similarity), None)
+        if position is None:
+            index.add(image_hash)
+            representatives.append(screenshot)
+            thumbnails.append(thumbnail)
+            merged_timestamps.append([])
+        else:
+            merged_timestamps[position].append(screenshot[1])
+
+    merges = [
+        {"timestamp": screenshot[1], "reason": screenshot[2], "merged_timestamps": sorted(merged)}
+        for screenshot, merged in zip(representatives, merged_timestamps) if merged
+    ]
+    merges.sort(key=lambda m: m["timestamp"])
+
+    for merge in merges:
+        logging.info("Merged near-duplicate screenshots at %s into %.2fs",
+                     ", ".join(f"{t:.2f}s" for t in merge["merged_timestamps"]), merge["timestamp"])
+
+    kept = sorted(representatives, key=lambda s: s[1])
+    logging.info("Perceptual-hash deduplication kept %d of %d screenshots", len(kept), len(screenshots))
+    return kept, merges
@@ -7,6 +7,7 @@ from PIL import Image
 import tempfile
 import os
 import re
+import subprocess
 from pydub import AudioSegment
 import io
 import concurrent.futures
@@ -14,6 +15,10 @@ import time
 import math
 from typing import List, Tuple, Dict, Any, Optional
 from ..audio.whisper_processor import WhisperProcessor, get_optimized_whisper_processor
+from ..audio.voice_activity import VoiceActivityDetector
+from ..audio.audio_track import AudioTrack
+from .video_processor import FrameBatchFetcher, OrderedFrameCursor
+from .scene_scorer import SceneChangeScorer
 from ..utils.face_pii import FastFaceBlurProcessor
 # Import our parallel processing modules
 from ..parallel.parallel_processor import ParallelProcessor
@@ -22,6 +27,7 @@ from ..parallel.parallel_video_processor import ParallelVideoProcessor
 from ..parallel.parallel_extractor import ParallelExtractor
 from ..parallel.parallel_speech import process_speech_in_parallel
 from ..parallel.parallel_video_chunks import process_video_in_parallel
+from ..parallel.parallel_frame_decoder import ParallelFrameDecoder, get_parallel_settings
 import logging
 
 from ...utils.logger_config import setup_logger
@@ -41,7 +47,7 @@ class ScreenshotExtractor:
     def __init__(self, threshold=25, min_area=2000, text_change_threshold=10, cooldown=3, 
                  ssim_threshold=0.85, keyword_trigger=True, mouse_tracking=True, 
                  use_ai_speech_analysis=False, parallel_processing=True, use_ssim=True, 
-                 detection_mode='advanced'):
+                 detection_mode='advanced', detection_height=360, detection_decoder='opencv'):
         """
         Initialize the screenshot extractor with detection parameters.
         
@@ -57,6 +63,8 @@ class ScreenshotExtractor:
             parallel_processing (bool): Whether to use parallel processing for improved performance.
             use_ssim (bool): Legacy parameter for backwards compatibility.
             detection_mode (str): Detection mode - 'basic' (excludes scene changes) or 'advanced' (includes all methods).
+            detection_height (int): Height of the grayscale frames decoded for the scene change scan.
+            detection_decoder (str): 'opencv' or 'ffmpeg' (scales at decode time) for detection frames.
         """
         self.threshold = threshold
         self.min_area = min_area
@@ -67,6 +75,9 @@ class ScreenshotExtractor:
         self.mouse_tracking = mouse_tracking
         self.parallel_processing = parallel_processing
         self.detection_mode = detection_mode
+        self.detection_height = detection_height
+        self.detection_decoder = detection_decoder
+        self.scene_scorer = SceneChangeScorer()
         
         # Initialize detection result lists
         self.keyword_timestamps = []
@@ -77,6 +88,9 @@ class ScreenshotExtractor:
         if self.parallel_processing:
             self.parallel_processor = ParallelProcessor()
         
+        # 'process' decodes video in worker processes, each with its own capture handle
+        self.parallel_mode, self.max_workers = get_parallel_settings()
+        
         # Check if OpenAI is available for AI speech analysis
         if use_ai_speech_analysis and not OPENAI_AVAILABLE:
             logging.info("Warning: OpenAI API is not available. Disabling AI speech analysis.")
@@ -93,7 +107,7 @@ class ScreenshotExtractor:
         
         # Audio processing and speech recognition - Using Whisper for better accuracy
         self.recognizer = sr.Recognizer()
-        self.temp_audio_file = None
+        self.audio_track = None  # Decoded audio shared by all speech consumers
         self.audio_chunks = []
         self.speech_timestamps = []
         
@@ -137,55 +151,36 @@ class ScreenshotExtractor:
             bool: True if audio extraction was successful, False otherwise.
         """
         try:
-            # First try: Use ffmpeg if available
-            import subprocess
-            ffmpeg_available = False
-            
+            # First try: Decode the audio once with ffmpeg; every speech consumer of
+            # this job shares the decoded track
             try:
-                # Check if ffmpeg is available
-                subprocess.run(['ffmpeg', '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
-                ffmpeg_available = True
-            except (subprocess.SubprocessError, FileNotFoundError):
-                logging.exception("FFmpeg not available. Will try alternative methods.")
-                ffmpeg_available = False
+                self.audio_track = AudioTrack.from_video(video_path)
+            except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+                logging.info(f"Audio extraction with FFmpeg failed ({e}). Trying alternative methods.")
+                self.audio_track = None
             
-            if ffmpeg_available:
-                # Create a temporary file to store audio
-                temp_audio = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                self.temp_audio_file = temp_audio.name
-                temp_audio.close()
+            if self.audio_track is not None:
+                # For long videos, use longer chunks to reduce processing time
+                # This will decrease accuracy slightly but improve performance significantly
+                if self.audio_track.duration > 300:  # 5 minutes
+                    chunk_length_ms = 30000  # 30 seconds for long videos
+                else:
+                    chunk_length_ms = 15000  # 15 seconds for short videos
                 
-                # Extract audio using ffmpeg with optimized settings
-                # -y: Overwrite output file without asking
-                # -vn: Disable video recording
-                # -ar 16000: Set audio sampling rate to 16KHz (good for speech)
-                # -ac 1: Set audio channels to 1 (mono)
-                # -q:a 0: Use highest quality audio
-                result = subprocess.run(['ffmpeg', '-i', video_path, '-vn', '-ar', '16000', 
-                                        '-ac', '1', '-q:a', '0', self.temp_audio_file, '-y'],
-                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                # Only send speech to the ASR services, cut at pauses
+                speech_chunks = self._plan_speech_chunks(self.audio_track, chunk_length_ms)
+                if not speech_chunks:
+                    # Split into fixed chunks for speech recognition
+                    chunk_length = chunk_length_ms / 1000
+                    speech_chunks = [(start_s, min(start_s + chunk_length, self.audio_track.duration))
+                                     for start_s in np.arange(0, self.audio_track.duration, chunk_length)]
                 
-                # Check if the audio file was created successfully
-                if os.path.exists(self.temp_audio_file) and os.path.getsize(self.temp_audio_file) > 0:
-                    # Load the audio file for processing
-                    audio = AudioSegment.from_wav(self.temp_audio_file)
-                    
-                    # For long videos, use longer chunks to reduce processing time
-                    # This will decrease accuracy slightly but improve performance significantly
-                    if len(audio) > 300000:  # 5 minutes
-                        chunk_length_ms = 30000  # 30 seconds for long videos
-                    else:
-                        chunk_length_ms = 15000  # 15 seconds for short videos
-                    
-                    # Split into chunks for speech recognition
-                    for i in range(0, len(audio), chunk_length_ms):
-                        chunk = audio[i:i+chunk_length_ms]
-                        self.audio_chunks.append((i / 1000, chunk))  # Store start time and chunk
-                    
-                    logging.info(f"Audio extracted successfully with FFmpeg - created {len(self.audio_chunks)} chunks")
-                    return True
-                else:
-                    logging.info("Audio extraction with FFmpeg failed. Trying alternative methods.")
+                for start_s, end_s in speech_chunks:
+                    # Store start time and chunk
+                    self.audio_chunks.append((float(start_s), self.audio_track.segment(start_s, end_s)))
+                
+                logging.info(f"Audio extracted successfully with FFmpeg - created {len(self.audio_chunks)} chunks")
+                return True
             
             # Second try: Use local Whisper processor for high-quality transcription
             local_whisper_succeeded = False
@@ -194,7 +189,8 @@ class ScreenshotExtractor:
                 
                 try:
                     # Use Whisper processor to extract speech segments with precise timestamps
-                    speech_segments = self.whisper_processor.extract_speech_segments(video_path)
+                    speech_segments = self.whisper_processor.extract_speech_segments(
+                        video_path, audio_track=self.audio_track)
                     
                     if speech_segments:
                         # Store speech segments with precise timestamps
@@ -281,6 +277,32 @@ class ScreenshotExtractor:
             logging.exception(f"Error extracting audio: {e}")
             return False
     
+    def _plan_speech_chunks(self, audio_track, max_chunk_length_ms):
+        """
+        Use voice activity detection to plan ASR chunks covering only speech.
+        
+        Args:
+            audio_track (AudioTrack): Decoded audio of the whole video.
+            max_chunk_length_ms (int): Longest chunk to send to a speech service.
+            
+        Returns:
+            list: (start_seconds, end_seconds) tuples, or an empty list if VAD is disabled,
+                  failed or found no speech (callers then fall back to fixed chunks).
+        """
+        try:
+            vad = VoiceActivityDetector.from_config()
+            if not vad.enabled:
+                return []
+            
+            speech_chunks = vad.speech_chunks(audio_track.samples, audio_track.sample_rate,
+                                              max_chunk_seconds=max_chunk_length_ms / 1000)
+            if not speech_chunks:
+                logging.info("VAD found no speech, using fixed-length audio chunks")
+            return speech_chunks
+        except Exception as e:
+            logging.exception(f"Voice activity detection failed, using fixed-length audio chunks: {e}")
+            return []
+    
     def detect_keywords_in_speech(self, start_time, end_time):
         """
         Process speech for keyword detection within a time range.
@@ -653,19 +675,18 @@ class ScreenshotExtractor:
         Calculate the structural similarity between two frames.
         
         Args:
-            frame1 (numpy.ndarray): First frame.
-            frame2 (numpy.ndarray): Second frame.
+            frame1 (numpy.ndarray): First frame (RGB or already grayscale).
+            frame2 (numpy.ndarray): Second frame (RGB or already grayscale).
             
         Returns:
             float: SSIM index between the two frames (0-1, higher is more similar).
         """
         # Convert to grayscale
-        gray1 = cv2.cvtColor(frame1, cv2.COLOR_RGB2GRAY)
-        gray2 = cv2.cvtColor(frame2, cv2.COLOR_RGB2GRAY)
+        gray1 = frame1 if frame1.ndim == 2 else cv2.cvtColor(frame1, cv2.COLOR_RGB2GRAY)
+        gray2 = frame2 if frame2.ndim == 2 else cv2.cvtColor(frame2, cv2.COLOR_RGB2GRAY)
         
-        # Calculate SSIM
-        score, _ = ssim(gray1, gray2, full=True)
-        return score
+        # Calculate SSIM (the mean score only; the full SSIM map is never used)
+        return ssim(gray1, gray2)
     
     def is_key_frame(self, frame, timestamp):
         """
@@ -733,18 +754,17 @@ class ScreenshotExtractor:
             # In basic mode, skip all scene change detection
             pass
         elif self.prev_frame is not None and not is_key_frame:
-            # Resize frame if needed for performance
+            # Convert to grayscale once, then resize if needed for performance
+            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+            prev_gray = cv2.cvtColor(self.prev_frame, cv2.COLOR_RGB2GRAY)
             if frame.shape[0] > 720:
                 scale = 720 / frame.shape[0]
                 width = int(frame.shape[1] * scale)
-                frame_resized = cv2.resize(frame, (width, 720))
-                prev_resized = cv2.resize(self.prev_frame, (width, 720))
-            else:
-                frame_resized = frame
-                prev_resized = self.prev_frame
+                gray = cv2.resize(gray, (width, 720))
+                prev_gray = cv2.resize(prev_gray, (width, 720))
                 
             # Calculate structural similarity
-            similarity = self.calculate_ssim(frame_resized, prev_resized)
+            similarity = self.calculate_ssim(gray, prev_gray)
             
             # Low similarity means significant change - a major scene change
             # Make this threshold more strict to only capture major UI changes
@@ -754,8 +774,6 @@ class ScreenshotExtractor:
             else:
                 # 4. Check for significant visual changes - only for major content changes
                 # We increase the threshold to only detect significant changes
-                gray = cv2.cvtColor(frame_resized, cv2.COLOR_RGB2GRAY)
-                prev_gray = cv2.cvtColor(prev_resized, cv2.COLOR_RGB2GRAY)
                 
                 # Compute absolute difference
                 frame_delta = cv2.absdiff(prev_gray, gray)
@@ -1100,49 +1118,18 @@ class ScreenshotExtractor:
             
         logging.info("Fast scene change detection with sampling rate 1:%d", sample_rate)
         
-        prev_frame = None
-        prev_processed_frame = None
-        
-        frames_to_process = range(0, frame_count, sample_rate)
-        total_frames_to_process = len(frames_to_process)
+        if self.parallel_processing and self.parallel_mode == 'process':
+            # Each worker process scans its own frame range with its own capture handle
+            decoder = ParallelFrameDecoder(video_processor.video_path, fps, self.max_workers)
+            similarities = decoder.scene_similarities(
+                frame_count, sample_rate, progress_callback,
+                detection_height=self.detection_height,
+                use_ffmpeg=self.detection_decoder == 'ffmpeg'
+            )
+        else:
+            similarities = self._iter_scene_similarities(video_processor, frame_count, sample_rate, progress_callback)
         
-        for i, frame_number in enumerate(frames_to_process):
-            # Update progress
-            if progress_callback and i % 5 == 0:
-                progress_callback(i / total_frames_to_process, 
-                                 f"Scanning for scene changes: {i}/{total_frames_to_process} frames")
-            
-            # Get the frame
-            frame = video_processor.get_frame_at_position(frame_number)
-            if frame is None:
-                continue
-                
-            timestamp = frame_number / fps
-                
-            # Skip the first frame
-            if prev_frame is None:
-                prev_frame = frame
-                
-                # Resize frame for processing if needed
-                if frame.shape[0] > 720:
-                    scale = 720 / frame.shape[0]
-                    width = int(frame.shape[1] * scale)
-                    prev_processed_frame = cv2.resize(frame, (width, 720))
-                else:
-                    prev_processed_frame = frame
-                continue
-                
-            # Resize frame for processing if needed
-            if frame.shape[0] > 720:
-                scale = 720 / frame.shape[0]
-                width = int(frame.shape[1] * scale)
-                frame_resized = cv2.resize(frame, (width, 720))
-            else:
-                frame_resized = frame
-                
-            # Calculate structural similarity
-            similarity = self.calculate_ssim(frame_resized, prev_processed_frame)
-            
+        for frame_number, timestamp, similarity in similarities:
             # Low similarity means significant scene change - use a stricter threshold
             # for the fast scan to only catch major changes
             if similarity < self.ssim_threshold - 0.1:  # More strict threshold
@@ -1157,13 +1144,42 @@ class ScreenshotExtractor:
                     if t >= 0:  # Ensure valid timestamp
                         self.scene_change_timestamps.append((t, f"Scene change (SSIM={similarity:.3f})"))
             
-            # Update the previous frame
-            prev_frame = frame
-            prev_processed_frame = frame_resized
-            
         logging.info("Found %d scene changes", len(self.scene_change_timestamps))
         return self.scene_change_timestamps
         
+    def _iter_scene_similarities(self, video_processor, frame_count, sample_rate, progress_callback=None):
+        """
+        Decode the video once and yield the similarity of each sampled frame to the previous sample.
+        
+        Args:
+            video_processor: The VideoProcessor instance to get frames from
+            frame_count: Total number of frames
+            sample_rate: Sampling step in frames
+            progress_callback: Optional callback for progress updates
+            
+        Yields:
+            tuple: (frame_number, timestamp, similarity)
+        """
+        total_frames_to_process = len(range(0, frame_count, sample_rate))
+        
+        # Decode forward once, straight to small grayscale frames - full-size RGB
+        # is only needed for frames that become screenshots
+        sampled_frames = video_processor.sample_detection_frames(
+            step=sample_rate, end_frame=frame_count, height=self.detection_height,
+            use_ffmpeg=self.detection_decoder == 'ffmpeg'
+        )
+        
+        def report_progress(frames):
+            for i, sampled_frame in enumerate(frames):
+                if progress_callback and i % 5 == 0:
+                    progress_callback(i / total_frames_to_process, 
+                                     f"Scanning for scene changes: {i}/{total_frames_to_process} frames")
+                yield sampled_frame
+        
+        # Consecutive samples are scored in vectorized windows; unchanged pairs
+        # are caught by the scorer's pre-filter and skip SSIM
+        yield from self.scene_scorer.score_stream(report_progress(sampled_frames))
+        
     def two_phase_process(self, video_processor, fps, frame_count, progress_callback=None):
         """
         Perform two-phase processing:
@@ -1319,45 +1335,38 @@ class ScreenshotExtractor:
                 face_blur_processor_fast = FastFaceBlurProcessor(blur_intensity=40)
 
                 
-                # Process each timestamp individually - more reliable than parallel
-                for i, (timestamp, reason) in enumerate(self.key_timestamps):
-                    logging.info(f"Processing timestamp {i+1}/{len(self.key_timestamps)}: {timestamp:.2f}s - {reason}")
+                # Group key timestamps by frame so all of them are served by one forward decode
+                frame_requests = {}
+                for timestamp, reason in self.key_timestamps:
+                    frame_number = int(timestamp * fps)
                     
-                    try:
-                        # Convert timestamp to frame number
-                        frame_number = int(timestamp * fps)
+                    # Add a frame position check to avoid out-of-range errors
+                    if 0 <= frame_number < frame_count:
+                        frame_requests.setdefault(frame_number, []).append((timestamp, reason))
+                    else:
+                        logging.info(f"Frame number {frame_number} out of range (0-{frame_count-1})")
+                
+                processed_count = 0
+                for frame_number, _, frame in video_processor.sample_frames(frame_numbers=frame_requests):
+                    for timestamp, reason in frame_requests[frame_number]:
+                        processed_count += 1
+                        logging.info(f"Processing timestamp {processed_count}/{len(self.key_timestamps)}: {timestamp:.2f}s - {reason}")
                         
-                        # Add a frame position check to avoid out-of-range errors
-                        if 0 <= frame_number < frame_count:
-                            # Get the frame
-                            frame = video_processor.get_frame_at_position(frame_number)
-                            
-                            if frame is not None:
-                                try:
-                                    blurred_frame = face_blur_processor_fast.blur_faces_in_frame(frame)
-                                    img_pil = Image.fromarray(blurred_frame)
-                                    screenshots.append((img_pil, timestamp, reason))
-                                    logging.info(f"Added screenshot at {timestamp:.2f}s - {reason}")
-                                except Exception as img_err:
-                                    logging.exception(f"Error converting frame to image: {img_err}, trying alternate method.")
-
-                                    try:
-                                        # Convert to PIL image without blur as fallback
-                                        img_pil = Image.fromarray(frame)
-                                        screenshots.append((img_pil, timestamp, reason))
-                                        logging.info(f"Added screenshot at {timestamp:.2f}s - {reason}")
-                                    except Exception as img_err:
-                                        logging.exception(f"Error converting frame to image: {img_err}")
-                        else:
-                            logging.info(f"Frame number {frame_number} out of range (0-{frame_count-1})")
-                    except Exception as e:
-                        logging.exception(f"Error processing timestamp {timestamp:.2f}s: {e}")
                         try:
-                            img_pil = Image.fromarray(frame)
+                            blurred_frame = face_blur_processor_fast.blur_faces_in_frame(frame)
+                            img_pil = Image.fromarray(blurred_frame)
                             screenshots.append((img_pil, timestamp, reason))
-                            logging.info(f"Added screenshot at {timestamp:.2f}s - {reason} (original, blur failed)")
-                        except Exception as fallback_err:
-                            logging.exception(f"Error converting frame to image: {fallback_err}")
+                            logging.info(f"Added screenshot at {timestamp:.2f}s - {reason}")
+                        except Exception as img_err:
+                            logging.exception(f"Error converting frame to image: {img_err}, trying alternate method.")
+
+                            try:
+                                # Convert to PIL image without blur as fallback
+                                img_pil = Image.fromarray(frame)
+                                screenshots.append((img_pil, timestamp, reason))
+                                logging.info(f"Added screenshot at {timestamp:.2f}s - {reason}")
+                            except Exception as img_err:
+                                logging.exception(f"Error converting frame to image: {img_err}")
                 
                 # If we still don't have enough screenshots, sample frames directly
                 if len(screenshots) < 5:
@@ -1366,38 +1375,26 @@ class ScreenshotExtractor:
                     # Take a few evenly spaced frames
                     total_duration = frame_count / fps
                     num_samples = min(5, int(total_duration / 30))  # At most 5 or one per 30 seconds
+                    sample_frame_numbers = [int(((i * total_duration) / num_samples) * fps) for i in range(num_samples)]
                     
-                    for i in range(num_samples):
-                        sample_time = (i * total_duration) / num_samples if num_samples > 0 else 0
-                        frame_num = int(sample_time * fps)
-                        
-                        if 0 <= frame_num < frame_count:
-                            try:
-                                sample_frame = video_processor.get_frame_at_position(frame_num)
-                                if sample_frame is not None:
-                                    try:
-                                        blurred_frame = face_blur_processor_fast.blur_faces_in_frame(sample_frame)
-                                        img_pil = Image.fromarray(blurred_frame)
-                                        screenshots.append((img_pil, timestamp, reason))
-                                        logging.info(f"Added screenshot at {timestamp:.2f}s - {reason}")
-                                    except Exception as img_err:
-                                        logging.exception(f"Error converting frame to image: {img_err}, trying alternate method.")
+                    sampled_frames = video_processor.sample_frames(frame_numbers=sample_frame_numbers)
+                    for i, (frame_num, sample_time, sample_frame) in enumerate(sampled_frames):
+                        sample_reason = f"Video sample {i+1}"
+                        try:
+                            blurred_frame = face_blur_processor_fast.blur_faces_in_frame(sample_frame)
+                            img_pil = Image.fromarray(blurred_frame)
+                            screenshots.append((img_pil, sample_time, sample_reason))
+                            logging.info(f"Added screenshot at {sample_time:.2f}s - {sample_reason}")
+                        except Exception as img_err:
+                            logging.exception(f"Error converting frame to image: {img_err}, trying alternate method.")
 
-                                        try:
-                                            # Convert to PIL image without blur as fallback
-                                            img_pil = Image.fromarray(sample_frame)
-                                            screenshots.append((img_pil, timestamp, reason))
-                                            logging.info(f"Added screenshot at {timestamp:.2f}s - {reason}")
-                                        except Exception as img_err:
-                                            logging.exception(f"Error converting frame to image: {img_err}")
-                            except Exception as e:
-                                logging.exception(f"Error processing timestamp {timestamp:.2f}s: {e}") 
-                                try:
-                                    img_pil = Image.fromarray(sample_frame)
-                                    screenshots.append((img_pil, timestamp, reason))
-                                    logging.info(f"Added screenshot at {timestamp:.2f}s - {reason} (original, blur failed)")
-                                except Exception as fallback_err:
-                                    logging.exception(f"Error converting frame to image: {fallback_err}")       
+                            try:
+                                # Convert to PIL image without blur as fallback
+                                img_pil = Image.fromarray(sample_frame)
+                                screenshots.append((img_pil, sample_time, sample_reason))
+                                logging.info(f"Added screenshot at {sample_time:.2f}s - {sample_reason}")
+                            except Exception as img_err:
+                                logging.exception(f"Error converting frame to image: {img_err}")
                 # Sort screenshots by timestamp
                 screenshots.sort(key=lambda x: x[1])
                 
@@ -1539,6 +1536,24 @@ class ScreenshotExtractor:
         # Always use the comprehensive window-based processing method
         # to ensure we capture the best frames at each timestamp
         # For each key timestamp, process frames in a small window around it
+        window_size = 10  # frames to check on each side
+        
+        # Only the frames the loop below reads are decoded: the exact frame of a scene
+        # change, and for other timestamps the window minus frames that were already
+        # processed (plus the center frame as a fallback). They are decoded in one
+        # forward pass and consumed in frame order, so one frame is held at a time.
+        requested_frames = set()
+        for timestamp, reason in self.key_timestamps:
+            center_frame_number = int(timestamp * fps)
+            requested_frames.add(center_frame_number)
+            if "Scene change" not in reason:
+                requested_frames.update(
+                    frame_number
+                    for frame_number in range(center_frame_number - window_size, center_frame_number + window_size + 1)
+                    if frame_number not in self.processed_timestamps
+                )
+        frame_cursor = OrderedFrameCursor(FrameBatchFetcher(video_processor).iter_frames(requested_frames))
+        
         for i, (timestamp, reason) in enumerate(self.key_timestamps):
             if progress_callback:
                 progress_callback(0.5 + (i / len(self.key_timestamps)) * 0.5, 
@@ -1550,7 +1565,7 @@ class ScreenshotExtractor:
             # Special handling for scene changes - use exact frame for scene changes
             if "Scene change" in reason:
                 logging.info(f"Processing scene change at {timestamp:.2f}s")
-                frame = video_processor.get_frame_at_position(center_frame_number)
+                frame = frame_cursor.get(center_frame_number)
                 if frame is not None:
                     img_pil = Image.fromarray(frame)
                     screenshots.append((img_pil, timestamp, reason))
@@ -1558,23 +1573,24 @@ class ScreenshotExtractor:
                     self.processed_timestamps.add(center_frame_number)
                 continue  # Skip normal processing for scene changes
             
-            # Special handling for AI detection - capture exact frame
-            elif "AI Detected" in reason:
+            # For AI detections, always capture the exact frame to ensure we have it,
+            # but still continue normal processing to find the best frame. Frames are
+            # read in order, so the exact frame is taken when the window walk reaches
+            # it (or after a walk that stopped early) and is not run through key
+            # frame detection.
+            ai_detection = "AI Detected" in reason
+            if ai_detection:
                 logging.info(f"Processing AI detection at {timestamp:.2f}s")
-                # For AI detections, always capture the exact frame to ensure we have it
-                frame = video_processor.get_frame_at_position(center_frame_number)
-                if frame is not None:
-                    img_pil = Image.fromarray(frame)
-                    # Add to screenshots but still continue normal processing to find the best frame
-                    ai_screenshots = (img_pil, timestamp, reason)
-                    screenshots.append(ai_screenshots)
-                    # Mark as processed
-                    self.processed_timestamps.add(center_frame_number)
+                ai_screenshot_index = len(screenshots)
+                skip_center = True
+            else:
+                skip_center = center_frame_number in self.processed_timestamps
+            center_read = False
                 
             # Process a small window around the timestamp to find the best frame
-            window_size = 10  # frames to check on each side
             best_frame = None
             best_reason = reason
+            center_frame = None
             
             # Reset frame buffer
             self.frame_buffer = []
@@ -1587,16 +1603,22 @@ class ScreenshotExtractor:
                 # Skip if out of range
                 if frame_number < 0 or frame_number >= frame_count:
                     continue
+                
+                if offset == 0:
+                    center_frame = frame_cursor.get(frame_number)
+                    center_read = True
+                    if skip_center:
+                        continue
                     
                 # Skip if we've already processed this frame number
-                if frame_number in self.processed_timestamps:
+                elif frame_number in self.processed_timestamps:
                     continue
                     
                 # Mark as processed
                 self.processed_timestamps.add(frame_number)
                 
                 # Get the frame
-                frame = video_processor.get_frame_at_position(frame_number)
+                frame = center_frame if offset == 0 else frame_cursor.get(frame_number)
                 if frame is None:
                     continue
                     
@@ -1610,12 +1632,19 @@ class ScreenshotExtractor:
                     best_frame = frame
                     best_reason = frame_reason
                     break
-                
+            
+            if ai_detection:
+                if not center_read:
+                    center_frame = frame_cursor.get(center_frame_number)
+                if center_frame is not None:
+                    screenshots.insert(ai_screenshot_index, (Image.fromarray(center_frame), timestamp, reason))
+                    # Mark as processed
+                    self.processed_timestamps.add(center_frame_number)
+            
             # If no key frame was found in the window, use the center frame
+            # (the walk went through the whole window, so it has been read)
             if best_frame is None:
-                frame = video_processor.get_frame_at_position(center_frame_number)
-                if frame is not None:
-                    best_frame = frame
+                best_frame = center_frame
             
             # Add the screenshot if we found a good frame
             if best_frame is not None:
@@ -1645,8 +1674,5 @@ class ScreenshotExtractor:
 
     def __del__(self):
         """Clean up temporary files."""
-        if self.temp_audio_file and os.path.exists(self.temp_audio_file):
-            try:
-                os.unlink(self.temp_audio_file)
-            except:
-                pass
+        if getattr(self, 'audio_track', None) is not None:
+            self.audio_track.close()
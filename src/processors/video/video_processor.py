@@ -1,4 +1,7 @@
 import cv2
+import logging
+import subprocess
+import tempfile
 import numpy as np
 
 class VideoProcessor:
@@ -22,6 +25,9 @@ class VideoProcessor:
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.duration = self.frame_count / self.fps if self.fps > 0 else 0
         
+        # Frame number the capture will decode next (lets forward reads skip seeking)
+        self.next_frame_position = 0
+        
     def __del__(self):
         """Release the video capture when the object is destroyed."""
         if hasattr(self, 'cap') and self.cap is not None:
@@ -36,11 +42,13 @@ class VideoProcessor:
         """
         self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Reset to beginning
         frame_number = 0
+        self.next_frame_position = 0
         
         while True:
             ret, frame = self.cap.read()
             if not ret:
                 break
+            self.next_frame_position += 1
                 
             # Convert BGR to RGB (Streamlit/PIL uses RGB)
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -62,6 +70,7 @@ class VideoProcessor:
             
         self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
         ret, frame = self.cap.read()
+        self.next_frame_position = frame_number + 1
         
         if not ret:
             return None
@@ -69,3 +78,286 @@ class VideoProcessor:
         # Convert BGR to RGB
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         return frame_rgb
+
+    def sample_frames(self, step=1, start_frame=0, end_frame=None, frame_numbers=None, max_skip=0):
+        """
+        Generator that decodes the video forward once and yields only the sampled frames.
+        
+        Frames between samples are skipped with grab() and only sampled frames are
+        retrieve()d and converted, so a sparse scan costs one linear decode instead
+        of a keyframe seek per sample. At most the first sample is reached with a seek.
+        
+        Args:
+            step (int): Sample every step-th frame between start_frame and end_frame.
+            start_frame (int): First frame to sample.
+            end_frame (int): Frame number to stop before (defaults to the frame count).
+            frame_numbers (iterable): Explicit frame numbers to sample instead of a fixed
+                step. They are sorted and de-duplicated; out-of-range numbers are ignored.
+            max_skip (int): If the capture is already positioned at most this many frames
+                before the first sample, decode forward to it instead of seeking.
+                
+        Yields:
+            tuple: (frame number, timestamp in seconds, frame as RGB numpy array)
+        """
+        targets = self._sample_targets(step, start_frame, end_frame, frame_numbers)
+        for frame_number, timestamp, frame in self._decode_targets(targets, max_skip):
+            yield frame_number, timestamp, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    
+    def detection_size(self, height=360):
+        """
+        Size of the downscaled frames used for detection-only passes.
+        
+        Args:
+            height (int): Target height in pixels; videos that are already smaller keep their size.
+            
+        Returns:
+            tuple: (width, height) with an even width, preserving the aspect ratio.
+        """
+        if not height or self.height <= height or self.height <= 0:
+            return self.width, self.height
+        width = int(round(self.width * height / self.height / 2)) * 2
+        return max(2, width), height
+    
+    def sample_detection_frames(self, step=1, start_frame=0, end_frame=None, height=360, use_ffmpeg=False):
+        """
+        Generator like sample_frames, but yielding small grayscale frames for detection-only passes.
+        
+        The BGR frame is converted straight to grayscale and downscaled, so no full-size
+        RGB array is allocated for frames that are only compared and then discarded.
+        With use_ffmpeg, ffmpeg's scale filter does the downscaling at decode time and
+        OpenCV is used as a fallback if ffmpeg cannot be started.
+        
+        Args:
+            step (int): Sample every step-th frame between start_frame and end_frame.
+            start_frame (int): First frame to sample.
+            end_frame (int): Frame number to stop before (defaults to the frame count).
+            height (int): Height of the detection frames (see detection_size).
+            use_ffmpeg (bool): Decode and scale with an ffmpeg subprocess.
+            
+        Yields:
+            tuple: (frame number, timestamp in seconds, grayscale uint8 numpy array)
+        """
+        targets = self._sample_targets(step, start_frame, end_frame)
+        if len(targets) == 0:
+            return
+        
+        size = self.detection_size(height)
+        
+        if use_ffmpeg:
+            # stderr goes to a file so a chatty ffmpeg cannot block on a full pipe
+            with tempfile.TemporaryFile() as ffmpeg_log:
+                ffmpeg_process = self._open_ffmpeg_detection_stream(targets, size, ffmpeg_log)
+                frames_read = 0
+                if ffmpeg_process is not None:
+                    frames_read = yield from self._read_ffmpeg_detection_stream(ffmpeg_process, targets, size,
+                                                                                ffmpeg_log)
+            # Decode whatever ffmpeg did not deliver with OpenCV
+            targets = targets[frames_read:]
+            if len(targets) == 0:
+                return
+        
+        for frame_number, timestamp, frame in self._decode_targets(targets):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if (gray.shape[1], gray.shape[0]) != size:
+                gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+            yield frame_number, timestamp, gray
+    
+    def _sample_targets(self, step=1, start_frame=0, end_frame=None, frame_numbers=None):
+        """Sorted, in-range frame numbers for a fixed-step scan or an explicit list."""
+        if end_frame is None or end_frame > self.frame_count:
+            end_frame = self.frame_count
+        
+        if frame_numbers is None:
+            return range(max(0, start_frame), end_frame, max(1, int(step)))
+        return sorted({int(n) for n in frame_numbers if 0 <= n < end_frame})
+    
+    def _decode_targets(self, targets, max_skip=0):
+        """Decode forward through sorted target frames, yielding (frame number, timestamp, BGR frame)."""
+        if len(targets) == 0:
+            return
+        
+        if not (self.next_frame_position <= targets[0] <= self.next_frame_position + max_skip):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, targets[0])
+            self.next_frame_position = targets[0]
+        
+        for target in targets:
+            # Decode (but do not convert) the frames we are not interested in
+            while self.next_frame_position < target:
+                if not self.cap.grab():
+                    return
+                self.next_frame_position += 1
+            
+            if not self.cap.grab():
+                return
+            self.next_frame_position += 1
+            
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            
+            timestamp = target / self.fps if self.fps > 0 else 0.0
+            yield target, timestamp, frame
+    
+    def _open_ffmpeg_detection_stream(self, targets, size, stderr_file):
+        """Start ffmpeg writing the sampled frames as raw scaled grayscale; None if unavailable."""
+        start_frame, step = targets[0], targets.step
+        width, height = size
+        
+        command = ['ffmpeg', '-v', 'error']
+        if start_frame > 0 and self.fps > 0:
+            command += ['-ss', f"{start_frame / self.fps:.6f}"]
+        command += [
+            '-i', self.video_path,
+            '-an',
+            '-vf', f"select='not(mod(n\\,{step}))',scale={width}:{height},format=gray",
+            '-vsync', '0',
+            '-frames:v', str(len(targets)),
+            '-f', 'rawvideo', '-pix_fmt', 'gray', 'pipe:1',
+        ]
+        
+        try:
+            return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.warning(f"FFmpeg detection decode unavailable, using OpenCV: {e}")
+            return None
+    
+    def _read_ffmpeg_detection_stream(self, ffmpeg_process, targets, size, stderr_file):
+        """
+        Yield (frame number, timestamp, grayscale frame) from an ffmpeg raw stream.
+        
+        Returns:
+            int: Number of targets read; fewer than len(targets) if ffmpeg stopped early.
+        """
+        width, height = size
+        frame_bytes = width * height
+        frames_read = 0
+        try:
+            for target in targets:
+                data = ffmpeg_process.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    break
+                
+                timestamp = target / self.fps if self.fps > 0 else 0.0
+                yield target, timestamp, np.frombuffer(data, dtype=np.uint8).reshape(height, width)
+                frames_read += 1
+        finally:
+            ffmpeg_process.stdout.close()
+            if ffmpeg_process.poll() is None:
+                ffmpeg_process.kill()
+            ffmpeg_process.wait()
+        
+        if frames_read < len(targets) and ffmpeg_process.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace').strip()
+            logging.warning(f"FFmpeg detection decode exited with code {ffmpeg_process.returncode} after "
+                            f"{frames_read} of {len(targets)} frames, decoding the rest with OpenCV: {stderr}")
+        return frames_read
+
+
+class FrameBatchFetcher:
+    """
+    Fetches many frames from a VideoProcessor in as few forward decode passes as possible.
+    
+    Requested frame numbers are sorted, de-duplicated and coalesced into ranges. Each
+    range is decoded forward once, and consecutive ranges that are close together are
+    reached by decoding through the gap instead of seeking back to a keyframe.
+    """
+    
+    def __init__(self, video_processor, max_gap=None):
+        """
+        Initialize the fetcher.
+        
+        Args:
+            video_processor (VideoProcessor): Video to read frames from.
+            max_gap (int): Largest gap in frames that is decoded through rather than
+                seeked over (defaults to roughly 4 seconds of video, about one GOP).
+        """
+        self.video_processor = video_processor
+        if max_gap is None:
+            max_gap = int(video_processor.fps * 4) if video_processor.fps > 0 else 120
+        self.max_gap = max(0, max_gap)
+    
+    def coalesce(self, frame_numbers):
+        """
+        Sort requested frame numbers and group them into forward-decodable ranges.
+        
+        Args:
+            frame_numbers (iterable): Requested frame numbers (may be unsorted or repeated).
+            
+        Returns:
+            list: Lists of sorted frame numbers, one list per decode range.
+        """
+        frame_count = self.video_processor.frame_count
+        ordered = sorted({int(n) for n in frame_numbers if 0 <= n < frame_count})
+        
+        ranges = []
+        for frame_number in ordered:
+            if ranges and frame_number - ranges[-1][-1] <= self.max_gap:
+                ranges[-1].append(frame_number)
+            else:
+                ranges.append([frame_number])
+        return ranges
+    
+    def fetch(self, frame_numbers):
+        """
+        Decode all requested frames.
+        
+        Args:
+            frame_numbers (iterable): Requested frame numbers.
+            
+        Returns:
+            dict: Mapping of frame number to RGB frame. Frames that could not be
+                  decoded (or are out of range) are absent.
+        """
+        return dict(self.iter_frames(frame_numbers))
+    
+    def iter_frames(self, frame_numbers):
+        """
+        Decode the requested frames in frame order, one at a time.
+        
+        Args:
+            frame_numbers (iterable): Requested frame numbers.
+            
+        Yields:
+            tuple: (frame_number, RGB frame) in increasing frame order. Frames that could
+                   not be decoded (or are out of range) are skipped.
+        """
+        for frame_range in self.coalesce(frame_numbers):
+            sampled_frames = self.video_processor.sample_frames(frame_numbers=frame_range, max_skip=self.max_gap)
+            for frame_number, _, frame in sampled_frames:
+                yield frame_number, frame
+
+
+class OrderedFrameCursor:
+    """
+    Reads frames from FrameBatchFetcher.iter_frames by frame number, in increasing order.
+    
+    Only the next decoded frame is held, so a caller walking through windows of frames
+    keeps one frame in memory at a time instead of a whole batch.
+    """
+    
+    def __init__(self, frames):
+        """
+        Args:
+            frames (iterator): (frame_number, frame) pairs in increasing frame order.
+        """
+        self._frames = iter(frames)
+        self._pending = None
+    
+    def get(self, frame_number):
+        """
+        Get a frame, dropping every decoded frame before it.
+        
+        Args:
+            frame_number (int): Frame to read; must not be lower than a frame read before.
+            
+        Returns:
+            numpy.ndarray: The RGB frame, or None if it was not requested or not decoded.
+        """
+        while self._pending is None or self._pending[0] < frame_number:
+            self._pending = next(self._frames, None)
+            if self._pending is None:
+                return None
+        if self._pending[0] == frame_number:
+            return self._pending[1]
+        return None
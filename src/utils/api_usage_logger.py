@@ -1,10 +1,21 @@
+import atexit
 import json
+import multiprocessing
+import multiprocessing.util
 import os
 import logging
+import tempfile
+import threading
+import time
 from datetime import datetime
 from typing import Optional
 from .logger_config import setup_usage_logger
-import streamlit as st
+from .usage_ledger import get_usage_ledger
+from .lazy_imports import lazy_import
+
+# Streamlit is only needed to read the session id
+st = lazy_import("streamlit")
+
 # Use existing log configuration - don't create new files
 AGGREGATE_FILE = "token_aggregate.json"
 
@@ -38,6 +49,7 @@ def log_openai_usage(module_name: str, model: str, prompt_tokens: int, completio
     
     # Use existing logger instead of creating new log file
     usage_logger.info(f"OPENAI_USAGE: {json.dumps(entry)}")
+    _record_in_ledger(entry)
     _update_aggregate("openai", module_name, function_name, total_tokens)
 
 def log_whisper_usage(module_name: str, model: str, duration_seconds: float, function_name: str = "", file_size_mb: Optional[float] = None):
@@ -65,8 +77,114 @@ def log_whisper_usage(module_name: str, model: str, duration_seconds: float, fun
     
     # Use existing logger instead of creating new log file
     usage_logger.info(f"WHISPER_USAGE: {json.dumps(entry)}")
+    _record_in_ledger(entry)
     _update_aggregate("whisper", module_name, function_name, duration_minutes)
 
+def _record_in_ledger(entry: dict):
+    """
+    Append a usage entry to the indexed usage ledger.
+    
+    Args:
+        entry: Usage entry as written to usage.log
+    """
+    try:
+        get_usage_ledger().record(entry)
+    except Exception as e:
+        usage_logger.error(f"Error recording usage in ledger: {e}")
+
+class _TokenAggregator:
+    """
+    In-process usage counters by service/module/function.
+    
+    Calls only add to counters in memory; a background thread merges them into
+    the shared aggregate in the usage ledger every flush interval and at process
+    exit. The merge is a single SQLite upsert transaction, so concurrent
+    processes never lose each other's updates.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._pid = None
+        self._seeded = False
+    
+    def add(self, service: str, module_name: str, function_name: str, usage: float):
+        keys = [(service, "total", ""), (service, "by_module", module_name)]
+        if function_name:
+            keys.append((service, "by_function", f"{module_name}.{function_name}"))
+        
+        with self._lock:
+            self._ensure_started()
+            for key in keys:
+                self._pending[key] = self._pending.get(key, 0) + usage
+    
+    def _ensure_started(self):
+        """Start the flush thread once per process"""
+        if self._pid == os.getpid():
+            return
+        
+        # Counters inherited from a forked parent are flushed by the parent
+        self._pending = {}
+        self._pid = os.getpid()
+        
+        flush_seconds = 30
+        try:
+            from .config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            flush_seconds = app_config.get('storage', {}).get('usage_aggregate_flush_seconds', flush_seconds)
+        except Exception as e:
+            usage_logger.warning(f"Could not load usage aggregate settings, using defaults: {e}")
+        
+        threading.Thread(target=self._run, args=(flush_seconds,), daemon=True,
+                         name="usage-aggregate-flush").start()
+        if multiprocessing.parent_process() is not None:
+            # Worker processes skip atexit handlers; multiprocessing runs finalizers instead
+            multiprocessing.util.Finalize(self, self.flush, exitpriority=10)
+    
+    def _run(self, flush_seconds: float):
+        while True:
+            time.sleep(flush_seconds)
+            self.flush()
+    
+    def discard(self):
+        """Drop counters that have not been flushed yet"""
+        with self._lock:
+            self._pending = {}
+    
+    def flush(self, import_legacy: bool = False):
+        """
+        Merge pending counters into the shared aggregate and refresh AGGREGATE_FILE
+        
+        Args:
+            import_legacy: Import token_aggregate.json even if nothing is pending
+        """
+        with self._lock:
+            if self._pid is not None and self._pid != os.getpid():
+                self._pending = {}
+            pending, self._pending = self._pending, {}
+            seeded = self._seeded
+        if not pending and (seeded or not import_legacy):
+            return
+        
+        try:
+            # The first merge imports a token_aggregate.json written before the ledger existed
+            ledger = get_usage_ledger()
+            ledger.merge_aggregate(pending, seed=None if seeded else _read_aggregate_file())
+            self._seeded = True
+            if pending:
+                _write_aggregate_file(ledger.aggregate())
+        except Exception as e:
+            usage_logger.error(f"Error updating token usage aggregate: {e}")
+            # Keep the counters for the next flush
+            with self._lock:
+                for key, usage in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + usage
+
+
+_aggregator = _TokenAggregator()
+atexit.register(_aggregator.flush)
+
 def _update_aggregate(service: str, module_name: str, function_name: str, usage: float):
     """
     Update aggregate usage statistics.
@@ -77,42 +195,31 @@ def _update_aggregate(service: str, module_name: str, function_name: str, usage:
         function_name: Function name
         usage: Usage amount (tokens for OpenAI, minutes for Whisper)
     """
-    try:
-        # Load existing aggregate data
-        if os.path.exists(AGGREGATE_FILE):
-            with open(AGGREGATE_FILE, "r") as f:
-                aggregate = json.load(f)
-        else:
-            aggregate = {
-                "openai": {"total": 0, "by_module": {}, "by_function": {}},
-                "whisper": {"total": 0, "by_module": {}, "by_function": {}}
-            }
-
-        # Ensure service exists in aggregate
-        if service not in aggregate:
-            aggregate[service] = {"total": 0, "by_module": {}, "by_function": {}}
+    _aggregator.add(service, module_name, function_name, usage)
 
-        # Update total usage
-        aggregate[service]["total"] += usage
-        
-        # Update by module
-        if module_name not in aggregate[service]["by_module"]:
-            aggregate[service]["by_module"][module_name] = 0
-        aggregate[service]["by_module"][module_name] += usage
-        
-        # Update by function (if provided)
-        if function_name:
-            function_key = f"{module_name}.{function_name}"
-            if function_key not in aggregate[service]["by_function"]:
-                aggregate[service]["by_function"][function_key] = 0
-            aggregate[service]["by_function"][function_key] += usage
+def _read_aggregate_file():
+    """Load AGGREGATE_FILE, or None if it does not exist or cannot be read."""
+    if not os.path.exists(AGGREGATE_FILE):
+        return None
+    try:
+        with open(AGGREGATE_FILE, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        usage_logger.error(f"Error reading usage aggregate file: {e}")
+        return None
 
-        # Save updated aggregate
-        with open(AGGREGATE_FILE, "w") as f:
+def _write_aggregate_file(aggregate: dict):
+    """Write a snapshot of the aggregate to AGGREGATE_FILE (write-then-rename)."""
+    directory = os.path.dirname(os.path.abspath(AGGREGATE_FILE))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
             json.dump(aggregate, f, indent=2)
-            
-    except Exception as e:
-        usage_logger.error(f"Error updating token usage aggregate: {e}")
+        os.replace(temp_path, AGGREGATE_FILE)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
 def get_usage_summary():
     """
@@ -121,15 +228,12 @@ def get_usage_summary():
     Returns:
         dict: Usage summary data
     """
-    if not os.path.exists(AGGREGATE_FILE):
-        return {"openai": {"total": 0}, "whisper": {"total": 0}}
-    
+    _aggregator.flush(import_legacy=True)
     try:
-        with open(AGGREGATE_FILE, "r") as f:
-            return json.load(f)
+        return get_usage_ledger().aggregate()
     except Exception as e:
         usage_logger.error(f"Error reading usage summary: {e}")
-        return {"openai": {"total": 0}, "whisper": {"total": 0}}
+        return _read_aggregate_file() or {"openai": {"total": 0}, "whisper": {"total": 0}}
 
 def print_usage_report():
     """Print a formatted usage report."""
@@ -267,10 +371,11 @@ def rebuild_aggregate_from_app_log(log_file_path: str = "app.log"):
                 aggregate[service]["by_function"][function_key] = 0
             aggregate[service]["by_function"][function_key] += usage
     
-    # Save rebuilt aggregate
+    # Save rebuilt aggregate (counters not flushed yet are already in the log)
     try:
-        with open(AGGREGATE_FILE, "w") as f:
-            json.dump(aggregate, f, indent=2)
+        _aggregator.discard()
+        get_usage_ledger().replace_aggregate(aggregate)
+        _write_aggregate_file(aggregate)
         usage_logger.info(f"Rebuilt aggregate with {len(entries)} entries")
         usage_logger.info(f"OpenAI total: {aggregate['openai']['total']} tokens")
         usage_logger.info(f"Whisper total: {aggregate['whisper']['total']:.2f} minutes")
@@ -279,6 +384,11 @@ def rebuild_aggregate_from_app_log(log_file_path: str = "app.log"):
 
 def reset_usage_logs():
     """Reset aggregate data (but keep app.log intact)."""
+    _aggregator.discard()
+    try:
+        get_usage_ledger().replace_aggregate({})
+    except Exception as e:
+        usage_logger.error(f"Error resetting usage aggregate: {e}")
     if os.path.exists(AGGREGATE_FILE):
         os.remove(AGGREGATE_FILE)
         usage_logger.info("Token usage aggregate has been reset.")
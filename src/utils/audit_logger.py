@@ -2,12 +2,20 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 import os
-import pandas as pd
 from dotenv import load_dotenv
-import streamlit as st
+from .csv_log_writer import AppendOnlyCSVWriter
+from .lazy_imports import lazy_import
 
 load_dotenv()
 
+# Streamlit is only needed to read the request headers
+st = lazy_import("streamlit")
+
+AUDIT_LOG_COLUMNS = [
+    "username", "email", "client_name", "login_time", "tool_name",
+    "file_name", "file_size", "file_type", "record_count"
+]
+
 @dataclass
 class LoggerConfig:
     username: Optional[str] = None
@@ -46,6 +54,7 @@ class Logger:
             csv_filename = os.getenv("BLOB_NAME") or "audit_log.csv"
             self.CSV_FILE_PATH = os.path.join(self.LOCAL_STORAGE_DIR, csv_filename)
         os.makedirs(self.LOCAL_STORAGE_DIR, exist_ok=True)
+        self.writer = AppendOnlyCSVWriter(self.CSV_FILE_PATH, AUDIT_LOG_COLUMNS)
         print("Container_Name", os.getenv("CONTAINER_NAME"))
 
     def get_user_info(self):
@@ -64,41 +73,23 @@ class Logger:
         }            
 
     def load_csv_from_local(self):
-        """Load CSV from local file, create empty dataframe if not exists or unreadable."""
-        if os.path.exists(self.CSV_FILE_PATH):
-            try:
-                return pd.read_csv(self.CSV_FILE_PATH)
-            except Exception:
-                pass
-        return pd.DataFrame({
-            "username": pd.Series(dtype="str"),
-            "email": pd.Series(dtype="str"),
-            "client_name": pd.Series(dtype="str"),
-            "login_time": pd.Series(dtype="str"),
-            "tool_name": pd.Series(dtype="str"),
-            "file_name": pd.Series(dtype="str"),
-            "file_size": pd.Series(dtype="str"),
-            "file_type": pd.Series(dtype="str"),
-            "record_count": pd.Series(dtype="str"),
-        })
+        """Load the audit log (including rotated files) as a dataframe for reporting."""
+        return self.writer.read_dataframe()
     
-    def add_row(self, dataframe):
-        row_dataframe = pd.DataFrame({
-            "username": [self.config.username],
-            "email": [self.config.email],
-            "client_name": [self.config.client_name],
-            "login_time": [self.config.log_in_time],
-            "tool_name": [self.config.tool_name],
-            "file_name": [self.config.file_name],
-            "file_size": [self.config.file_size],
-            "file_type": [self.config.file_type],
-            "record_count": [self.config.record_count]
-        })
-        return pd.concat([dataframe, row_dataframe])
-        
-    def save_csv_to_local(self, dataframe):
+    def add_row(self):
+        """Append the current entry as a single CSV line."""
         try:
-            dataframe.to_csv(self.CSV_FILE_PATH, index=False)
+            self.writer.append({
+                "username": self.config.username,
+                "email": self.config.email,
+                "client_name": self.config.client_name,
+                "login_time": self.config.log_in_time,
+                "tool_name": self.config.tool_name,
+                "file_name": self.config.file_name,
+                "file_size": self.config.file_size,
+                "file_type": self.config.file_type,
+                "record_count": self.config.record_count
+            })
             print("Saved Successfully to local storage")
         except Exception as e:
             print(f"Error saving audit log locally: {e}")
@@ -126,14 +117,8 @@ class Logger:
         self.config.record_count = kwargs.get("record_count")
         self.config.file_type = kwargs.get("file_type")
 
-        # Loading CSV locally
-        dataframe = self.load_csv_from_local()
-
-        # Add row to dataframe and get updated dataframe
-        dataframe = self.add_row(dataframe)
-
-        # Save CSV locally
-        self.save_csv_to_local(dataframe)
+        # Append the row to the local CSV
+        self.add_row()
 
     def usage_log(self, **kwargs):
         """
@@ -158,11 +143,5 @@ class Logger:
         self.config.record_count = kwargs.get("record_count")
         self.config.file_type = kwargs.get("file_type")
 
-        # Loading CSV locally
-        dataframe = self.load_csv_from_local()
-
-        # Add row to dataframe and get updated dataframe
-        dataframe = self.add_row(dataframe)
-
-        # Save CSV locally
-        self.save_csv_to_local(dataframe)
\ No newline at end of file
+        # Append the row to the local CSV
+        self.add_row()
\ No newline at end of file
@@ -2,12 +2,22 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 import os
-import pandas as pd
 from dotenv import load_dotenv
-import streamlit as st
+from .csv_log_writer import AppendOnlyCSVWriter
+from .lazy_imports import lazy_import
 
 load_dotenv()
 
+# Streamlit is only needed to read the request headers
+st = lazy_import("streamlit")
+
+USAGE_COST_LOG_COLUMNS = [
+    "username", "time", "guid", "document_type", "client_name",
+    "file_name", "file_size", "video_duration", "screenshot_processing",
+    "document_generation", "prompt_tokens", "completion_tokens",
+    "total_tokens", "open_ai_cost", "azure_whisper_cost", "total_cost"
+]
+
 @dataclass
 class CostLoggerConfig:
     username: Optional[str] = None
@@ -56,6 +66,7 @@ class UsageCostLogger:
         
         # Create local storage directory if it doesn't exist
         os.makedirs(self.LOCAL_STORAGE_DIR, exist_ok=True)
+        self.writer = AppendOnlyCSVWriter(self.CSV_FILE_PATH, USAGE_COST_LOG_COLUMNS)
 
     def get_user_info(self):
         headers = st.context.headers
@@ -64,55 +75,30 @@ class UsageCostLogger:
         return {"name": user_name, "email": user_email}
 
     def load_csv_from_local(self):
-        """Load CSV from local file, create if it doesn't exist"""
-        if os.path.exists(self.CSV_FILE_PATH):
-            try:
-                return pd.read_csv(self.CSV_FILE_PATH)
-            except Exception as e:
-                print(f"Error reading CSV file: {e}")
-                # Return empty dataframe with correct columns
-                return self._create_empty_dataframe()
-        else:
-            # Create empty dataframe with headers
-            return self._create_empty_dataframe()
-    
-    def _create_empty_dataframe(self):
-        """Create an empty dataframe with the correct column structure"""
-        return pd.DataFrame(columns=[
-            "username", "time", "guid", "document_type", "client_name",
-            "file_name", "file_size", "video_duration", "screenshot_processing",
-            "document_generation", "prompt_tokens", "completion_tokens",
-            "total_tokens", "open_ai_cost", "azure_whisper_cost", "total_cost"
-        ])
-
-    def add_row(self, dataframe):
-        row = pd.DataFrame({
-            "username": [self.config.username],
-            "time": [self.config.time],
-            "guid": [self.config.guid],
-            "document_type": [self.config.document_type],
-            "client_name": [self.config.client_name],
-            "file_name": [self.config.file_name],
-            "file_size": [self.config.file_size],
-            "video_duration": [self.config.video_duration],
-            "screenshot_processing": [self.config.screenshot_processing],
-            "document_generation": [self.config.document_generation],
-            "prompt_tokens": [self.config.prompt_tokens],
-            "completion_tokens": [self.config.completion_tokens],
-            "total_tokens": [self.config.total_tokens],
-            "open_ai_cost": [self.config.open_ai_cost],
-            "azure_whisper_cost": [self.config.azure_whisper_cost],
-            "total_cost": [self.config.total_cost],
-        })
-        # Suppress FutureWarning for empty DataFrames
-        if len(dataframe) == 0:
-            return row
-        return pd.concat([dataframe, row], ignore_index=True)
+        """Load the usage cost log (including rotated files) as a dataframe for reporting"""
+        return self.writer.read_dataframe()
 
-    def save_csv_to_local(self, dataframe):
-        """Save CSV to local file"""
+    def add_row(self):
+        """Append the current entry as a single CSV line"""
         try:
-            dataframe.to_csv(self.CSV_FILE_PATH, index=False)
+            self.writer.append({
+                "username": self.config.username,
+                "time": self.config.time,
+                "guid": self.config.guid,
+                "document_type": self.config.document_type,
+                "client_name": self.config.client_name,
+                "file_name": self.config.file_name,
+                "file_size": self.config.file_size,
+                "video_duration": self.config.video_duration,
+                "screenshot_processing": self.config.screenshot_processing,
+                "document_generation": self.config.document_generation,
+                "prompt_tokens": self.config.prompt_tokens,
+                "completion_tokens": self.config.completion_tokens,
+                "total_tokens": self.config.total_tokens,
+                "open_ai_cost": self.config.open_ai_cost,
+                "azure_whisper_cost": self.config.azure_whisper_cost,
+                "total_cost": self.config.total_cost,
+            })
             print("Saved Successfully to local storage")
         except Exception as e:
             print(f"Error saving to local file: {e}")
@@ -138,6 +124,4 @@ class UsageCostLogger:
         self.config.azure_whisper_cost = kwargs.get("azure_whisper_cost")
         self.config.total_cost = kwargs.get("total_cost")
 
-        df = self.load_csv_from_local()
-        df = self.add_row(df)
-        self.save_csv_to_local(df)
+        self.add_row()
@@ -0,0 +1,204 @@
+"""
+CSV Log Writer Module
+
+Append-only writer for the audit and usage cost CSV logs. Each entry appends a
+single line under a cross-process file lock instead of reading and rewriting the
+whole file. A background thread rotates files that grow past the configured size,
+and pandas is only imported when a log is read for reporting.
+"""
+
+import csv
+import glob
+import io
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Default rotation settings (storage.csv_logs in app_config.yaml)
+DEFAULT_ROTATE_MB = 50
+DEFAULT_MAINTENANCE_INTERVAL_SECONDS = 3600
+
+
+class _FileLock:
+    """Exclusive lock on <path>.lock, shared by all processes writing the log"""
+
+    def __init__(self, path: str):
+        self.lock_path = f"{path}.lock"
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.lock_path, 'a+')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about 10 seconds
+                    continue
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class AppendOnlyCSVWriter:
+    """
+    Appends rows to a CSV log one line at a time.
+
+    The header is written when the file is created. Rows of an existing file are
+    written in the order of that file's header, so logs created with an older
+    column set stay readable. Files larger than rotate_mb are renamed to
+    <name>.<timestamp>.csv by a background maintenance thread; read_dataframe()
+    reads rotated files and the current file together.
+    """
+
+    def __init__(self, path: str, columns: List[str], rotate_mb: float = None,
+                 maintenance_interval: float = None):
+        """
+        Initialize the writer
+
+        Args:
+            path: CSV file path
+            columns: Column names of new files
+            rotate_mb: Size above which the file is rotated (0 disables rotation)
+            maintenance_interval: Seconds between rotation checks
+        """
+        csv_log_config = {}
+        try:
+            from .config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            csv_log_config = app_config.get('storage', {}).get('csv_logs', {}) or {}
+        except Exception as e:
+            logging.warning(f"Could not load CSV log settings, using defaults: {e}")
+
+        self.path = path
+        self.columns = list(columns)
+        if rotate_mb is None:
+            rotate_mb = csv_log_config.get('rotate_mb', DEFAULT_ROTATE_MB)
+        self.rotate_bytes = int(rotate_mb * 1024 * 1024)
+        self.maintenance_interval = maintenance_interval or csv_log_config.get(
+            'maintenance_interval_seconds', DEFAULT_MAINTENANCE_INTERVAL_SECONDS)
+        self._lock = threading.Lock()
+        self._maintenance_pid = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, row: Dict[str, Any]):
+        """
+        Append one row
+
+        Args:
+            row: Values by column name (missing columns are left empty)
+        """
+        self._start_maintenance()
+        with self._lock, _FileLock(self.path):
+            with open(self.path, 'a+', newline='', encoding='utf-8') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    header = self.columns
+                    prefix = self._format_line(header)
+                else:
+                    f.seek(0)
+                    header = next(csv.reader([f.readline()]), None) or self.columns
+                    # Finish a line left incomplete by an interrupted writer
+                    f.seek(size - 1)
+                    prefix = '' if f.read(1) in ('\n', '\r') else '\r\n'
+                f.write(prefix + self._format_line([row.get(column) for column in header]))
+                f.flush()
+
+    @staticmethod
+    def _format_line(values: List[Any]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(['' if value is None else value for value in values])
+        return buffer.getvalue()
+
+    def _start_maintenance(self):
+        """Start the rotation thread once per process"""
+        if self.rotate_bytes <= 0 or self._maintenance_pid == os.getpid():
+            return
+        with self._lock:
+            if self._maintenance_pid == os.getpid():
+                return
+            self._maintenance_pid = os.getpid()
+            threading.Thread(target=self._run_maintenance, daemon=True,
+                             name=f"csv-log-maintenance-{os.path.basename(self.path)}").start()
+
+    def _run_maintenance(self):
+        while True:
+            try:
+                self.rotate_if_needed()
+            except Exception as e:
+                logging.warning(f"CSV log maintenance failed for {self.path}: {e}")
+            time.sleep(self.maintenance_interval)
+
+    def rotate_if_needed(self) -> Optional[str]:
+        """
+        Rotate the file if it is larger than rotate_mb
+
+        Returns:
+            Path of the rotated file, or None if nothing was rotated
+        """
+        if self.rotate_bytes <= 0:
+            return None
+        with self._lock, _FileLock(self.path):
+            try:
+                if os.path.getsize(self.path) <= self.rotate_bytes:
+                    return None
+            except FileNotFoundError:
+                return None
+            stem, ext = os.path.splitext(self.path)
+            rotated_path = f"{stem}.{datetime.now().strftime('%Y%m%d-%H%M%S')}{ext}"
+            os.replace(self.path, rotated_path)
+        logging.info(f"Rotated {self.path} to {rotated_path}")
+        return rotated_path
+
+    def files(self) -> List[str]:
+        """Rotated files (oldest first) followed by the current file"""
+        stem, ext = os.path.splitext(self.path)
+        paths = sorted(glob.glob(f"{glob.escape(stem)}.*{ext}"))
+        if os.path.exists(self.path):
+            paths.append(self.path)
+        return paths
+
+    def read_dataframe(self):
+        """
+        Read all rows for reporting (imports pandas on first use)
+
+        Returns:
+            pandas DataFrame with the rows of the rotated files and the current file
+        """
+        import pandas as pd
+
+        frames = []
+        for path in self.files():
+            try:
+                frames.append(pd.read_csv(path))
+            except Exception as e:
+                logging.warning(f"Could not read CSV log {path}: {e}")
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,91 @@
+"""
+Lazy Imports Module
+
+Defers loading heavy modules (ML frameworks, document libraries, UI and SDK
+packages) until they are first used, so the API server, the CLI and the
+Streamlit app start without paying for code paths a request may never take.
+
+Usage:
+    cv2 = lazy_import("cv2")            # imported on the first cv2.<attr> access
+    __getattr__ = lazy_attributes(__name__, {"VideoProcessor": ".video.video_processor"})
+"""
+
+import importlib
+import sys
+import threading
+import types
+from typing import Callable, Dict
+
+_lazy_import_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that imports the real module on first attribute access
+    and forwards every attribute lookup to it
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_target']
+        if module is None:
+            with _lazy_import_lock:
+                module = self.__dict__['_lazy_target']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes the stand-in does not have itself
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_target'] is not None else 'not loaded'
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Get a module that is imported on first attribute access
+
+    Args:
+        name: Absolute module name
+
+    Returns:
+        The module itself if it is already imported, otherwise a LazyModule
+        (import errors surface on first use)
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def lazy_attributes(package: str, attributes: Dict[str, str]) -> Callable[[str], object]:
+    """
+    Build a module-level __getattr__ (PEP 562) that imports names from submodules on first access
+
+    Args:
+        package: __name__ of the module defining __getattr__
+        attributes: Attribute name -> submodule (relative to package) that defines it
+
+    Returns:
+        __getattr__ function for the module
+    """
+    def __getattr__(name: str):
+        submodule = attributes.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        # Cache on the module so later lookups skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -1,11 +1,15 @@
-import cv2
 import datetime
+import json
 import os
-from openai import OpenAI
+import subprocess
+from .lazy_imports import lazy_import
 from .openai_config import get_openai_client, USE_AZURE
-import whisper
 from .api_usage_logger import log_openai_usage, log_whisper_usage
 
+# Loaded on first use; the local Whisper model is loaded by whisper_processor
+cv2 = lazy_import("cv2")
+openai = lazy_import("openai")
+
 
 def transcribe_with_whisper(audio_file_path):
     """
@@ -36,7 +40,7 @@ def transcribe_with_whisper(audio_file_path):
     # Fallback: Use OpenAI Whisper API
     try:
         print("Using OpenAI Whisper API for transcription")
-        std_client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""))
+        std_client = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""))
         
         # Get audio duration for logging
         audio_duration = _get_audio_duration(audio_file_path)
@@ -222,6 +226,64 @@ def get_video_info(video_path):
     cap.release()
     return info
 
+def probe_video_metadata(video_path, timeout=15):
+    """
+    Read container metadata with ffprobe. Works on partially written files as long as
+    the container header (e.g. the MP4 moov atom) is already present.
+    
+    Args:
+        video_path (str): Path to the (possibly still growing) video file.
+        timeout (float): Seconds to wait for ffprobe.
+        
+    Returns:
+        dict: Dictionary with fps, frame_count, width, height, duration (seconds),
+        has_video and has_audio, or None if the metadata could not be read yet.
+        
+    Raises:
+        FileNotFoundError: If ffprobe is not installed.
+    """
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-print_format", "json",
+             "-show_format", "-show_streams", video_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return None
+    if result.returncode != 0:
+        return None
+
+    try:
+        probe = json.loads(result.stdout)
+    except ValueError:
+        return None
+
+    streams = probe.get('streams', [])
+    video_stream = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    info = {
+        'fps': 0.0,
+        'frame_count': 0,
+        'width': 0,
+        'height': 0,
+        'duration': float(probe.get('format', {}).get('duration') or 0),
+        'has_video': video_stream is not None,
+        'has_audio': any(s.get('codec_type') == 'audio' for s in streams),
+    }
+    if video_stream is not None:
+        numerator, _, denominator = str(video_stream.get('avg_frame_rate') or '0/1').partition('/')
+        try:
+            info['fps'] = float(numerator) / float(denominator or 1)
+        except (ValueError, ZeroDivisionError):
+            info['fps'] = 0.0
+        info['width'] = int(video_stream.get('width') or 0)
+        info['height'] = int(video_stream.get('height') or 0)
+        info['duration'] = float(video_stream.get('duration') or info['duration'])
+        frame_count = video_stream.get('nb_frames')
+        info['frame_count'] = int(frame_count) if frame_count else int(info['duration'] * info['fps'])
+    return info
+
 def format_timestamp(seconds, for_filename=False):
     """
     Format time in seconds to a readable string.
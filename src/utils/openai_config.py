@@ -5,13 +5,16 @@ This module handles both standard OpenAI and Azure OpenAI authentication
 
 import os
 from typing import Optional
-from openai import OpenAI, AzureOpenAI
 
 from dotenv import load_dotenv
 import os
 import logging
 
 from .logger_config import setup_logger
+from .lazy_imports import lazy_import
+
+# The SDK is loaded when the first client is created
+openai = lazy_import("openai")
 load_dotenv()
 
 setup_logger()
@@ -59,7 +62,7 @@ USE_AZURE = AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY and AZURE_GPT_DEPLOYM
 # Check if API keys are available
 OPENAI_AVAILABLE = (USE_AZURE and AZURE_OPENAI_API_KEY) or (not USE_AZURE and OPENAI_API_KEY)
 
-def get_openai_client() -> Optional[OpenAI | AzureOpenAI]:
+def get_openai_client() -> Optional["openai.OpenAI | openai.AzureOpenAI"]:
     """
     Get the appropriate OpenAI client based on available credentials.
     Will try Azure OpenAI first, then fall back to standard OpenAI.
@@ -71,7 +74,7 @@ def get_openai_client() -> Optional[OpenAI | AzureOpenAI]:
     if USE_AZURE:
         try:
             logging.info(f"Initializing Azure OpenAI client with endpoint: {AZURE_OPENAI_ENDPOINT}")
-            client = AzureOpenAI(
+            client = openai.AzureOpenAI(
                 api_key=AZURE_OPENAI_API_KEY,
                 api_version=AZURE_OPENAI_API_VERSION,
                 azure_endpoint=AZURE_OPENAI_ENDPOINT
@@ -83,7 +86,7 @@ def get_openai_client() -> Optional[OpenAI | AzureOpenAI]:
     # Fall back to standard OpenAI
     if OPENAI_API_KEY:
         try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
+            client = openai.OpenAI(api_key=OPENAI_API_KEY)
             return client
         except Exception as e:
             logging.exception(f"Failed to initialize standard OpenAI client: {e}")
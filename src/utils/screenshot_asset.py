@@ -0,0 +1,223 @@
+"""
+Screenshot Asset Module
+
+Keeps each screenshot frame once and produces its encoded variants (PNG/JPEG at
+a given DPI, thumbnail, ZIP entry) on first use. Variants are memoized on the
+asset, and assets are shared per frame, so the PDF, the DOCX and the screenshot
+ZIP all reuse the same bytes instead of re-encoding the frame each time.
+"""
+
+import concurrent.futures
+import logging
+import threading
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image as PILImage
+
+# Attribute that ties a frame to its asset, so the asset lives exactly as long as
+# the frame (PIL images are unhashable, which rules out a registry keyed by image)
+ASSET_ATTRIBUTE = '_screenshot_asset'
+_asset_lock = threading.Lock()
+
+DEFAULT_THUMBNAIL_SIZE = (320, 180)
+
+
+class ScreenshotAsset:
+    """
+    A screenshot frame with lazily encoded, memoized variants
+    """
+
+    def __init__(self, image: PILImage.Image):
+        """
+        Args:
+            image: Source frame
+        """
+        self.image = image
+        self._variants: Dict[Tuple, bytes] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks cannot be pickled; encoded variants travel with the asset
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Pixel size of the source frame"""
+        return self.image.size
+
+    def _variant(self, key: Tuple, encode) -> bytes:
+        """Return the memoized variant for key, encoding it on first use"""
+        data = self._variants.get(key)
+        if data is None:
+            with self._lock:
+                data = self._variants.get(key)
+                if data is None:
+                    data = encode()
+                    self._variants[key] = data
+        return data
+
+    def png(self, dpi: Optional[int] = None) -> bytes:
+        """
+        PNG encoding of the frame
+
+        Args:
+            dpi: Resolution written to the file header (None keeps the encoder default)
+
+        Returns:
+            PNG bytes
+        """
+        def encode():
+            buffer = BytesIO()
+            if dpi:
+                self.image.save(buffer, format='PNG', dpi=(dpi, dpi))
+            else:
+                self.image.save(buffer, format='PNG')
+            return buffer.getvalue()
+
+        return self._variant(('png', dpi), encode)
+
+    def jpeg(self, quality: int = 85, dpi: Optional[int] = None) -> bytes:
+        """
+        JPEG encoding of the frame
+
+        Args:
+            quality: JPEG quality (1-95)
+            dpi: Resolution written to the file header (None keeps the encoder default)
+
+        Returns:
+            JPEG bytes
+        """
+        def encode():
+            buffer = BytesIO()
+            options = {'format': 'JPEG', 'quality': quality}
+            if dpi:
+                options['dpi'] = (dpi, dpi)
+            self.image.convert('RGB').save(buffer, **options)
+            return buffer.getvalue()
+
+        return self._variant(('jpeg', quality, dpi), encode)
+
+    def thumbnail(self, max_size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE) -> bytes:
+        """
+        PNG thumbnail of the frame that fits within max_size
+
+        Args:
+            max_size: Maximum (width, height) in pixels
+
+        Returns:
+            PNG bytes
+        """
+        def encode():
+            thumb = self.image.copy()
+            thumb.thumbnail(max_size)
+            buffer = BytesIO()
+            thumb.save(buffer, format='PNG')
+            return buffer.getvalue()
+
+        return self._variant(('thumbnail', tuple(max_size)), encode)
+
+    def zip_entry(self, filename_stem: str) -> Tuple[str, bytes]:
+        """
+        ZIP archive entry for the frame
+
+        Args:
+            filename_stem: File name without extension
+
+        Returns:
+            (file name, PNG bytes) tuple for ZipFile.writestr
+        """
+        return f"{filename_stem}.png", self.png()
+
+    def buffer(self, fmt: str = 'png', **options) -> BytesIO:
+        """
+        Encoded variant wrapped in a fresh BytesIO, for APIs that read a file object
+
+        Args:
+            fmt: "png", "jpeg" or "thumbnail"
+            **options: Options of the matching encoder method
+
+        Returns:
+            BytesIO positioned at the start of the data
+        """
+        return BytesIO(getattr(self, fmt)(**options))
+
+
+def get_screenshot_asset(image: Any) -> ScreenshotAsset:
+    """
+    Get the shared asset of a screenshot frame
+
+    Args:
+        image: PIL image or an existing ScreenshotAsset
+
+    Returns:
+        The ScreenshotAsset every consumer of this frame shares
+    """
+    if isinstance(image, ScreenshotAsset):
+        return image
+
+    asset = getattr(image, ASSET_ATTRIBUTE, None)
+    if asset is None:
+        with _asset_lock:
+            asset = getattr(image, ASSET_ATTRIBUTE, None)
+            if asset is None:
+                asset = ScreenshotAsset(image)
+                setattr(image, ASSET_ATTRIBUTE, asset)
+    return asset
+
+
+def open_encoded_screenshot(png_bytes: bytes) -> PILImage.Image:
+    """
+    Open a stored PNG screenshot without decoding it and reuse the bytes as its PNG variant
+
+    Args:
+        png_bytes: PNG produced by ScreenshotAsset.png()
+
+    Returns:
+        Lazily decoded PIL image whose asset already holds png_bytes
+    """
+    image = PILImage.open(BytesIO(png_bytes))
+    get_screenshot_asset(image)._variants[('png', None)] = png_bytes
+    return image
+
+
+def encode_assets(assets: Iterable[ScreenshotAsset], fmt: str = 'png', max_workers: int = None,
+                  **options) -> List[bytes]:
+    """
+    Encode a variant of many assets on a thread pool (PIL releases the GIL while encoding)
+
+    Args:
+        assets: Assets to encode
+        fmt: "png", "jpeg" or "thumbnail"
+        max_workers: Encoder threads (processing.document.encode_workers)
+        **options: Options of the matching encoder method
+
+    Returns:
+        Encoded bytes in the order of assets
+    """
+    assets = list(assets)
+    if not assets:
+        return []
+
+    if max_workers is None:
+        max_workers = 4
+        try:
+            from .config_loader import get_config_loader
+            config_loader = get_config_loader()
+            app_config = config_loader.get_config('app_config.yaml')
+            max_workers = app_config.get('processing', {}).get('document', {}).get('encode_workers', max_workers)
+        except Exception as e:
+            logging.warning(f"Could not load screenshot encoding settings, using defaults: {e}")
+
+    def encode(asset):
+        return getattr(asset, fmt)(**options)
+
+    logging.info(f"Encoding {len(assets)} screenshots as {fmt}")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(assets))) as executor:
+        return list(executor.map(encode, assets))
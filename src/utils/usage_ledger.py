@@ -0,0 +1,432 @@
+"""
+Usage Ledger Module
+
+Append-only SQLite ledger of OpenAI and Whisper usage, indexed by session. The
+API usage logger writes every call here next to usage.log, and per-session
+totals come from running counters kept in memory, so looking up a session's
+token usage no longer means re-reading the whole log. The same database holds
+the usage aggregate by service/module/function, merged with atomic upserts.
+
+Rebuild the ledger from existing logs with:
+    python -m src.utils.usage_ledger rebuild [usage.log ...]
+"""
+
+import glob
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Global singleton instance
+_usage_ledger_instance = None
+_usage_ledger_lock = threading.Lock()
+
+# Sessions whose running counters are kept in memory
+MAX_TRACKED_SESSIONS = 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    service TEXT NOT NULL,
+    session_id TEXT,
+    module TEXT,
+    function TEXT,
+    model TEXT,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    duration_seconds REAL NOT NULL DEFAULT 0,
+    file_size_mb REAL
+);
+CREATE INDEX IF NOT EXISTS idx_usage_session ON usage (session_id, id);
+CREATE TABLE IF NOT EXISTS usage_aggregate (
+    service TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    total NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (service, scope, name)
+);
+"""
+
+_COLUMNS = ("timestamp", "service", "session_id", "module", "function", "model",
+            "prompt_tokens", "completion_tokens", "total_tokens", "duration_seconds", "file_size_mb")
+
+_TOTALS_COLUMNS = ("prompt_tokens", "completion_tokens", "total_tokens", "duration_seconds")
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "duration_seconds": 0.0, "calls": 0}
+
+
+def _add_row(totals: Dict[str, Any], row) -> None:
+    """Add one (prompt, completion, total, duration_seconds) row to running totals"""
+    totals["prompt_tokens"] += row[0] or 0
+    totals["completion_tokens"] += row[1] or 0
+    totals["total_tokens"] += row[2] or 0
+    totals["duration_seconds"] += row[3] or 0.0
+    totals["calls"] += 1
+
+
+class UsageLedger:
+    """
+    SQLite usage ledger with in-memory per-session running counters.
+
+    Counters are seeded from the ledger the first time a session is seen in this
+    process and then updated on every write. Rows written for the session by
+    other processes (e.g. a job worker and the API server) are picked up through
+    the (session_id, id) index, reading only rows newer than the last one counted.
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the ledger
+
+        Args:
+            db_path: SQLite database file (defaults to storage.usage_ledger_file
+                     from app_config.yaml)
+        """
+        if db_path is None:
+            db_path = "data/usage_ledger.db"
+            try:
+                from .config_loader import get_config_loader
+                config_loader = get_config_loader()
+                app_config = config_loader.get_config('app_config.yaml')
+                db_path = app_config.get('storage', {}).get('usage_ledger_file', db_path)
+            except Exception as e:
+                logging.warning(f"Could not load usage ledger settings, using defaults: {e}")
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        # session_id -> {"totals", "last_id", "own_ids"}
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use (and again in forked worker processes)"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            self._sessions.clear()
+        return self._conn
+
+    @staticmethod
+    def _row_values(entry: Dict[str, Any]) -> tuple:
+        return (
+            entry.get("timestamp"),
+            entry.get("service", "openai"),
+            entry.get("session_id"),
+            entry.get("module"),
+            entry.get("function"),
+            entry.get("model"),
+            int(entry.get("prompt_tokens") or 0),
+            int(entry.get("completion_tokens") or 0),
+            int(entry.get("total_tokens") or 0),
+            float(entry.get("duration_seconds") or 0),
+            entry.get("file_size_mb"),
+        )
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """
+        Append a usage entry and update its session's running counters
+
+        Args:
+            entry: Usage entry as written to usage.log (service, session_id, module,
+                   function, model, token counts or duration_seconds)
+        """
+        values = self._row_values(entry)
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                f"INSERT INTO usage ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                values
+            )
+            session_id = values[2]
+            if session_id is None:
+                return
+
+            tracked = self._sessions.get(session_id)
+            if tracked is None:
+                # Seeding reads the row just written, so it is already counted
+                self._track(conn, session_id)
+            else:
+                _add_row(tracked["totals"], values[6:10])
+                tracked["own_ids"].add(cursor.lastrowid)
+                self._sessions.move_to_end(session_id)
+
+    def _track(self, conn: sqlite3.Connection, session_id: str) -> Dict[str, Any]:
+        """Start running counters for a session from the rows already in the ledger"""
+        totals = _empty_totals()
+        last_id = 0
+        for row in conn.execute(
+            f"SELECT id, {', '.join(_TOTALS_COLUMNS)} FROM usage WHERE session_id = ?", (session_id,)
+        ):
+            _add_row(totals, row[1:])
+            last_id = max(last_id, row[0])
+
+        tracked = {"totals": totals, "last_id": last_id, "own_ids": set()}
+        self._sessions[session_id] = tracked
+        while len(self._sessions) > MAX_TRACKED_SESSIONS:
+            self._sessions.popitem(last=False)
+        return tracked
+
+    def session_totals(self, session_id: str) -> Dict[str, Any]:
+        """
+        Usage totals of one session
+
+        Args:
+            session_id: Session GUID
+
+        Returns:
+            Dictionary with prompt_tokens, completion_tokens, total_tokens,
+            duration_seconds (Whisper) and calls
+        """
+        with self._lock:
+            conn = self._connection()
+            tracked = self._sessions.get(session_id)
+            if tracked is None:
+                tracked = self._track(conn, session_id)
+            else:
+                # Catch up with rows other processes wrote since the last lookup
+                for row in conn.execute(
+                    f"SELECT id, {', '.join(_TOTALS_COLUMNS)} FROM usage WHERE session_id = ? AND id > ?",
+                    (session_id, tracked["last_id"])
+                ):
+                    if row[0] not in tracked["own_ids"]:
+                        _add_row(tracked["totals"], row[1:])
+                    tracked["last_id"] = max(tracked["last_id"], row[0])
+                tracked["own_ids"] = {row_id for row_id in tracked["own_ids"] if row_id > tracked["last_id"]}
+                self._sessions.move_to_end(session_id)
+            return dict(tracked["totals"])
+
+    def totals(self, service: str = "openai") -> Dict[str, Any]:
+        """
+        Usage totals of all sessions for one service
+
+        Args:
+            service: "openai" or "whisper"
+
+        Returns:
+            Dictionary with the same keys as session_totals
+        """
+        with self._lock:
+            row = self._connection().execute(
+                f"SELECT {', '.join(f'COALESCE(SUM({column}), 0)' for column in _TOTALS_COLUMNS)}, COUNT(*) "
+                "FROM usage WHERE service = ?",
+                (service,)
+            ).fetchone()
+        return {
+            "prompt_tokens": row[0],
+            "completion_tokens": row[1],
+            "total_tokens": row[2],
+            "duration_seconds": row[3],
+            "calls": row[4]
+        }
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the ledger contents with the given entries
+
+        Args:
+            entries: Usage entries in log order
+
+        Returns:
+            Number of entries written
+        """
+        rows = [self._row_values(entry) for entry in entries if entry.get("service") in ("openai", "whisper")]
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM usage")
+                conn.executemany(
+                    f"INSERT INTO usage ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    rows
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._sessions.clear()
+        return len(rows)
+
+
+    def merge_aggregate(self, deltas: Dict[Tuple[str, str, str], float],
+                        seed: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add usage deltas to the aggregate in one transaction
+
+        Args:
+            deltas: Usage keyed by (service, scope, name); scope is "total" (name ""),
+                    "by_module" or "by_function"
+            seed: Aggregate in token_aggregate.json format imported first if the
+                  aggregate is still empty
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if seed and conn.execute("SELECT 1 FROM usage_aggregate LIMIT 1").fetchone() is None:
+                    self._insert_aggregate(conn, aggregate_rows(seed))
+                conn.executemany(
+                    "INSERT INTO usage_aggregate (service, scope, name, total) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (service, scope, name) DO UPDATE SET total = total + excluded.total",
+                    [(service, scope, name, usage) for (service, scope, name), usage in deltas.items()]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def replace_aggregate(self, aggregate: Dict[str, Any]) -> None:
+        """
+        Replace the aggregate contents
+
+        Args:
+            aggregate: Aggregate in token_aggregate.json format
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM usage_aggregate")
+                self._insert_aggregate(conn, aggregate_rows(aggregate))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _insert_aggregate(conn: sqlite3.Connection, rows: List[Tuple[str, str, str, float]]) -> None:
+        conn.executemany("INSERT INTO usage_aggregate (service, scope, name, total) VALUES (?, ?, ?, ?)", rows)
+
+    def aggregate(self) -> Dict[str, Any]:
+        """
+        Usage aggregate by service, module and function
+
+        Returns:
+            Dictionary in token_aggregate.json format
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT service, scope, name, total FROM usage_aggregate ORDER BY rowid"
+            ).fetchall()
+
+        aggregate = {
+            "openai": {"total": 0, "by_module": {}, "by_function": {}},
+            "whisper": {"total": 0, "by_module": {}, "by_function": {}}
+        }
+        for service, scope, name, total in rows:
+            service_totals = aggregate.setdefault(service, {"total": 0, "by_module": {}, "by_function": {}})
+            if scope == "total":
+                service_totals["total"] = total
+            else:
+                service_totals.setdefault(scope, {})[name] = total
+        return aggregate
+
+
+def aggregate_rows(aggregate: Dict[str, Any]) -> List[Tuple[str, str, str, float]]:
+    """
+    Flatten an aggregate in token_aggregate.json format into (service, scope, name, total) rows
+
+    Args:
+        aggregate: Aggregate dictionary
+
+    Returns:
+        List of rows
+    """
+    rows = []
+    for service, service_totals in aggregate.items():
+        if not isinstance(service_totals, dict):
+            continue
+        rows.append((service, "total", "", service_totals.get("total", 0)))
+        for scope in ("by_module", "by_function"):
+            for name, total in (service_totals.get(scope) or {}).items():
+                rows.append((service, scope, name, total))
+    return rows
+
+
+def read_usage_log_entries(log_file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Read OPENAI_USAGE / WHISPER_USAGE entries from usage log files
+
+    Args:
+        log_file_paths: Log files, read in the given order
+
+    Returns:
+        List of usage entries
+    """
+    entries = []
+    for log_file_path in log_file_paths:
+        if not os.path.exists(log_file_path):
+            logging.warning(f"Log file not found: {log_file_path}")
+            continue
+        with open(log_file_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if "OPENAI_USAGE:" not in line and "WHISPER_USAGE:" not in line:
+                    continue
+                json_start = line.find('{"timestamp"')
+                if json_start == -1:
+                    continue
+                try:
+                    entries.append(json.loads(line[json_start:].strip()))
+                except json.JSONDecodeError:
+                    continue
+    return entries
+
+
+def get_usage_ledger() -> UsageLedger:
+    """
+    Get the shared usage ledger (singleton pattern)
+
+    Returns:
+        UsageLedger instance
+    """
+    global _usage_ledger_instance
+
+    with _usage_ledger_lock:
+        if _usage_ledger_instance is None:
+            _usage_ledger_instance = UsageLedger()
+        return _usage_ledger_instance
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    CLI entry point
+    Example usage:
+        python -m src.utils.usage_ledger rebuild
+        python -m src.utils.usage_ledger rebuild usage.log usage.log.2025-01-31 --db data/usage_ledger.db
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Usage ledger maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = subparsers.add_parser("rebuild", help="Rebuild the ledger from usage log files")
+    rebuild_parser.add_argument("logs", nargs="*",
+                                help="Usage log files (default: usage.log and its rotated files)")
+    rebuild_parser.add_argument("--db", default=None, help="Ledger database file")
+    args = parser.parse_args(argv)
+
+    # Rotated files carry a date suffix, so sorting puts them in order before the live log
+    log_files = args.logs or sorted(glob.glob("usage.log.*")) + ["usage.log"]
+    entries = read_usage_log_entries(log_files)
+    ledger = UsageLedger(args.db) if args.db else get_usage_ledger()
+    count = ledger.rebuild(entries)
+    print(f"Rebuilt {ledger.db_path} with {count} usage entries from {len(log_files)} log file(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
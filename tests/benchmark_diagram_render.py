@@ -0,0 +1,171 @@
+"""
+Diagram render benchmark
+
+Renders sample process maps with MermaidDiagramGenerator in cascade and local mode
+while every network call is stubbed to time out, which is what an offline or
+firewalled deployment sees. The cascade waits on each remote service's timeouts
+and retries before it reaches Graphviz; local mode goes straight to Graphviz.
+
+Timeouts and retry backoff are scaled by --time-scale so a run takes seconds;
+the reported latency adds the waits back at full length. The diagram cache and
+AI fixes are disabled so every render does the full work.
+
+Run with:
+    python tests/benchmark_diagram_render.py
+    python tests/benchmark_diagram_render.py --repeat 3 --time-scale 0.001
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import requests  # noqa: E402
+
+from src.document import document_generator  # noqa: E402
+from src.document.diagram_cache import DiagramRenderCache  # noqa: E402
+
+SAMPLE_DIAGRAMS = {
+    "approval flowchart": """flowchart TD
+    A([Invoice received]) --> B{Amount over limit?}
+    B -->|Yes| C[Manager approval]
+    B -->|No| D[Auto approve]
+    C --> E[(Ledger)]
+    D --> E
+    E -.-> F[Notify supplier]
+    classDef manual fill:#ffd,stroke:#aa3
+    class C manual
+""",
+    "nested subgraphs": """flowchart LR
+    subgraph Intake [Intake team]
+        A[Upload] --> B[Validate]
+        subgraph Checks
+            C[Virus scan] & D[Format check]
+        end
+        B --> C & D
+    end
+    C & D ==> E[Process]
+""",
+    "upload sequence": """sequenceDiagram
+    autonumber
+    actor U as User
+    participant A as API
+    participant W as Worker
+    U->>A: Upload video
+    A->>W: Queue job
+    Note right of W: Extract frames
+    loop Every second
+        U->>A: Poll status
+        A-->>U: Progress
+    end
+    W-->>A: Document ready
+""",
+}
+
+
+class NetworkTimeouts:
+    """
+    Stubs the network so every request times out after its (scaled) timeout
+
+    Also scales time.sleep, which covers the renderers' retry backoff. Simulated
+    waits are recorded at full length so they can be added back to the latency.
+    """
+
+    def __init__(self, time_scale: float):
+        self.time_scale = time_scale
+        self.real_sleep = time.sleep
+        self.real_run = subprocess.run
+        self.waited = 0.0  # Full-length seconds of simulated waiting
+
+    def reset(self):
+        self.waited = 0.0
+
+    def sleep(self, seconds: float):
+        self.waited += seconds
+        self.real_sleep(seconds * self.time_scale)
+
+    def request(self, url, *args, timeout=None, **kwargs):
+        self.sleep(timeout or 0)
+        raise requests.exceptions.ConnectTimeout(f"Stubbed network: {url} timed out")
+
+    def run(self, command, *args, timeout=None, **kwargs):
+        # npx downloads the Mermaid CLI from the npm registry
+        if command and command[0] == "npx":
+            self.sleep(timeout or 0)
+            raise subprocess.TimeoutExpired(command, timeout)
+        return self.real_run(command, *args, timeout=timeout, **kwargs)
+
+    def patches(self):
+        return [
+            mock.patch.object(document_generator.requests, "get", self.request),
+            mock.patch.object(document_generator.requests, "post", self.request),
+            mock.patch.object(document_generator.time, "sleep", self.sleep),
+            mock.patch.object(document_generator.subprocess, "run", self.run),
+            mock.patch.object(document_generator, "get_diagram_cache", lambda: DiagramRenderCache(enabled=False)),
+        ]
+
+
+def render(generator, mermaid_code: str, network: NetworkTimeouts):
+    """
+    Render one diagram
+
+    Returns:
+        (whether an image was produced, wall seconds, full-length latency in seconds)
+    """
+    network.reset()
+    start = time.perf_counter()
+    image = generator.create_mermaid_diagram(mermaid_code, enable_ai_fix=False)
+    elapsed = time.perf_counter() - start
+    latency = elapsed + network.waited * (1 - network.time_scale)
+    return image is not None, elapsed, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    # Hedged mode waits in several threads at once, so its waits cannot simply be added back
+    parser.add_argument("--modes", default="cascade,local",
+                        help="Comma-separated render modes to compare (cascade, local)")
+    parser.add_argument("--repeat", type=int, default=1, help="Renders of each diagram per mode")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Factor applied to stubbed timeouts and backoff sleeps")
+    args = parser.parse_args()
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - {"cascade", "local"}
+    if unknown:
+        parser.error(f"unsupported render modes: {', '.join(sorted(unknown))}")
+
+    network = NetworkTimeouts(args.time_scale)
+    patches = network.patches()
+    for patch in patches:
+        patch.start()
+    try:
+        generator = document_generator.MermaidDiagramGenerator()
+        print(f"{'mode':<8} {'diagram':<20} {'rendered':>8} {'wall s':>8} {'latency s':>10}")
+        summary = {}
+        for mode in modes:
+            generator.render_mode = mode
+            latencies = []
+            for name, mermaid_code in SAMPLE_DIAGRAMS.items():
+                for _ in range(args.repeat):
+                    rendered, elapsed, latency = render(generator, mermaid_code, network)
+                    latencies.append(latency)
+                    print(f"{mode:<8} {name:<20} {'yes' if rendered else 'no':>8} {elapsed:>8.2f} {latency:>10.2f}")
+            summary[mode] = latencies
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+
+    print()
+    for mode, latencies in summary.items():
+        print(f"{mode:<8} median {statistics.median(latencies):.2f}s, max {max(latencies):.2f}s "
+              f"over {len(latencies)} renders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Mermaid to DOT conversion tests
+
+Checks the DOT emitted for the flowchart and sequence diagram constructs our
+process-map prompts produce, and that anything the converter does not understand
+returns None so the renderer falls back to another backend.
+
+Run with:
+    python -m pytest tests/test_mermaid_to_dot.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.document.mermaid_to_dot import mermaid_to_dot  # noqa: E402
+
+
+def convert(mermaid_code: str):
+    """DOT lines for Mermaid source, stripped of indentation"""
+    dot_code = mermaid_to_dot(mermaid_code)
+    if dot_code is None:
+        raise AssertionError(f"Conversion failed for:\n{mermaid_code}")
+    return [line.strip() for line in dot_code.split("\n")]
+
+
+class TestFlowchartNodes(unittest.TestCase):
+
+    def test_direction(self):
+        self.assertIn("rankdir=LR;", convert("flowchart LR\n  A --> B"))
+        self.assertIn("rankdir=TB;", convert("graph TD\n  A --> B"))
+
+    def test_shapes(self):
+        lines = convert("""flowchart TD
+            A[Box] --> B(Rounded)
+            B --> C([Stadium])
+            C --> D[[Subroutine]]
+            D --> E[(Database)]
+            E --> F((Circle))
+            F --> G(((Double)))
+            G --> H{Decision}
+            H --> I{{Hexagon}}
+            I --> J[/Input/]
+            J --> K[/Trapezium\\]
+            K --> L>Flag]
+            L --> M["Quoted [label]"]
+        """)
+        expected = {
+            "A": 'label="Box", shape=box',
+            "B": 'label="Rounded", shape=box, style="rounded,filled"',
+            "C": 'label="Stadium", shape=box, style="rounded,filled"',
+            "D": 'label="Subroutine", shape=box, peripheries=2',
+            "E": 'label="Database", shape=cylinder',
+            "F": 'label="Circle", shape=circle',
+            "G": 'label="Double", shape=doublecircle',
+            "H": 'label="Decision", shape=diamond',
+            "I": 'label="Hexagon", shape=hexagon',
+            "J": 'label="Input", shape=parallelogram',
+            "K": 'label="Trapezium", shape=trapezium',
+            "L": 'label="Flag", shape=cds',
+            "M": 'label="Quoted [label]", shape=box',
+        }
+        for node_id, attributes in expected.items():
+            self.assertIn(f'"{node_id}" [{attributes}];', lines)
+
+    def test_label_line_breaks_and_quotes_are_escaped(self):
+        lines = convert('flowchart TD\n  A["Line one<br/>line two"] --> B[Say \\"hi\\"]')
+        self.assertIn('"A" [label="Line one\\nline two", shape=box];', lines)
+
+    def test_semicolons_split_statements_outside_labels(self):
+        lines = convert('flowchart TD; A["a; b"] --> B; B --> C')
+        self.assertIn('"A" [label="a; b", shape=box];', lines)
+        self.assertIn('"B" -> "C" [arrowhead=normal];', lines)
+
+
+class TestFlowchartLinks(unittest.TestCase):
+
+    def test_plain_links(self):
+        lines = convert("""flowchart TD
+            A --> B
+            B --- C
+            C <--> D
+            D --o E
+            E --x F
+        """)
+        self.assertIn('"A" -> "B" [arrowhead=normal];', lines)
+        self.assertIn('"B" -> "C" [arrowhead=none];', lines)
+        self.assertIn('"C" -> "D" [arrowhead=normal, dir=both, arrowtail=normal];', lines)
+        self.assertIn('"D" -> "E" [arrowhead=odot];', lines)
+        self.assertIn('"E" -> "F" [arrowhead=tee];', lines)
+
+    def test_labelled_links(self):
+        lines = convert("""flowchart TD
+            A -->|Yes| B
+            A -- No --> C
+        """)
+        self.assertIn('"A" -> "B" [arrowhead=normal, label="Yes"];', lines)
+        self.assertIn('"A" -> "C" [arrowhead=normal, label="No"];', lines)
+
+    def test_dotted_links(self):
+        lines = convert("""flowchart TD
+            A -.-> B
+            B -. retry .-> C
+        """)
+        self.assertIn('"A" -> "B" [style=dashed, arrowhead=normal];', lines)
+        self.assertIn('"B" -> "C" [style=dashed, arrowhead=normal, label="retry"];', lines)
+
+    def test_thick_links(self):
+        lines = convert("""flowchart TD
+            A ==> B
+            B == escalate ==> C
+        """)
+        self.assertIn('"A" -> "B" [penwidth=2, arrowhead=normal];', lines)
+        self.assertIn('"B" -> "C" [penwidth=2, arrowhead=normal, label="escalate"];', lines)
+
+    def test_chained_links(self):
+        lines = convert("flowchart TD\n  A --> B --> C")
+        self.assertIn('"A" -> "B" [arrowhead=normal];', lines)
+        self.assertIn('"B" -> "C" [arrowhead=normal];', lines)
+
+    def test_ampersand_groups(self):
+        lines = convert("flowchart TD\n  A & B --> C & D")
+        for source in ("A", "B"):
+            for target in ("C", "D"):
+                self.assertIn(f'"{source}" -> "{target}" [arrowhead=normal];', lines)
+
+
+class TestFlowchartSubgraphs(unittest.TestCase):
+
+    def test_nested_subgraphs(self):
+        lines = convert("""flowchart TD
+            subgraph Finance [Finance team]
+                A[Invoice] --> B[Approve]
+                subgraph Audit
+                    C[Review]
+                end
+            end
+            B --> D[Pay]
+        """)
+        self.assertEqual(lines.count('label="Finance team"; style=rounded; color="#AAAA33";'), 1)
+        self.assertEqual(lines.count('label="Audit"; style=rounded; color="#AAAA33";'), 1)
+        self.assertLess(lines.index("subgraph cluster_0 {"), lines.index("subgraph cluster_1 {"))
+        # The inner cluster and its node close before the outer cluster's nodes
+        inner = lines.index("subgraph cluster_1 {")
+        self.assertEqual(lines[inner + 2], '"C" [label="Review", shape=box];')
+        self.assertEqual(lines[inner + 3], "}")
+        self.assertEqual(lines[inner + 4], '"A" [label="Invoice", shape=box];')
+        # Nodes outside every subgraph follow the clusters
+        self.assertGreater(lines.index('"D" [label="Pay", shape=box];'), lines.index('"B" [label="Approve", shape=box];'))
+
+    def test_unbalanced_subgraphs_are_unsupported(self):
+        self.assertIsNone(mermaid_to_dot("flowchart TD\n  subgraph One\n  A --> B"))
+        self.assertIsNone(mermaid_to_dot("flowchart TD\n  A --> B\n  end"))
+
+
+class TestFlowchartStyles(unittest.TestCase):
+
+    def test_class_suffix_and_class_def(self):
+        lines = convert("""flowchart TD
+            A:::done --> B
+            classDef done fill:#9f9,stroke:#333,stroke-width:2px,color:#000
+        """)
+        self.assertIn('"A" [label="A", shape=box, fillcolor="#9f9", color="#333", penwidth=2, fontcolor="#000"];', lines)
+        self.assertIn('"B" [label="B", shape=box];', lines)
+
+    def test_class_statement(self):
+        lines = convert("""flowchart TD
+            A --> B --> C
+            classDef review fill:#ffd
+            class A,C review
+        """)
+        self.assertIn('"A" [label="A", shape=box, fillcolor="#ffd"];', lines)
+        self.assertIn('"B" [label="B", shape=box];', lines)
+        self.assertIn('"C" [label="C", shape=box, fillcolor="#ffd"];', lines)
+
+    def test_style_statement_overrides_class(self):
+        lines = convert("""flowchart TD
+            A[Start]:::done --> B
+            classDef done fill:#9f9
+            style A fill:#f96,stroke-width:3px
+        """)
+        self.assertIn('"A" [label="Start", shape=box, fillcolor="#9f9", fillcolor="#f96", penwidth=3];', lines)
+
+    def test_link_style_and_click_are_ignored(self):
+        lines = convert("""flowchart TD
+            A --> B
+            linkStyle 0 stroke:#f00
+            click A "https://example.com"
+        """)
+        self.assertIn('"A" -> "B" [arrowhead=normal];', lines)
+
+
+class TestSequenceDiagrams(unittest.TestCase):
+
+    def test_participants_and_aliases(self):
+        lines = convert("""sequenceDiagram
+            actor U as User
+            participant S as Server
+            U->>S: Upload
+        """)
+        self.assertIn('p0 [label="User", shape=box, style="rounded,filled", fillcolor="#FFF5AD"];', lines)
+        self.assertIn('p1 [label="Server", shape=box, style=filled, fillcolor="#ECECFF", color="#9370DB"];', lines)
+        self.assertIn("{ rank=same; p0; p1; }", lines)
+
+    def test_messages(self):
+        lines = convert("""sequenceDiagram
+            A->>B: Request
+            B-->>A: Response
+            A-xB: Lost
+            A->B: Open
+            A-)B: Async
+        """)
+        self.assertIn('s0_0 -> s0_1 [constraint=false, label="Request", arrowhead=normal];', lines)
+        self.assertIn('s1_1 -> s1_0 [constraint=false, label="Response", style=dashed, arrowhead=normal];', lines)
+        self.assertIn('s2_0 -> s2_1 [constraint=false, label="Lost", arrowhead=tee];', lines)
+        self.assertIn('s3_0 -> s3_1 [constraint=false, label="Open", arrowhead=none];', lines)
+        self.assertIn('s4_0 -> s4_1 [constraint=false, label="Async", arrowhead=vee];', lines)
+
+    def test_autonumber(self):
+        lines = convert("""sequenceDiagram
+            autonumber
+            A->>B: First
+            Note over A: Not numbered
+            B->>A: Second
+        """)
+        self.assertIn('s0_0 -> s0_1 [constraint=false, label="1. First", arrowhead=normal];', lines)
+        self.assertIn('s2_1 -> s2_0 [constraint=false, label="2. Second", arrowhead=normal];', lines)
+
+    def test_notes(self):
+        lines = convert("""sequenceDiagram
+            A->>B: Hello
+            Note right of B: Thinking
+            Note over A,B: Shared
+        """)
+        self.assertIn('n1 [label="Thinking", shape=note, style=filled, fillcolor="#FFF5AD"];', lines)
+        self.assertIn("{ rank=same; s1_0; s1_1; n1; }", lines)
+        self.assertIn('n2 [label="Shared", shape=note, style=filled, fillcolor="#FFF5AD"];', lines)
+        self.assertIn("{ rank=same; s2_0; n2; s2_1; }", lines)
+
+    def test_blocks(self):
+        lines = convert("""sequenceDiagram
+            loop Every second
+                A->>B: Poll
+            end
+            alt Done
+                B->>A: Result
+            else Failed
+                B->>A: Error
+            end
+        """)
+        for row, text in ((0, "loop Every second"), (2, "alt Done"), (4, "else Failed")):
+            self.assertIn(f'n{row} [label="{text}", shape=plaintext, fontcolor="#555555"];', lines)
+        self.assertFalse(any('label="end"' in line for line in lines))
+
+    def test_activation_is_ignored(self):
+        lines = convert("""sequenceDiagram
+            A->>+B: Start
+            activate B
+            B-->>-A: Done
+            deactivate B
+        """)
+        self.assertIn('s0_0 -> s0_1 [constraint=false, label="Start", arrowhead=normal];', lines)
+        self.assertIn('s1_1 -> s1_0 [constraint=false, label="Done", style=dashed, arrowhead=normal];', lines)
+
+
+class TestUnsupportedInput(unittest.TestCase):
+
+    def test_unsupported_inputs_return_none(self):
+        unsupported = {
+            "empty source": "",
+            "comments only": "%% nothing here",
+            "diagram type": 'pie title Share\n  "A": 1',
+            "class diagram": "classDiagram\n  Animal <|-- Duck",
+            "dangling link": "flowchart TD\n  A -->",
+            "unknown link": "flowchart TD\n  A ~~> B",
+            "header only": "flowchart TD",
+            "malformed note": "sequenceDiagram\n  Note A",
+            "malformed message": "sequenceDiagram\n  A => B",
+            "no participants": "sequenceDiagram\n  autonumber",
+        }
+        for name, mermaid_code in unsupported.items():
+            with self.subTest(name):
+                self.assertIsNone(mermaid_to_dot(mermaid_code))
+
+
+if __name__ == "__main__":
+    unittest.main()
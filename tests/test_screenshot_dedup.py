@@ -0,0 +1,79 @@
+"""
+Screenshot deduplication tests
+
+Slides that share a layout hash within a few bits of each other; they must stay
+separate, while a recapture of the same slide with compression noise is merged.
+
+Run with:
+    python -m pytest tests/test_screenshot_dedup.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.processors.video.screenshot_dedup import (  # noqa: E402
+    _to_gray, deduplicate_screenshots, dhash
+)
+
+SLIDE_SIZE = (1280, 720)
+
+
+def make_slide(title: str, lines):
+    """Slide with a title bar and lines of text, the layout every deck slide shares"""
+    font = ImageFont.load_default(size=36)
+    image = Image.new("RGB", SLIDE_SIZE, (250, 250, 250))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, SLIDE_SIZE[0], 110), fill=(20, 60, 120))
+    draw.text((60, 35), title, fill=(255, 255, 255), font=font)
+    for i, line in enumerate(lines):
+        draw.text((100, 170 + 70 * i), line, fill=(40, 40, 40), font=font)
+    return image
+
+
+def recapture(image: Image.Image, seed: int = 0):
+    """The same slide captured again: sensor noise and a slight brightness shift"""
+    rng = np.random.default_rng(seed)
+    pixels = np.asarray(image).astype(np.int16) + 4 + rng.integers(-6, 7, size=(SLIDE_SIZE[1], SLIDE_SIZE[0], 3))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def hash_distance(first, second):
+    return bin(dhash(_to_gray(first)) ^ dhash(_to_gray(second))).count("1")
+
+
+class TestDeduplicateScreenshots(unittest.TestCase):
+
+    def setUp(self):
+        self.review = make_slide("Quarterly review", ["Revenue grew 12% year over year", "Churn fell to 3.1% in Q3",
+                                                      "Two new enterprise customers", "Hiring plan on track"])
+        self.plan = make_slide("Next quarter plan", ["Launch the reporting dashboard", "Migrate billing to the new API",
+                                                     "Close three open security items", "Review hiring targets in May"])
+
+    def test_distinct_slides_with_same_layout_survive(self):
+        distance = hash_distance(self.review, self.plan)
+        self.assertLessEqual(distance, 6, "slides should be close enough to reach the SSIM check")
+
+        kept, merges = deduplicate_screenshots([(self.review, 10.0, "Scene change"),
+                                                (self.plan, 20.0, "Scene change")])
+        self.assertEqual([timestamp for _, timestamp, _ in kept], [10.0, 20.0])
+        self.assertEqual(merges, [])
+
+    def test_recaptured_slide_is_merged(self):
+        kept, merges = deduplicate_screenshots([(self.review, 10.0, "Scene change"),
+                                                (self.plan, 20.0, "Scene change"),
+                                                (recapture(self.review), 30.0, "Keyword trigger: review")])
+        self.assertEqual([(timestamp, reason) for _, timestamp, reason in kept],
+                         [(20.0, "Scene change"), (30.0, "Keyword trigger: review")])
+        self.assertEqual(merges, [{"timestamp": 30.0, "reason": "Keyword trigger: review",
+                                   "merged_timestamps": [10.0]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Session store tests
+
+Round-trips sessions through the disk backend: the memory tier must account for
+screenshots decoded after a session is promoted from the backend, and a session
+loaded from disk must be usable for document generation.
+
+Run with:
+    python -m pytest tests/test_session_store.py
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.session_store import (  # noqa: E402
+    DiskSessionStore, LazyScreenshotList, MemorySessionStore, SessionStore, TieredSessionStore
+)
+
+FRAME_SIZE = (160, 90)
+
+
+def make_session(count: int = 3):
+    """Session data with count distinct frames, stored out of timestamp order"""
+    screenshots = [(Image.new("RGB", FRAME_SIZE, (40 * i, 80, 120)), float(10 * (count - i)), f"Slide {i}")
+                   for i in range(count)]
+    return {
+        "screenshots": screenshots,
+        "speech_timestamps": [(1.0, "Welcome to the meeting"), (12.5, "Next slide")],
+        "keyword_results": [],
+        "video_path": "meeting.mp4",
+        "client_name": "Test Client"
+    }
+
+
+class DiskSessionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp(prefix="mdoc-sessions-")
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir, ignore_errors=True)
+
+    def stored_session(self, session_id: str = "session-1", count: int = 3):
+        """Write a session with one store and read it back with a fresh one, as another worker would"""
+        DiskSessionStore(root_dir=self.root_dir).put(session_id, make_session(count))
+        return DiskSessionStore(root_dir=self.root_dir).get(session_id)
+
+
+class TestSessionStoreInterface(unittest.TestCase):
+
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            SessionStore()
+
+
+class TestDiskRoundTrip(DiskSessionTestCase):
+
+    def test_screenshots_load_lazily(self):
+        session = self.stored_session()
+        self.assertIsInstance(session["screenshots"], LazyScreenshotList)
+        self.assertEqual(session["screenshots"]._images, {})
+
+        image, timestamp, reason = session["screenshots"][0]
+        self.assertEqual(image.size, FRAME_SIZE)
+        self.assertEqual((timestamp, reason), (30.0, "Slide 0"))
+        self.assertEqual(session["speech_timestamps"][1], (12.5, "Next slide"))
+
+    def test_memory_tier_accounts_for_decoded_screenshots(self):
+        store = TieredSessionStore(MemorySessionStore(), DiskSessionStore(root_dir=self.root_dir))
+        store.backend.put("session-1", make_session())
+
+        session = store.get("session-1")
+        promoted_size = store.memory.stats()["size_bytes"]
+
+        frame_bytes = FRAME_SIZE[0] * FRAME_SIZE[1] * 3
+        session["screenshots"][0]
+        session["screenshots"][0]  # Already decoded, not counted again
+        session["screenshots"][2]
+        self.assertEqual(store.memory.stats()["size_bytes"], promoted_size + 2 * frame_bytes)
+
+    def test_decoded_screenshots_evict_over_size_limit(self):
+        frame_mb = FRAME_SIZE[0] * FRAME_SIZE[1] * 3 / (1024 * 1024)
+        store = TieredSessionStore(MemorySessionStore(max_size_mb=frame_mb * 1.5),
+                                   DiskSessionStore(root_dir=self.root_dir))
+        store.backend.put("session-1", make_session())
+
+        session = store.get("session-1")
+        session["screenshots"][0]
+        self.assertEqual(store.memory.stats()["entries"], 1)
+        session["screenshots"][1]
+        self.assertEqual(store.memory.stats()["entries"], 0)
+        self.assertEqual(store.memory.stats()["evictions"], 1)
+
+
+class TestDiskSessionDocumentGeneration(DiskSessionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        try:
+            import main
+            from src.document import document_generator
+        except ImportError as e:
+            self.skipTest(f"Document generation dependencies are not installed: {e}")
+        self.main = main
+        self.document_generator = document_generator
+
+        video_file = tempfile.NamedTemporaryFile(suffix=".mp4", dir=self.root_dir, delete=False)
+        video_file.write(b"\0" * 1024)
+        video_file.close()
+        self.video_path = video_file.name
+
+    def test_generate_document_from_disk_session(self):
+        session = self.stored_session(count=4)
+        self.assertIsInstance(session["screenshots"], LazyScreenshotList)
+
+        # No AI calls, ffprobe or cost and audit log writes
+        with mock.patch.object(self.document_generator, "OPENAI_AVAILABLE", False), \
+                mock.patch.object(self.main, "get_video_duration_ffprobe", return_value=1.0), \
+                mock.patch.object(self.main, "extract_token_usage_from_app_log", return_value={
+                    "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "openai_cost": 0}), \
+                mock.patch.object(self.main, "usage_log"), \
+                mock.patch.object(self.main, "audit_logger"):
+            result = self.main.generate_document(
+                video_path=self.video_path,
+                screenshots=session["screenshots"],
+                client_name=session["client_name"],
+                doc_title="Disk Session",
+                doc_format="PDF",
+                speech_segments=session["speech_timestamps"],
+                enable_missing_questions=False,
+                enable_process_map=False,
+                include_screenshots=True
+            )
+
+        self.assertTrue(result["pdf_bytes"].startswith(b"%PDF"))
+        self.assertEqual(len(session["screenshots"]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Startup import-time benchmark
+
+Imports the entry modules in a fresh interpreter with `python -X importtime` and
+checks their cumulative import time against a budget, and that the heavy
+processing stack (ML models, document libraries, UI and SDK packages) is not
+imported at startup.
+
+Run with:
+    python -m pytest tests/test_startup_importtime.py -s
+Override the budget with MDOC_IMPORT_BUDGET_MS.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time budget of each entry module, in milliseconds
+IMPORT_BUDGET_MS = float(os.getenv("MDOC_IMPORT_BUDGET_MS", "1000"))
+
+# Modules that must load on first use, not when an entry module is imported
+DEFERRED_MODULES = [
+    "torch", "whisper", "cv2", "skimage", "pytesseract", "speech_recognition",
+    "reportlab", "docx", "fpdf", "pandas", "streamlit", "openai", "pydub", "tiktoken",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str) -> Tuple[subprocess.CompletedProcess, Dict[str, int]]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Args:
+        module: Module to import
+
+    Returns:
+        (completed process, cumulative import time in microseconds by module name)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=300
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return result, cumulative
+
+
+def slowest_imports(cumulative: Dict[str, int], count: int = 15) -> List[str]:
+    return [f"{name}: {us / 1000:.1f} ms"
+            for name, us in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:count]]
+
+
+class TestStartupImportTime(unittest.TestCase):
+
+    def check_entry_module(self, module: str):
+        result, cumulative = measure_import(module)
+        if result.returncode != 0:
+            if "ModuleNotFoundError" in result.stderr:
+                self.skipTest(f"Dependencies of {module} are not installed: {result.stderr.strip().splitlines()[-1]}")
+            self.fail(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+        imported = {name.split(".")[0] for name in cumulative}
+        eager = [name for name in DEFERRED_MODULES if name in imported]
+        self.assertEqual(eager, [], f"import {module} loads modules that should load on first use")
+
+        total_ms = cumulative[module] / 1000
+        print(f"\nimport {module}: {total_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+        self.assertLessEqual(
+            total_ms, IMPORT_BUDGET_MS,
+            f"import {module} took {total_ms:.1f} ms; slowest imports:\n" + "\n".join(slowest_imports(cumulative))
+        )
+
+    def test_api_import_time(self):
+        self.check_entry_module("api")
+
+    def test_main_import_time(self):
+        self.check_entry_module("main")
+
+
+if __name__ == "__main__":
+    unittest.main()